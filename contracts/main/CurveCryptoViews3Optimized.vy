@@ -50,8 +50,18 @@ interface Math:
     ) -> uint256: view
 
 
+interface Factory:
+    def get_market_counts(coin_a: address, coin_b: address) -> uint256: view
+    def find_pool_for_coins(
+        _from: address, _to: address, i: uint256
+    ) -> address: view
+    def get_coins(_pool: address) -> address[N_COINS]: view
+
+
 N_COINS: constant(uint256) = 3
 PRECISION: constant(uint256) = 10**18
+MAX_QUOTES: constant(uint256) = 64  # <------ Max amounts per batched quote.
+MAX_MARKETS: constant(uint256) = 16  # <------------ Max pools quoted per pair.
 
 
 @external
@@ -76,15 +86,34 @@ def get_dx(
     i: uint256, j: uint256, dy: uint256, swap: address
 ) -> uint256:
 
-    dx: uint256 = 0
+    assert i != j and i < N_COINS and j < N_COINS, "coin index out of range"
+    assert dy > 0, "do not exchange out 0 coins"
+
+    math: Math = Curve(swap).MATH()
+    fee_params: uint256[3] = self._unpack(Curve(swap).packed_fee_params())
+
     xp: uint256[N_COINS] = empty(uint256[N_COINS])
+    precisions: uint256[N_COINS] = empty(uint256[N_COINS])
+    price_scale: uint256[N_COINS-1] = empty(uint256[N_COINS-1])
+    D: uint256 = 0
+    token_supply: uint256 = 0
+    A: uint256 = 0
+    gamma: uint256 = 0
+
+    # the pool state does not change between loops, read it once:
+    xp, D, token_supply, price_scale, A, gamma, precisions = self._prep_calc(swap)
+
+    dx: uint256 = 0
+    xp_in: uint256[N_COINS] = empty(uint256[N_COINS])
     fee_dy: uint256 = 0
     _dy: uint256 = dy
 
     # for more precise dx (but never exact), increase num loops
     for k in range(5):
-        dx, xp = self._get_dx_fee(i, j, _dy, swap)
-        fee_dy = Curve(swap).fee_calc(xp) * _dy / 10**10
+        dx, xp_in = self._calc_dx_fee(
+            i, j, _dy, xp, D, price_scale, A, gamma, precisions, math
+        )
+        fee_dy = self._fee(xp_in, fee_params, math) * _dy / 10**10
         _dy = dy + fee_dy + 1
 
     return dx
@@ -152,6 +181,190 @@ def calc_fee_token_amount(
     return Curve(swap).calc_token_fee(amountsp, xp) * d_token / 10**10 + 1
 
 
+@external
+@view
+def get_dy_many(
+    i: uint256,
+    j: uint256,
+    dx: DynArray[uint256, MAX_QUOTES],
+    swap: address
+) -> DynArray[uint256, MAX_QUOTES]:
+    """
+    @notice get_dy for every amount in dx, reading the pool state once.
+    @dev Reverts if the quote of any amount reverts.
+    """
+    assert i != j and i < N_COINS and j < N_COINS, "coin index out of range"
+
+    math: Math = Curve(swap).MATH()
+    fee_params: uint256[3] = self._unpack(Curve(swap).packed_fee_params())
+
+    xp: uint256[N_COINS] = empty(uint256[N_COINS])
+    precisions: uint256[N_COINS] = empty(uint256[N_COINS])
+    price_scale: uint256[N_COINS-1] = empty(uint256[N_COINS-1])
+    D: uint256 = 0
+    token_supply: uint256 = 0
+    A: uint256 = 0
+    gamma: uint256 = 0
+
+    xp, D, token_supply, price_scale, A, gamma, precisions = self._prep_calc(swap)
+
+    dy: DynArray[uint256, MAX_QUOTES] = []
+    _dy: uint256 = 0
+    xp_out: uint256[N_COINS] = empty(uint256[N_COINS])
+    for _dx in dx:
+        assert _dx > 0, "do not exchange 0 coins"
+        _dy, xp_out = self._calc_dy_nofee(
+            i, j, _dx, xp, D, price_scale, A, gamma, precisions, math
+        )
+        dy.append(_dy - self._fee(xp_out, fee_params, math) * _dy / 10**10)
+
+    return dy
+
+
+@external
+@view
+def get_dx_many(
+    i: uint256,
+    j: uint256,
+    dy: DynArray[uint256, MAX_QUOTES],
+    swap: address
+) -> DynArray[uint256, MAX_QUOTES]:
+    """
+    @notice get_dx for every amount in dy, reading the pool state once.
+    @dev Reverts if the quote of any amount reverts.
+    """
+    assert i != j and i < N_COINS and j < N_COINS, "coin index out of range"
+
+    math: Math = Curve(swap).MATH()
+    fee_params: uint256[3] = self._unpack(Curve(swap).packed_fee_params())
+
+    xp: uint256[N_COINS] = empty(uint256[N_COINS])
+    precisions: uint256[N_COINS] = empty(uint256[N_COINS])
+    price_scale: uint256[N_COINS-1] = empty(uint256[N_COINS-1])
+    D: uint256 = 0
+    token_supply: uint256 = 0
+    A: uint256 = 0
+    gamma: uint256 = 0
+
+    xp, D, token_supply, price_scale, A, gamma, precisions = self._prep_calc(swap)
+
+    dx: DynArray[uint256, MAX_QUOTES] = []
+    _dx: uint256 = 0
+    xp_in: uint256[N_COINS] = empty(uint256[N_COINS])
+    for amount in dy:
+        assert amount > 0, "do not exchange out 0 coins"
+        _dy: uint256 = amount
+        # same number of loops as get_dx:
+        for k in range(5):
+            _dx, xp_in = self._calc_dx_fee(
+                i, j, _dy, xp, D, price_scale, A, gamma, precisions, math
+            )
+            _dy = amount + self._fee(xp_in, fee_params, math) * _dy / 10**10 + 1
+        dx.append(_dx)
+
+    return dx
+
+
+@view
+@external
+def calc_withdraw_one_coin_many(
+    token_amount: DynArray[uint256, MAX_QUOTES], i: uint256, swap: address
+) -> DynArray[uint256, MAX_QUOTES]:
+    """
+    @notice calc_withdraw_one_coin for every amount in token_amount, reading
+            the pool state once.
+    @dev Reverts if the quote of any amount reverts.
+    """
+    math: Math = Curve(swap).MATH()
+
+    xp: uint256[N_COINS] = empty(uint256[N_COINS])
+    D0: uint256 = 0
+    token_supply: uint256 = 0
+    price_scale_i: uint256 = 0
+    fee: uint256 = 0
+    x_i: uint256 = 0
+    A: uint256 = 0
+    gamma: uint256 = 0
+
+    xp, D0, token_supply, price_scale_i, fee, x_i, A, gamma = (
+        self._prep_withdraw_one_coin(i, swap)
+    )
+
+    dy: DynArray[uint256, MAX_QUOTES] = []
+    _dy: uint256 = 0
+    approx_fee: uint256 = 0
+    for amount in token_amount:
+        _dy, approx_fee = self._calc_withdraw_one_coin_from(
+            amount,
+            i,
+            xp,
+            D0,
+            token_supply,
+            price_scale_i,
+            fee,
+            x_i,
+            A,
+            gamma,
+            math,
+        )
+        dy.append(_dy)
+
+    return dy
+
+
+@view
+@external
+def get_best_dy_many(
+    _from: address,
+    _to: address,
+    dx: DynArray[uint256, MAX_QUOTES],
+    factory: address
+) -> (DynArray[address, MAX_QUOTES], DynArray[uint256, MAX_QUOTES]):
+    """
+    @notice Quote every amount in dx in all pools of factory that trade
+            _from for _to, and return the best pool and dy per amount.
+    @dev Only the first MAX_MARKETS pools of the pair are quoted. Pools
+         that cannot quote an amount are skipped for it. If no pool can
+         quote an amount, its pool is empty(address) and its dy is 0.
+    """
+    best_pool: DynArray[address, MAX_QUOTES] = []
+    best_dy: DynArray[uint256, MAX_QUOTES] = []
+    for amount in dx:
+        best_pool.append(empty(address))
+        best_dy.append(0)
+
+    n_markets: uint256 = Factory(factory).get_market_counts(_from, _to)
+    for m in range(MAX_MARKETS):
+        if m == n_markets:
+            break
+
+        pool: address = Factory(factory).find_pool_for_coins(_from, _to, m)
+        coins: address[N_COINS] = Factory(factory).get_coins(pool)
+
+        # markets are keyed by coin_a ^ coin_b: check the pool's coins.
+        i: uint256 = N_COINS
+        j: uint256 = N_COINS
+        for k in range(N_COINS):
+            if coins[k] == _from:
+                i = k
+            elif coins[k] == _to:
+                j = k
+        if i == N_COINS or j == N_COINS:
+            continue
+
+        dy: DynArray[uint256, MAX_QUOTES] = self._try_get_dy_many(
+            i, j, dx, pool
+        )
+        for k in range(MAX_QUOTES):
+            if k == len(dy):
+                break
+            if dy[k] > best_dy[k]:
+                best_dy[k] = dy[k]
+                best_pool[k] = pool
+
+    return best_pool, best_dy
+
+
 @internal
 @view
 def _calc_D_ramp(
@@ -180,29 +393,77 @@ def _calc_D_ramp(
 
 @internal
 @view
-def _get_dx_fee(
-    i: uint256, j: uint256, dy: uint256, swap: address
-) -> (uint256, uint256[N_COINS]):
-
-    # here, dy must include fees (and 1 wei offset)
+def _try_get_dy_many(
+    i: uint256, j: uint256, dx: DynArray[uint256, MAX_QUOTES], swap: address
+) -> DynArray[uint256, MAX_QUOTES]:
+
+    # quotes that revert are 0. Try all amounts at once first:
+    success: bool = False
+    response: Bytes[2112] = b""  # <----- ABI encoded DynArray[uint256, 64].
+    success, response = raw_call(
+        self,
+        _abi_encode(
+            i,
+            j,
+            dx,
+            swap,
+            method_id=method_id(
+                "get_dy_many(uint256,uint256,uint256[],address)"
+            ),
+        ),
+        max_outsize=2112,
+        revert_on_failure=False,
+        is_static_call=True
+    )
+    if success:
+        return _abi_decode(response, DynArray[uint256, MAX_QUOTES])
+
+    # some amount cannot be quoted, quote them one by one:
+    dy: DynArray[uint256, MAX_QUOTES] = []
+    single: Bytes[32] = b""
+    for amount in dx:
+        success, single = raw_call(
+            self,
+            _abi_encode(
+                i,
+                j,
+                amount,
+                swap,
+                method_id=method_id(
+                    "get_dy(uint256,uint256,uint256,address)"
+                ),
+            ),
+            max_outsize=32,
+            revert_on_failure=False,
+            is_static_call=True
+        )
+        if success:
+            dy.append(convert(single, uint256))
+        else:
+            dy.append(0)
 
-    assert i != j and i < N_COINS and j < N_COINS, "coin index out of range"
-    assert dy > 0, "do not exchange out 0 coins"
+    return dy
 
-    math: Math = Curve(swap).MATH()
 
-    xp: uint256[N_COINS] = empty(uint256[N_COINS])
-    precisions: uint256[N_COINS] = empty(uint256[N_COINS])
-    price_scale: uint256[N_COINS-1] = empty(uint256[N_COINS-1])
-    D: uint256 = 0
-    token_supply: uint256 = 0
-    A: uint256 = 0
-    gamma: uint256 = 0
+@internal
+@view
+def _calc_dx_fee(
+    i: uint256,
+    j: uint256,
+    dy: uint256,
+    _xp: uint256[N_COINS],
+    D: uint256,
+    price_scale: uint256[N_COINS-1],
+    A: uint256,
+    gamma: uint256,
+    precisions: uint256[N_COINS],
+    math: Math,
+) -> (uint256, uint256[N_COINS]):
 
-    xp, D, token_supply, price_scale, A, gamma, precisions = self._prep_calc(swap)
+    xp: uint256[N_COINS] = _xp
 
     # adjust xp with output dy. dy contains fee element, which we handle later
-    # (hence this internal method is called _get_dx_fee)
+    # (hence this internal method is called _calc_dx_fee)
     xp[j] -= dy
     xp[0] *= precisions[0]
     for k in range(N_COINS - 1):
@@ -239,6 +500,28 @@ def _get_dy_nofee(
 
     xp, D, token_supply, price_scale, A, gamma, precisions = self._prep_calc(swap)
 
+    return self._calc_dy_nofee(
+        i, j, dx, xp, D, price_scale, A, gamma, precisions, math
+    )
+
+
+@internal
+@view
+def _calc_dy_nofee(
+    i: uint256,
+    j: uint256,
+    dx: uint256,
+    _xp: uint256[N_COINS],
+    D: uint256,
+    price_scale: uint256[N_COINS-1],
+    A: uint256,
+    gamma: uint256,
+    precisions: uint256[N_COINS],
+    math: Math,
+) -> (uint256, uint256[N_COINS]):
+
+    xp: uint256[N_COINS] = _xp
+
     # adjust xp with input dx
     xp[i] += dx
     xp[0] *= precisions[0]
@@ -307,8 +590,49 @@ def _calc_withdraw_one_coin(
     swap: address
 ) -> (uint256, uint256):
 
-    token_supply: uint256 = Curve(swap).totalSupply()
-    assert token_amount <= token_supply  # dev: token amount more than supply
+    math: Math = Curve(swap).MATH()
+
+    xp: uint256[N_COINS] = empty(uint256[N_COINS])
+    D0: uint256 = 0
+    token_supply: uint256 = 0
+    price_scale_i: uint256 = 0
+    fee: uint256 = 0
+    x_i: uint256 = 0
+    A: uint256 = 0
+    gamma: uint256 = 0
+
+    xp, D0, token_supply, price_scale_i, fee, x_i, A, gamma = (
+        self._prep_withdraw_one_coin(i, swap)
+    )
+
+    return self._calc_withdraw_one_coin_from(
+        token_amount,
+        i,
+        xp,
+        D0,
+        token_supply,
+        price_scale_i,
+        fee,
+        x_i,
+        A,
+        gamma,
+        math,
+    )
+
+
+@internal
+@view
+def _prep_withdraw_one_coin(i: uint256, swap: address) -> (
+    uint256[N_COINS],
+    uint256,
+    uint256,
+    uint256,
+    uint256,
+    uint256,
+    uint256,
+    uint256
+):
+
     assert i < N_COINS  # dev: coin out of range
 
     math: Math = Curve(swap).MATH()
@@ -341,29 +665,52 @@ def _calc_withdraw_one_coin(
     else:
         D0 = Curve(swap).D()
 
+    fee_params: uint256[3] = self._unpack(Curve(swap).packed_fee_params())
+    fee: uint256 = self._fee(xp, fee_params, math)
+
+    return (
+        xp, D0, Curve(swap).totalSupply(), price_scale_i, fee, xx[i], A, gamma
+    )
+
+
+@internal
+@view
+def _calc_withdraw_one_coin_from(
+    token_amount: uint256,
+    i: uint256,
+    xp: uint256[N_COINS],
+    D0: uint256,
+    token_supply: uint256,
+    price_scale_i: uint256,
+    fee: uint256,
+    x_i: uint256,
+    A: uint256,
+    gamma: uint256,
+    math: Math,
+) -> (uint256, uint256):
+
+    assert token_amount <= token_supply  # dev: token amount more than supply
+
     D: uint256 = D0
 
-    fee: uint256 = self._fee(xp, swap)
     dD: uint256 = token_amount * D / token_supply
 
     D_fee: uint256 = fee * dD / (2 * 10**10) + 1
-    approx_fee: uint256 = N_COINS * D_fee * xx[i] / D
+    approx_fee: uint256 = N_COINS * D_fee * x_i / D
 
     D -= (dD - D_fee)
 
     y_out: uint256[2] = math.get_y(A, gamma, xp, D, i)
     dy: uint256 = (xp[i] - y_out[0]) * PRECISION / price_scale_i
-    xp[i] = y_out[0]
 
     return dy, approx_fee
 
 
 @internal
 @view
-def _fee(xp: uint256[N_COINS], swap: address) -> uint256:
-    math: Math = Curve(swap).MATH()
-    packed_fee_params: uint256 = Curve(swap).packed_fee_params()
-    fee_params: uint256[3] = self._unpack(packed_fee_params)
+def _fee(
+    xp: uint256[N_COINS], fee_params: uint256[3], math: Math
+) -> uint256:
     f: uint256 = math.reduction_coefficient(xp, fee_params[2])
     return (fee_params[0] * f + fee_params[1] * (10**18 - f)) / 10**18
 
@@ -13,6 +13,14 @@ interface TricryptoPool:
 interface ERC20:
     def decimals() -> uint256: view
 
+interface Views:
+    def get_best_dy_many(
+        _from: address,
+        _to: address,
+        dx: DynArray[uint256, MAX_QUOTES],
+        factory: address
+    ) -> (DynArray[address, MAX_QUOTES], DynArray[uint256, MAX_QUOTES]): view
+
 
 event TricryptoPoolDeployed:
     pool: address
@@ -65,6 +73,13 @@ struct PoolArray:
     coins: address[N_COINS]
     decimals: uint256[N_COINS]
 
+struct PoolData:
+    pool: address
+    coins: address[N_COINS]
+    decimals: uint256[N_COINS]
+    balances: uint256[N_COINS]
+    liquidity_gauge: address
+
 
 N_COINS: constant(uint256) = 3
 A_MULTIPLIER: constant(uint256) = 10000
@@ -81,6 +96,9 @@ MAX_A: constant(uint256) = 1000 * A_MULTIPLIER * N_COINS**N_COINS
 PRICE_SIZE: constant(uint128) = 256 / (N_COINS - 1)
 PRICE_MASK: constant(uint256) = 2**PRICE_SIZE - 1
 
+MAX_QUOTES: constant(uint256) = 64
+MAX_PAGE_SIZE: constant(uint256) = 100
+
 admin: public(address)
 future_admin: public(address)
 
@@ -407,9 +425,41 @@ def find_pool_for_coins(_from: address, _to: address, i: uint256 = 0) -> address
     return self.markets[key][i]
 
 
+@view
+@external
+def get_best_dy_many(
+    _from: address,
+    _to: address,
+    _dx: DynArray[uint256, MAX_QUOTES]
+) -> (DynArray[address, MAX_QUOTES], DynArray[uint256, MAX_QUOTES]):
+    """
+    @notice Find the pool with the best output for each amount of `_from`
+            exchanged for `_to`, across all pools for the pair
+    @dev Quotes through `views_implementation`. Amounts that no pool can
+         quote return `empty(address)` and 0.
+    @param _from Address of coin to be sent
+    @param _to Address of coin to be received
+    @param _dx Amounts of `_from` to be sent
+    @return Best pool and output for each amount
+    """
+    return Views(self.views_implementation).get_best_dy_many(
+        _from, _to, _dx, self
+    )
+
+
 # <--- Pool Getters --->
 
 
+@internal
+@view
+def _get_balances(_pool: address) -> uint256[N_COINS]:
+    return [
+        TricryptoPool(_pool).balances(0),
+        TricryptoPool(_pool).balances(1),
+        TricryptoPool(_pool).balances(2),
+    ]
+
+
 @view
 @external
 def get_coins(_pool: address) -> address[N_COINS]:
@@ -441,11 +491,7 @@ def get_balances(_pool: address) -> uint256[N_COINS]:
     @param _pool Pool address
     @return uint256 list of balances
     """
-    return [
-        TricryptoPool(_pool).balances(0),
-        TricryptoPool(_pool).balances(1),
-        TricryptoPool(_pool).balances(2),
-    ]
+    return self._get_balances(_pool)
 
 
 @view
@@ -500,3 +546,38 @@ def get_market_counts(coin_a: address, coin_b: address) -> uint256:
     )
 
     return self.market_counts[key]
+
+
+@view
+@external
+def get_pools_data(
+    _offset: uint256, _limit: uint256
+) -> DynArray[PoolData, MAX_PAGE_SIZE]:
+    """
+    @notice Get coins, decimals, balances and gauge for a page of pools
+    @dev Returns at most MAX_PAGE_SIZE pools: page through `pool_list` by
+         increasing `_offset` by the length of the returned page, until
+         the page is empty
+    @param _offset Index in `pool_list` of the first pool
+    @param _limit Maximum number of pools to return
+    @return List of pool data, in the order of `pool_list`
+    """
+    pools: DynArray[PoolData, MAX_PAGE_SIZE] = []
+    pool_count: uint256 = self.pool_count
+
+    for k in range(MAX_PAGE_SIZE):
+        if k == _limit or _offset + k >= pool_count:
+            break
+
+        pool: address = self.pool_list[_offset + k]
+        pools.append(
+            PoolData({
+                pool: pool,
+                coins: self.pool_data[pool].coins,
+                decimals: self.pool_data[pool].decimals,
+                balances: self._get_balances(pool),
+                liquidity_gauge: self.pool_data[pool].liquidity_gauge,
+            })
+        )
+
+    return pools
@@ -18,10 +18,13 @@ interface BaseRegistry:
     def get_token(_pool: address) -> address: view
     def pool_count() -> uint256: view
     def pool_list(pool_id: uint256) -> address: view
+    def get_pools_data(
+        _offset: uint256, _limit: uint256
+    ) -> DynArray[FactoryPoolData, MAX_PAGE_SIZE]: view
 
 interface CurvePool:
     def adjustment_step() -> uint256: view
-    def admin_fee() -> uint256: view
+    def ADMIN_FEE() -> uint256: view
     def allowed_extra_profit() -> uint256: view
     def A() -> uint256: view
     def balances(i: uint256) -> uint256: view
@@ -30,7 +33,7 @@ interface CurvePool:
     def fee_gamma() -> uint256: view
     def gamma() -> uint256: view
     def get_virtual_price() -> uint256: view
-    def ma_half_time() -> uint256: view
+    def ma_time() -> uint256: view
     def mid_fee() -> uint256: view
     def out_fee() -> uint256: view
     def virtual_price() -> uint256: view
@@ -51,11 +54,29 @@ interface Gauge:
     def is_killed() -> bool: view
 
 
+# ---- structs ---- #
+struct FactoryPoolData:
+    pool: address
+    coins: address[MAX_COINS]
+    decimals: uint256[MAX_COINS]
+    balances: uint256[MAX_COINS]
+    liquidity_gauge: address
+
+struct PoolData:
+    pool: address
+    coins: address[MAX_METAREGISTRY_COINS]
+    decimals: uint256[MAX_METAREGISTRY_COINS]
+    balances: uint256[MAX_METAREGISTRY_COINS]
+    fees: uint256[10]
+    params: uint256[20]
+
+
 # ---- constants ---- #
 GAUGE_CONTROLLER: constant(address) = 0x2F50D538606Fa9EDD2B11E2446BEb18C9D5846bB
 MAX_COINS: constant(uint256) = 3
 MAX_METAREGISTRY_COINS: constant(uint256) = 8
 MAX_POOLS: constant(uint256) = 65536
+MAX_PAGE_SIZE: constant(uint256) = 100
 N_COINS: constant(uint256) = 3
 
 
@@ -143,6 +164,46 @@ def _is_registered(_pool: address) -> bool:
     return self._get_n_coins(_pool) > 0
 
 
+@internal
+@view
+def _get_fees(_pool: address) -> uint256[10]:
+
+    # the current fee cannot be computed for an empty pool: try to get it,
+    # so that a single empty pool does not revert a page of pools.
+    success: bool = False
+    response: Bytes[32] = b""
+    success, response = raw_call(
+        _pool,
+        method_id("fee()"),
+        max_outsize=32,
+        revert_on_failure=False,
+        is_static_call=True
+    )
+    fee: uint256 = 0
+    if success:
+        fee = convert(response, uint256)
+
+    fees: uint256[10] = empty(uint256[10])
+    pool_fees: uint256[4] = [fee, CurvePool(_pool).ADMIN_FEE(), CurvePool(_pool).mid_fee(), CurvePool(_pool).out_fee()]
+    for i in range(4):
+        fees[i] = pool_fees[i]
+    return fees
+
+
+@internal
+@view
+def _get_pool_params(_pool: address) -> uint256[20]:
+    pool_params: uint256[20] = empty(uint256[20])
+    pool_params[0] = CurvePool(_pool).A()
+    pool_params[1] = CurvePool(_pool).D()
+    pool_params[2] = CurvePool(_pool).gamma()
+    pool_params[3] = CurvePool(_pool).allowed_extra_profit()
+    pool_params[4] = CurvePool(_pool).fee_gamma()
+    pool_params[5] = CurvePool(_pool).adjustment_step()
+    pool_params[6] = CurvePool(_pool).ma_time()
+    return pool_params
+
+
 # ---- view methods (API) of the contract ---- #
 @external
 @view
@@ -177,7 +238,7 @@ def get_admin_balances(_pool: address) -> uint256[MAX_METAREGISTRY_COINS]:
 
     xcp_profit: uint256 = CurvePool(_pool).xcp_profit()
     xcp_profit_a: uint256 = CurvePool(_pool).xcp_profit_a()
-    admin_fee: uint256 = CurvePool(_pool).admin_fee()
+    admin_fee: uint256 = CurvePool(_pool).ADMIN_FEE()
     admin_balances: uint256[MAX_METAREGISTRY_COINS] = empty(uint256[MAX_METAREGISTRY_COINS])
 
     # admin balances are non zero if pool has made more than allowed profits:
@@ -278,12 +339,9 @@ def get_fees(_pool: address) -> uint256[10]:
             2. admin fee
             3. mid fee (fee when cryptoswap pool is pegged)
             4. out fee (fee when cryptoswap pool depegs)
+            The swap fee is 0 for pools without liquidity.
     """
-    fees: uint256[10] = empty(uint256[10])
-    pool_fees: uint256[4] = [CurvePool(_pool).fee(), CurvePool(_pool).admin_fee(), CurvePool(_pool).mid_fee(), CurvePool(_pool).out_fee()]
-    for i in range(4):
-        fees[i] = pool_fees[i]
-    return fees
+    return self._get_fees(_pool)
 
 
 @external
@@ -384,15 +442,43 @@ def get_pool_params(_pool: address) -> uint256[20]:
     @dev only applicable for cryptopools
     @param _pool Address of the pool for which data is being queried.
     """
-    pool_params: uint256[20] = empty(uint256[20])
-    pool_params[0] = CurvePool(_pool).A()
-    pool_params[1] = CurvePool(_pool).D()
-    pool_params[2] = CurvePool(_pool).gamma()
-    pool_params[3] = CurvePool(_pool).allowed_extra_profit()
-    pool_params[4] = CurvePool(_pool).fee_gamma()
-    pool_params[5] = CurvePool(_pool).adjustment_step()
-    pool_params[6] = CurvePool(_pool).ma_half_time()
-    return pool_params
+    return self._get_pool_params(_pool)
+
+
+@external
+@view
+def get_pools_data(_offset: uint256, _limit: uint256) -> DynArray[PoolData, MAX_PAGE_SIZE]:
+    """
+    @notice Returns coins, decimals, balances, fees and pool params for a
+            page of pools, in the order of pool_list
+    @dev Returns at most MAX_PAGE_SIZE pools. Page through the registry by
+         increasing _offset by the length of the returned page, until the
+         page is empty. Arrays are laid out as in get_coins, get_decimals,
+         get_balances, get_fees and get_pool_params
+    @param _offset Index of the first pool in pool_list
+    @param _limit Maximum number of pools to return
+    @return DynArray[PoolData, MAX_PAGE_SIZE] List of pool data
+    """
+    page: DynArray[FactoryPoolData, MAX_PAGE_SIZE] = self.base_registry.get_pools_data(_offset, _limit)
+    pools: DynArray[PoolData, MAX_PAGE_SIZE] = []
+    for data in page:
+
+        coins: address[MAX_METAREGISTRY_COINS] = empty(address[MAX_METAREGISTRY_COINS])
+        for i in range(MAX_COINS):
+            coins[i] = data.coins[i]
+
+        pools.append(
+            PoolData({
+                pool: data.pool,
+                coins: coins,
+                decimals: self._pad_uint_array(data.decimals),
+                balances: self._pad_uint_array(data.balances),
+                fees: self._get_fees(data.pool),
+                params: self._get_pool_params(data.pool),
+            })
+        )
+
+    return pools
 
 
 @external
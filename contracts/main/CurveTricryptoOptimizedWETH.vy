@@ -54,6 +54,32 @@ interface Views:
     ) -> uint256: view
 
 
+# --------------------------------- Structs ----------------------------------
+
+struct PoolState:
+    balances: uint256[N_COINS]
+    D: uint256
+    totalSupply: uint256
+    price_scale_packed: uint256
+    price_oracle_packed: uint256
+    last_prices_packed: uint256
+    last_prices_timestamp: uint256
+    packed_fee_params: uint256
+    packed_rebalancing_params: uint256
+    initial_A_gamma: uint256
+    initial_A_gamma_time: uint256
+    future_A_gamma: uint256
+    future_A_gamma_time: uint256
+    xcp_profit: uint256
+    xcp_profit_a: uint256
+    virtual_price: uint256
+    cached_xcp_oracle: uint256
+    last_xcp: uint256
+    xcp_ma_time: uint256
+    precisions: uint256[N_COINS]
+    timestamp: uint256
+
+
 # ------------------------------- Events -------------------------------------
 
 event Transfer:
@@ -1034,7 +1060,17 @@ def tweak_price(
                 # unsafe_div because we did safediv before ----^
 
             # ------------------------------------------ Update D with new xp.
-            D: uint256 = MATH.newton_D(A_gamma[0], A_gamma[1], xp, 0)
+            #        p_new is close to price_scale, so K0 of the unadjusted
+            #       invariant is a good initial guess for the new invariant.
+            K0: uint256 = unsafe_div(
+                unsafe_div(
+                    unsafe_div(10**18 * N_COINS * _xp[0], D_unadjusted)
+                    * _xp[1] * N_COINS,
+                    D_unadjusted
+                ) * _xp[2] * N_COINS,
+                D_unadjusted
+            )  # <------------ D_unadjusted > 0, since get_p asserts D > 1e17.
+            D: uint256 = MATH.newton_D(A_gamma[0], A_gamma[1], xp, K0)
 
             for k in range(N_COINS):
                 frac: uint256 = xp[k] * 10**18 / D  # <----- Check validity of
@@ -1864,6 +1900,42 @@ def fee_calc(xp: uint256[N_COINS]) -> uint256:  # <----- For by view contract.
     return self._fee(xp)
 
 
+@external
+@view
+@nonreentrant("lock")
+def pool_state() -> PoolState:
+    """
+    @notice Returns the entire state of the pool in a single call.
+    @dev Packed values are returned as stored: oracles, A and gamma are not
+         updated to the current block. The block timestamp is returned to
+         update them off-chain.
+    @return PoolState The raw pool state.
+    """
+    return PoolState({
+        balances: self.balances,
+        D: self.D,
+        totalSupply: self.totalSupply,
+        price_scale_packed: self.price_scale_packed,
+        price_oracle_packed: self.price_oracle_packed,
+        last_prices_packed: self.last_prices_packed,
+        last_prices_timestamp: self.last_prices_timestamp,
+        packed_fee_params: self.packed_fee_params,
+        packed_rebalancing_params: self.packed_rebalancing_params,
+        initial_A_gamma: self.initial_A_gamma,
+        initial_A_gamma_time: self.initial_A_gamma_time,
+        future_A_gamma: self.future_A_gamma,
+        future_A_gamma_time: self.future_A_gamma_time,
+        xcp_profit: self.xcp_profit,
+        xcp_profit_a: self.xcp_profit_a,
+        virtual_price: self.virtual_price,
+        cached_xcp_oracle: self.cached_xcp_oracle,
+        last_xcp: self.last_xcp,
+        xcp_ma_time: self.xcp_ma_time,
+        precisions: PRECISIONS,
+        timestamp: block.timestamp,
+    })
+
+
 @view
 @external
 def DOMAIN_SEPARATOR() -> bytes32:
@@ -0,0 +1,70 @@
+import random
+import time
+
+import click
+
+from tests.boa.utils import simulation_int_many as sim
+
+A_MUL = 10000 * 3**3
+
+
+def sample_curves(num_samples):
+
+    curves = []
+    while len(curves) < num_samples:
+
+        A = random.randint(int(0.01 * A_MUL), 1000 * A_MUL)
+        gamma = random.randint(10**10, 5 * 10**16)
+        D = random.randint(10**18, 10**14 * 10**18)
+        p = [10**18] + [random.randint(10**15, 10**24) for _ in range(2)]
+
+        curve = sim.Curve(A, gamma, D, 3, p=p)
+        curve.x = [
+            D * random.randint(int(0.2e18), int(0.5e18)) // _p for _p in p
+        ]
+        try:
+            curve.D()
+        except Exception:
+            continue
+        curves.append(curve)
+
+    return curves
+
+
+def _get_p(curves, exact_p):
+    out = []
+    t = time.perf_counter()
+    for curve in curves:
+        curve.exact_p = exact_p
+        out.append(curve.get_p())
+    return out, time.perf_counter() - t
+
+
+@click.command()
+@click.option("--num_samples", default=10000)
+@click.option("--seed", default=0)
+def bench(num_samples, seed):
+
+    random.seed(seed)
+    curves = sample_curves(num_samples)
+
+    exact, t_exact = _get_p(curves, True)
+    approx, t_approx = _get_p(curves, False)
+
+    diffs = sorted(
+        abs(a - b) / b
+        for p_exact, p_approx in zip(exact, approx)
+        for a, b in zip(p_approx, p_exact)
+    )
+    print(
+        f"get_p: {num_samples} states | exact {t_exact:.2f}s | "
+        f"float {t_approx:.2f}s | float speedup {t_exact / t_approx:.1f}x"
+    )
+    print(
+        f"float relative divergence: median {diffs[len(diffs) // 2]:.2e} | "
+        f"p99 {diffs[len(diffs) * 99 // 100]:.2e} | max {diffs[-1]:.2e}"
+    )
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,58 @@
+import time
+
+import boa
+import click
+
+from tests.boa.utils import compile_cache, tokens
+
+
+def _timeit(fn):
+    t = time.perf_counter()
+    fn()
+    return time.perf_counter() - t
+
+
+@click.command()
+@click.option("--num_mints", default=1000)
+@click.option("--num_users", default=10)
+def bench(num_mints, num_users):
+
+    compile_cache.install()
+    coins = [
+        boa.load("contracts/mocks/ERC20Mock.vy", name, name, decimals)
+        for name, decimals in [("USD", 18), ("BTC", 8), ("ETH", 18)]
+    ]
+    users = [boa.env.generate_address() for _ in range(num_users)]
+    amounts = [10**18] * len(coins)
+
+    def _eval():
+        for k in range(num_mints):
+            tokens._mint_eval(coins[k % 3], users[k % num_users], 10**18)
+
+    def _fast():
+        for k in range(num_mints):
+            tokens.mint_for_testing(
+                coins[k % 3], users[k % num_users], 10**18
+            )
+
+    def _bulk():
+        for _ in range(num_mints // (len(coins) * num_users)):
+            tokens.mint_many(coins, users, amounts)
+
+    with boa.env.anchor():
+        t_eval = _timeit(_eval)
+    with boa.env.anchor():
+        t_fast = _timeit(_fast)
+    with boa.env.anchor():
+        t_bulk = _timeit(_bulk)
+
+    for name, t in [("eval", t_eval), ("storage", t_fast), ("bulk", t_bulk)]:
+        print(
+            f"{name}: {num_mints} mints | {t:.3f}s | "
+            f"{1e6 * t / num_mints:.0f}us per mint | "
+            f"speedup {t_eval / t:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,75 @@
+import random
+import time
+
+import click
+
+from tests.boa.utils import simulation_batch as batch
+from tests.boa.utils import simulation_int_many as sim
+
+A_MUL = 10000 * 3**3
+
+
+def sample_states(num_samples):
+
+    states = []
+    while len(states) < num_samples:
+
+        A = random.randint(int(0.01 * A_MUL), 1000 * A_MUL)
+        gamma = random.randint(10**10, 5 * 10**16)
+        D = random.randint(10**18, 10**14 * 10**18)
+        x = [
+            D * random.randint(int(0.2e18), int(5e18)) // 10**18
+            for _ in range(3)
+        ]
+        i = random.randint(0, 2)
+
+        try:
+            D = sim.solve_D(A, gamma, x)
+            sim.newton_y(A, gamma, x, D, i)
+        except Exception:
+            continue
+
+        states.append((A, gamma, x, D, i))
+
+    return states
+
+
+def _timeit(fn):
+    t = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t
+
+
+@click.command()
+@click.option("--num_samples", default=100000)
+@click.option("--seed", default=0)
+def bench(num_samples, seed):
+
+    random.seed(seed)
+    states = sample_states(num_samples)
+    A, gamma, x, D, i = (list(v) for v in zip(*states))
+
+    D_scalar, t_D_scalar = _timeit(
+        lambda: [sim.solve_D(*s[:3]) for s in states]
+    )
+    D_batch, t_D_batch = _timeit(lambda: batch.newton_D_batch(A, gamma, x))
+
+    y_scalar, t_y_scalar = _timeit(lambda: [sim.newton_y(*s) for s in states])
+    y_batch, t_y_batch = _timeit(
+        lambda: batch.newton_y_batch(A, gamma, x, D, i)
+    )
+
+    for name, scalar, batched, t_scalar, t_batch in [
+        ("newton_D", D_scalar, D_batch, t_D_scalar, t_D_batch),
+        ("newton_y", y_scalar, y_batch, t_y_scalar, t_y_batch),
+    ]:
+        identical = sum(a == b for a, b in zip(scalar, batched))
+        print(
+            f"{name}: {num_samples} states | scalar {t_scalar:.2f}s | "
+            f"batch {t_batch:.2f}s | speedup {t_scalar / t_batch:.1f}x | "
+            f"identical {identical}/{num_samples}"
+        )
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,23 @@
+import time
+
+import click
+
+from tests.boa.utils import candles
+
+
+@click.command()
+@click.option("--src", default="download/ethbtc.json")
+@click.option("--dst", default="download/ethbtc")
+@click.option("--pair", default=(0, 1), type=(int, int))
+def convert(src, dst, pair):
+    """
+    Convert binance klines json to a memory-mapped columnar dataset,
+    readable with candles.Candles(dst).
+    """
+    t = time.perf_counter()
+    n = candles.convert(src, dst, pair)
+    print(f"{n} candles -> {dst} in {time.perf_counter() - t:.1f}s")
+
+
+if __name__ == "__main__":
+    convert()
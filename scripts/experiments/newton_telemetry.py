@@ -0,0 +1,165 @@
+import random
+from collections import defaultdict
+
+import boa
+import click
+
+from tests.boa.utils import compile_cache
+from tests.boa.utils import math_optimized as math
+from tests.boa.utils import math_samples as samples
+from tests.boa.utils.gas import percentile
+from tests.boa.utils.newton_trace import trace_call
+
+A_MUL = 3**3 * 10000
+
+
+def _bucket(value, edges, labels):
+    for edge, label in zip(edges, labels):
+        if value < edge:
+            return label
+    return labels[-1]
+
+
+def regime(state):
+    A = _bucket(
+        state["A"] / A_MUL, [10, 100, 1000], ["<10", "<100", "<1000", ">=1000"]
+    )
+    gamma = _bucket(
+        state["gamma"] / 1e18,
+        [1e-5, 1e-4, 1e-3],
+        ["<1e-5", "<1e-4", "<1e-3", ">=1e-3"],
+    )
+    skew = min(state["xp"]) / max(state["xp"])
+    skew = _bucket(skew, [0.1, 0.5], ["very skewed", "skewed", "balanced"])
+    return f"A {A} | gamma {gamma} | {skew}"
+
+
+def exchange_calls(state, rng):
+    """
+    The math calls of an exchange in the pool: get_y for the trade, then
+    newton_D warm started with get_y's K0 in tweak_price. Also a cold
+    newton_D as in add_liquidity.
+    """
+    A, gamma, xp, D, j = samples.math_args("get_y", state, rng)
+    calls = [
+        ("newton_D", (A, gamma, state["xp"], 0)),
+        ("get_y", (A, gamma, xp, D, j)),
+    ]
+    try:
+        y, K0 = math.get_y(A, gamma, xp, D, j)
+    except ValueError:
+        return calls
+    xp = xp[:]
+    xp[j] = y
+    return calls + [("newton_D", (A, gamma, xp, K0))]
+
+
+@click.command()
+@click.option(
+    "--states", default=None, help="pool states (profile_math.py capture)"
+)
+@click.option(
+    "--num_samples", default=2000, help="sampled states without --states"
+)
+@click.option("--seed", default=0)
+@click.option(
+    "--check_boa", default=0, help="cross-check n calls against the contract"
+)
+def report(states, num_samples, seed, check_boa):
+
+    rng = random.Random(seed)
+    if states is not None:
+        states = samples.load_states(states)
+    else:
+        states = [samples.sample_state(rng) for _ in range(num_samples)]
+
+    compile_cache.install()
+    contract = boa.load("contracts/main/CurveCryptoMathOptimized3.vy")
+
+    records = defaultdict(list)
+    reverts = defaultdict(int)
+    mismatches = checked = 0
+    for state in states:
+        for fn_name, args in exchange_calls(state, rng):
+            with math.trace() as trace:
+                try:
+                    getattr(math, fn_name)(*args)
+                except ValueError:
+                    reverts[regime(state)] += 1
+            records[regime(state)].extend(trace)
+
+            if checked < check_boa and trace:
+                checked += 1
+                try:
+                    _, boa_records = trace_call(contract, fn_name, *args)
+                except boa.BoaError:
+                    boa_records = None
+                expected = [
+                    {
+                        k: v
+                        for k, v in r.items()
+                        if k not in ("residual", "converged")
+                    }
+                    for r in trace
+                ]
+                mismatches += (
+                    boa_records is not None and boa_records != expected
+                )
+
+    columns = [
+        ("regime", 42),
+        ("D calls", 8),
+        ("D mean", 7),
+        ("D p95", 6),
+        ("D max", 6),
+        ("no conv", 8),
+        ("y fallback", 11),
+        ("y mean", 7),
+        ("max residual", 13),
+        ("reverts", 8),
+    ]
+    rows = []
+    for name, trace in records.items():
+        D = [r for r in trace if r["fn"] == "newton_D"]
+        y = [r for r in trace if r["fn"] == "_newton_y"]
+        get_y = [r for r in trace if r["fn"] == "get_y"]
+        iterations = [r["iterations"] for r in D] or [0]
+        fallbacks = sum(r["fallback"] for r in get_y) / max(len(get_y), 1)
+        rows.append(
+            [
+                name,
+                len(D),
+                f"{sum(iterations) / len(iterations):.2f}",
+                percentile(iterations, 95),
+                max(iterations),
+                sum(not r["converged"] for r in D + y),
+                f"{100 * fallbacks:.1f}%",
+                f"{sum(r['iterations'] for r in y) / max(len(y), 1):.2f}",
+                max((r["residual"] or 0 for r in D + y), default=0),
+                reverts[name],
+            ]
+        )
+
+    # most expensive regimes (newton_D iterations) first:
+    rows.sort(key=lambda row: -float(row[2]))
+    print(
+        " ".join(
+            f"{c:<{w}}" if k == 0 else f"{c:>{w}}"
+            for k, (c, w) in enumerate(columns)
+        )
+    )
+    for row in rows:
+        print(
+            " ".join(
+                f"{v:<{w}}" if k == 0 else f"{v:>{w}}"
+                for k, (v, (_, w)) in enumerate(zip(row, columns))
+            )
+        )
+
+    if check_boa:
+        print(f"checked {checked} calls against the contract: ", end="")
+        print(f"{mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    report()
@@ -0,0 +1,136 @@
+import random
+
+import boa
+import click
+
+from tests.boa.utils import candles as candles_io
+from tests.boa.utils import compile_cache
+from tests.boa.utils import math_samples as samples
+from tests.boa.utils import simulation_int_many as sim
+from tests.boa.utils.gas import (
+    GasRecorder,
+    contract_name,
+    line_info,
+    percentile,
+)
+
+# _cbrt is internal, it is profiled through the external cbrt:
+FUNCTIONS = ("newton_D", "get_y", "get_p", "wad_exp", "cbrt")
+
+A = 135 * 3**3 * 10000
+GAMMA = int(7e-5 * 1e18)
+D = 3 * 10**6 * 10**18
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.option("--btc", required=True, help="BTC/USD candles (coin 1)")
+@click.option("--eth", required=True, help="ETH/USD candles (coin 2)")
+@click.option("--out", default="data/math_states.jsonl")
+@click.option("--every", default=10, help="capture every n-th candle")
+def capture(btc, eth, out, every):
+    """
+    Capture pool states of a simulated tricrypto pool trading against real
+    candles, for profile --states.
+    """
+    p0 = [10**18] + [
+        int(candles_io.load(path)[0]["close"] * 10**18)
+        for path in (btc, eth)
+    ]
+    trader = sim.Trader(
+        A,
+        GAMMA,
+        D,
+        3,
+        p0,
+        mid_fee=4e-4,
+        out_fee=4e-3,
+        fee_gamma=int(0.01 * 1e18),
+        adjustment_step=0.0015,
+        ma_time=866,
+        log=False,
+    )
+    candles = candles_io.load_pairs({(0, 1): btc, (0, 2): eth})
+    states = samples.trader_states(trader, candles, every)
+    samples.write_states(out, states)
+    print(f"{len(states)} states -> {out}")
+
+
+def _hotspots(recorder, name, limit):
+    profile = recorder.lines[name].profile
+    n = len(recorder.samples[name])
+    total = sum(datum.net_gas for datum in profile.values())
+    ranked = sorted(profile.items(), key=lambda item: -item[1].net_gas)
+    for (contract, line), datum in ranked[:limit]:
+        fn_name, source = line_info(contract, line)
+        print(
+            f"  {datum.net_gas / n:>9.1f} {100 * datum.net_gas / total:5.1f}%"
+            f"  {contract_name(contract)}:{line} {fn_name}  {source}"
+        )
+
+
+@cli.command()
+@click.option(
+    "--functions",
+    "-f",
+    multiple=True,
+    type=click.Choice(FUNCTIONS),
+    default=FUNCTIONS,
+)
+@click.option("--num_samples", default=1000)
+@click.option("--seed", default=0)
+@click.option("--states", default=None, help="pool states from capture")
+@click.option("--limit", default=15, help="hotspot lines per function")
+@click.option("--flamegraph", default=None, help="write folded stacks here")
+def profile(functions, num_samples, seed, states, limit, flamegraph):
+    """
+    Gas per source line of CurveCryptoMathOptimized3 functions, aggregated
+    over sampled (or captured) inputs.
+    """
+    compile_cache.install()
+    rng = random.Random(seed)
+    math = boa.load("contracts/main/CurveCryptoMathOptimized3.vy")
+    if states is not None:
+        states = samples.load_states(states)
+
+    recorder = GasRecorder(profile=True)
+    reverts = dict.fromkeys(functions, 0)
+    for fn_name in functions:
+        for _ in range(num_samples):
+            if states is not None:
+                state = rng.choice(states)
+            else:
+                state = samples.sample_state(rng)
+            args = samples.math_args(fn_name, state, rng)
+            try:
+                recorder.call(fn_name, getattr(math, fn_name), *args)
+            except boa.BoaError:
+                reverts[fn_name] += 1
+
+    for fn_name in functions:
+        gas = recorder.samples[fn_name]
+        if not gas:
+            print(f"{fn_name}: all {reverts[fn_name]} samples reverted")
+            continue
+        print(
+            f"{fn_name}: {len(gas)} samples, {reverts[fn_name]} reverts | "
+            f"tx gas p50 {percentile(gas, 50)} p95 {percentile(gas, 95)} "
+            f"max {max(gas)}"
+        )
+        print(f"  {'gas/call':>9} {'share':>6}  line")
+        _hotspots(recorder, fn_name, limit)
+
+    if flamegraph is not None:
+        with open(flamegraph, "w") as f:
+            for fn_name in functions:
+                for line in recorder.folded_stacks(fn_name):
+                    f.write(line + "\n")
+        print(f"folded stacks -> {flamegraph}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,89 @@
+import json
+import time
+
+import click
+
+from tests.boa.utils import compile_cache, replay
+
+PARAMS = {
+    "A": 135 * 3**3 * 10000,
+    "gamma": int(7e-5 * 1e18),
+    "mid_fee": int(4e-4 * 1e10),
+    "out_fee": int(4e-3 * 1e10),
+    "allowed_extra_profit": 2 * 10**12,
+    "fee_gamma": int(0.01 * 1e18),
+    "adjustment_step": int(0.0015 * 1e18),
+    "ma_time": 866,
+}
+
+
+@click.command()
+@click.option("--events", required=True, help="pool events (json lines)")
+@click.option("--engine", type=click.Choice(["boa", "sim"]), default="boa")
+@click.option("--decimals", default="18,18,18", help="decimals of the coins")
+@click.option("--A", "A", default=PARAMS["A"])
+@click.option("--gamma", default=PARAMS["gamma"])
+@click.option("--mid_fee", default=PARAMS["mid_fee"])
+@click.option("--out_fee", default=PARAMS["out_fee"])
+@click.option("--fee_gamma", default=PARAMS["fee_gamma"])
+@click.option("--adjustment_step", default=PARAMS["adjustment_step"])
+@click.option("--ma_time", default=PARAMS["ma_time"])
+@click.option("--states_out", default=None, help="write pool states here")
+@click.option("--every", default=100, help="write every n-th block's state")
+@click.option("--strict", is_flag=True, help="stop at the first failure")
+def main(events, engine, decimals, states_out, every, strict, **params):
+    """
+    Replay recorded pool events against a fresh pool (boa) or the python
+    pool model (sim). Pool parameters default to the test fixtures, the
+    initial prices are those of the first deposit.
+    """
+    events = replay.load_events(events)
+    decimals = [int(d) for d in decimals.split(",")]
+
+    first_deposit = next(e for e in events if e["event"] == "AddLiquidity")
+    params = dict(PARAMS, **params)
+    params["initial_prices"] = replay.unpack_prices(
+        first_deposit["args"]["packed_price_scale"]
+    )
+
+    if engine == "boa":
+        compile_cache.install()
+        engine = replay.BoaEngine(*replay.deploy_pool(params, decimals))
+    else:
+        precisions = [10 ** (18 - d) for d in decimals]
+        engine = replay.SimEngine(params, precisions)
+
+    states = []
+    num_blocks = [0]
+
+    def on_block(number, timestamp, engine):
+        num_blocks[0] += 1
+        if (num_blocks[0] - 1) % every:
+            return
+        state = {"blockNumber": number, "timestamp": timestamp}
+        try:
+            state.update(engine.state())
+        except ValueError:  # <- sim engine before the first deposit
+            pass
+        states.append(state)
+
+    t0 = time.time()
+    stats = replay.replay(engine, events, strict=strict, on_block=on_block)
+    elapsed = time.time() - t0
+
+    for name, n in sorted(stats.items()):
+        print(f"{name:<28} {n:>8}")
+    print(
+        f"{len(events)} events in {elapsed:.1f}s "
+        f"({len(events) / elapsed:.0f} events/s)"
+    )
+
+    if states_out:
+        with open(states_out, "w") as f:
+            for state in states:
+                f.write(json.dumps(state) + "\n")
+        print(f"{len(states)} states -> {states_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import random
+import time
+
+import click
+
+from tests.boa.utils import simulation_int_many as sim
+
+A = 135 * 3**3 * 10000
+GAMMA = int(7e-5 * 1e18)
+D = 3 * 10**6 * 10**18
+P0 = [10**18, 47500 * 10**18, 1500 * 10**18]
+
+
+def run(num_trades, seed, warm_start):
+
+    random.seed(seed)
+    trader = sim.Trader(
+        A,
+        GAMMA,
+        D,
+        3,
+        P0,
+        mid_fee=4e-4,
+        out_fee=4e-3,
+        fee_gamma=int(0.01 * 1e18),
+        adjustment_step=0.0015,
+        ma_time=866,
+        warm_start=warm_start,
+    )
+
+    trader.t = 0
+    t = time.perf_counter()
+    for k in range(num_trades):
+        i, j = random.sample(range(3), 2)
+        dx = random.randint(1, 10**5) * 10**36 // trader.price_oracle[i]
+        if k % 2:
+            trader.buy(dx, i, j)
+        else:
+            trader.sell(dx, i, j)
+        trader.tweak_price(12 * (k + 1))
+
+    return trader, time.perf_counter() - t
+
+
+def _total(histogram):
+    return sum(n * count for n, count in histogram.items())
+
+
+@click.command()
+@click.option("--num_trades", default=1000)
+@click.option("--seed", default=0)
+def report(num_trades, seed):
+
+    cold, t_cold = run(num_trades, seed, False)
+    warm, t_warm = run(num_trades, seed, True)
+
+    for name in ("D", "y"):
+        h_cold = cold.curve.iterations[name]
+        h_warm = warm.curve.iterations[name]
+        print(f"newton_{name}:")
+        print(f"  cold: {dict(sorted(h_cold.items()))}")
+        print(f"  warm: {dict(sorted(h_warm.items()))}")
+        print(
+            f"  iterations: {_total(h_cold)} -> {_total(h_warm)} "
+            f"(saved {_total(h_cold) - _total(h_warm)})"
+        )
+
+    print(f"time: cold {t_cold:.2f}s | warm {t_warm:.2f}s")
+    print(
+        "max relative difference of balances: "
+        + str(max(abs(a - b) / a for a, b in zip(cold.curve.x, warm.curve.x)))
+    )
+
+
+if __name__ == "__main__":
+    report()
@@ -0,0 +1,47 @@
+import time
+
+import click
+
+from tests.boa.utils import simulation_sweep as sweep
+
+
+def _values(text):
+    # "100,400,1000" -> [100.0, 400.0, 1000.0]; "none" keeps the default
+    return [None if v == "none" else float(v) for v in text.split(",")]
+
+
+@click.command()
+@click.option("--candles", default="download/ethbtc.json")
+@click.option("--out", default="sweep.csv")
+@click.option("--workers", default=None, type=int)
+@click.option("--A", "A", default="100")
+@click.option("--gamma", default="1.5e-4")
+@click.option("--mid_fee", default="7e-4")
+@click.option("--out_fee", default="4e-3")
+@click.option("--fee_gamma", default="0.01")
+@click.option("--price_threshold", default="0.004")
+@click.option("--adjustment_step", default="3e-3")
+@click.option("--ma_time", default="none")
+@click.option("--continue_on_error", is_flag=True)
+def run(candles, out, workers, continue_on_error, **params):
+    """
+    Backtest every combination of the comma-separated parameter values,
+    e.g. --A 100,400,1000 --mid_fee 5e-4,7e-4 runs 6 simulations. With
+    --continue_on_error, failed runs are written with their exception.
+    """
+    runs = sweep.grid(**{k: _values(v) for k, v in params.items()})
+    print(f"{len(runs)} runs -> {out}")
+
+    t = time.perf_counter()
+    sweep.sweep(
+        runs,
+        candles,
+        out,
+        max_workers=workers,
+        continue_on_error=continue_on_error,
+    )
+    print(f"done in {time.perf_counter() - t:.1f}s")
+
+
+if __name__ == "__main__":
+    run()
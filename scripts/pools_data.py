@@ -0,0 +1,66 @@
+import json
+
+import click
+
+# Members of the PoolData structs returned by get_pools_data, in order:
+FACTORY_FIELDS = ["pool", "coins", "decimals", "balances", "liquidity_gauge"]
+HANDLER_FIELDS = ["pool", "coins", "decimals", "balances", "fees", "params"]
+
+
+def _as_dict(data, fields):
+    # boa returns structs as tuples, ape as objects with attributes
+    if isinstance(data, (tuple, list)):
+        values = data
+    else:
+        values = [getattr(data, field) for field in fields]
+    return {
+        field: list(value) if isinstance(value, (tuple, list)) else value
+        for field, value in zip(fields, values)
+    }
+
+
+def iter_pools_data(registry, fields=HANDLER_FIELDS, page_size=100):
+    """
+    Page through registry.get_pools_data (factory or factory handler) and
+    yield one dict per pool, in the order of pool_list. Pages are capped
+    on-chain, so the next offset is the length of what was returned.
+    """
+    offset = 0
+    while True:
+        page = registry.get_pools_data(offset, page_size)
+        if len(page) == 0:
+            return
+        for data in page:
+            yield _as_dict(data, fields)
+        offset += len(page)
+
+
+@click.command()
+@click.option("--network", default="ethereum:mainnet", help="ape network")
+@click.option("--address", required=True, help="factory handler address")
+@click.option("--factory", is_flag=True, help="address is the factory")
+@click.option("--page_size", default=100)
+@click.option("--out", default="pools_data.json")
+def cli(network, address, factory, page_size, out):
+    """
+    Snapshot every pool of a factory (or its metaregistry handler) into a
+    json file, with one get_pools_data call per page of pools.
+    """
+    # imported here so that the pager above works without ape:
+    from ape import networks, project
+
+    if factory:
+        contract, fields = project.CurveTricryptoFactory, FACTORY_FIELDS
+    else:
+        contract, fields = project.CurveTricryptoFactoryHandler, HANDLER_FIELDS
+
+    with networks.parse_network_choice(network):
+        pools = list(iter_pools_data(contract.at(address), fields, page_size))
+
+    with open(out, "w") as f:
+        json.dump(pools, f, indent=2)
+    click.echo(f"{len(pools)} pools written to {out}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -5,34 +5,34 @@ from eth_account.account import Account
 from tests.boa.utils.tokens import mint_for_testing
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def deployer():
     return boa.env.generate_address()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def owner():
     return boa.env.generate_address()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def factory_admin(tricrypto_factory):
     return tricrypto_factory.admin()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def fee_receiver():
     return boa.env.generate_address()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def user():
     acc = boa.env.generate_address()
     boa.env.set_balance(acc, 10**25)
     return acc
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def users():
     accs = [i() for i in [boa.env.generate_address] * 10]
     for acc in accs:
@@ -40,32 +40,32 @@ def users():
     return accs
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def eth_acc():
     return Account.create()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def alice():
     acc = boa.env.generate_address()
     boa.env.set_balance(acc, 10**25)
     return acc
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture  # <- mints on the shared swap, rolled back after each test
 def loaded_alice(swap, alice):
     mint_for_testing(swap, alice, 10**21)
     return alice
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def bob():
     acc = boa.env.generate_address()
     boa.env.set_balance(acc, 10**25)
     return acc
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def charlie():
     acc = boa.env.generate_address()
     boa.env.set_balance(acc, 10**25)
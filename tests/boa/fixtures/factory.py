@@ -2,13 +2,13 @@ import boa
 import pytest
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def math_contract(deployer):
     with boa.env.prank(deployer):
         return boa.load("contracts/main/CurveCryptoMathOptimized3.vy")
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def math_experimental_contract(deployer):
     with boa.env.prank(deployer):
         return boa.load(
@@ -16,48 +16,48 @@ def math_experimental_contract(deployer):
         )
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def gauge_interface():
     return boa.load_partial("contracts/main/LiquidityGauge.vy")
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def gauge_implementation(deployer, gauge_interface):
     with boa.env.prank(deployer):
         return gauge_interface.deploy_as_blueprint()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def amm_interface():
     return boa.load_partial("contracts/main/CurveTricryptoOptimizedWETH.vy")
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def amm_implementation(deployer, amm_interface):
     with boa.env.prank(deployer):
         return amm_interface.deploy_as_blueprint()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def hyperamm_interface():
     return boa.load_partial(
         "contracts/experimental/secant_method/CurveTricryptoHyperOptimizedWETH.vy"  # noqa: E501
     )
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def hyperamm_implementation(deployer, hyperamm_interface):
     with boa.env.prank(deployer):
         return hyperamm_interface.deploy_as_blueprint()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def views_contract(deployer):
     with boa.env.prank(deployer):
         return boa.load("contracts/main/CurveCryptoViews3Optimized.vy")
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def tricrypto_factory(
     deployer,
     fee_receiver,
@@ -83,7 +83,7 @@ def tricrypto_factory(
     return factory
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def tricrypto_factory_experimental(
     deployer,
     fee_receiver,
@@ -1,7 +1,7 @@
 import pytest
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def cbrt_1e18_base():
     def _impl(x: int) -> int:
         # x is taken at base 1e36
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from tests.boa.utils import gas
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-gas-baseline",
+        action="store_true",
+        help="write measured gas to the baselines instead of checking them",
+    )
+    parser.addoption(
+        "--gas-threshold",
+        type=float,
+        default=0.01,
+        help="relative p50/p95 gas increase that fails a gas benchmark",
+    )
+    parser.addoption(
+        "--gas-report",
+        default=None,
+        help="directory to write markdown gas comparison reports to",
+    )
+
+
+@pytest.fixture(scope="session")
+def check_gas(request):
+    """
+    check_gas(summary, path) compares a GasRecorder summary with the json
+    baseline at path and fails on regressions, or rewrites the baseline
+    with --update-gas-baseline.
+    """
+    update = request.config.getoption("update_gas_baseline")
+    threshold = request.config.getoption("gas_threshold")
+
+    def _check_gas(summary, path):
+        if update:
+            gas.write_baseline(path, summary)
+            return
+        regressions = gas.compare(summary, gas.load_baseline(path), threshold)
+        if regressions:
+            pytest.fail(
+                "gas regressions against "
+                f"{path} (run with --update-gas-baseline to accept):\n"
+                + "\n".join(regressions)
+            )
+
+    return _check_gas
+
+
+@pytest.fixture(scope="session")
+def gas_report(request):
+    """
+    gas_report(name, markdown) writes a gas comparison report to
+    <--gas-report>/<name>.md. Without --gas-report reports are discarded.
+    """
+    report_dir = request.config.getoption("gas_report")
+
+    def _gas_report(name, markdown):
+        if report_dir is None:
+            return
+        os.makedirs(report_dir, exist_ok=True)
+        with open(os.path.join(report_dir, f"{name}.md"), "w") as f:
+            f.write(markdown)
+
+    return _gas_report
@@ -43,7 +43,7 @@ def _crypto_swap_with_deposit(
     return tricrypto_swap
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def params():
 
     return {
@@ -60,17 +60,10 @@ def params():
     }
 
 
-@pytest.fixture(scope="module")
-def swap(
-    tricrypto_factory,
-    amm_interface,
-    coins,
-    weth,
-    params,
-    deployer,
-):
+def _deploy_swap(factory, amm_interface, coins, weth, params, deployer):
+
     with boa.env.prank(deployer):
-        swap = tricrypto_factory.deploy_pool(
+        swap = factory.deploy_pool(
             "Curve.fi USDC-BTC-ETH",
             "USDCBTCETH",
             [coin.address for coin in coins],
@@ -90,7 +83,49 @@ def swap(
     return amm_interface.at(swap)
 
 
-@pytest.fixture(scope="module")
+def _deploy_hyper_swap(factory, hyperamm_interface, coins, params, deployer):
+
+    with boa.env.prank(deployer):
+        swap = factory.deploy_pool(
+            "Curve.fi USDC-BTC-ETH",
+            "USDCBTCETH",
+            [coin.address for coin in coins],
+            0,  # <-------- 0th implementation index
+            params["A"],
+            params["gamma"],
+            params["mid_fee"],
+            params["out_fee"],
+            params["fee_gamma"],
+            params["allowed_extra_profit"],
+            params["adjustment_step"],
+            params["ma_time"],  # <--- no admin_fee needed
+            params["initial_prices"],
+        )
+
+    return hyperamm_interface.at(swap)
+
+
+# Pools are deployed and seeded once per session, each seeded pool is its
+# own deployment so that seeding never touches the empty `swap`. Tests
+# start from these states: the autouse `rollback` fixture in
+# tests/conftest.py reverts the evm state after every test.
+
+
+@pytest.fixture(scope="session")
+def swap(
+    tricrypto_factory,
+    amm_interface,
+    coins,
+    weth,
+    params,
+    deployer,
+):
+    return _deploy_swap(
+        tricrypto_factory, amm_interface, coins, weth, params, deployer
+    )
+
+
+@pytest.fixture(scope="session")
 def swap_multiprecision(
     tricrypto_factory,
     amm_interface,
@@ -132,7 +167,7 @@ def swap_multiprecision(
     return amm_interface.at(swap)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def hyper_swap(
     tricrypto_factory_experimental,
     hyperamm_interface,
@@ -140,38 +175,51 @@ def hyper_swap(
     params,
     deployer,
 ):
-    with boa.env.prank(deployer):
-        swap = tricrypto_factory_experimental.deploy_pool(
-            "Curve.fi USDC-BTC-ETH",
-            "USDCBTCETH",
-            [coin.address for coin in coins],
-            0,  # <-------- 0th implementation index
-            params["A"],
-            params["gamma"],
-            params["mid_fee"],
-            params["out_fee"],
-            params["fee_gamma"],
-            params["allowed_extra_profit"],
-            params["adjustment_step"],
-            params["ma_time"],  # <--- no admin_fee needed
-            params["initial_prices"],
-        )
-
-    return hyperamm_interface.at(swap)
+    return _deploy_hyper_swap(
+        tricrypto_factory_experimental,
+        hyperamm_interface,
+        coins,
+        params,
+        deployer,
+    )
 
 
-@pytest.fixture(scope="module")
-def swap_with_deposit(swap, coins, user):
+@pytest.fixture(scope="session")
+def swap_with_deposit(
+    tricrypto_factory, amm_interface, coins, weth, params, deployer, user
+):
+    swap = _deploy_swap(
+        tricrypto_factory, amm_interface, coins, weth, params, deployer
+    )
     yield _crypto_swap_with_deposit(coins, user, swap, INITIAL_PRICES)
 
 
-@pytest.fixture(scope="module")
-def hyper_swap_with_deposit(hyper_swap, coins, user):
-    yield _crypto_swap_with_deposit(coins, user, hyper_swap, INITIAL_PRICES)
+@pytest.fixture(scope="session")
+def hyper_swap_with_deposit(
+    tricrypto_factory_experimental,
+    hyperamm_interface,
+    coins,
+    params,
+    deployer,
+    user,
+):
+    swap = _deploy_hyper_swap(
+        tricrypto_factory_experimental,
+        hyperamm_interface,
+        coins,
+        params,
+        deployer,
+    )
+    yield _crypto_swap_with_deposit(coins, user, swap, INITIAL_PRICES)
 
 
-@pytest.fixture(scope="module")
-def yuge_swap(swap, coins, user):
+@pytest.fixture(scope="session")
+def yuge_swap(
+    tricrypto_factory, amm_interface, coins, weth, params, deployer, user
+):
+    swap = _deploy_swap(
+        tricrypto_factory, amm_interface, coins, weth, params, deployer
+    )
     yield _crypto_swap_with_deposit(
         coins, user, swap, INITIAL_PRICES, dollar_amt_each_coin=10**10
     )
@@ -0,0 +1,194 @@
+import random
+from collections import defaultdict
+
+import pytest
+from hypothesis import seed as hypothesis_seed
+
+# Sharding of heavy hypothesis tests, e.g. over xdist workers.
+#
+# A @given test opts in with @pytest.mark.usefixtures("hypothesis_shard") and
+# @settings(max_examples=shard_examples(total)), a state machine test takes
+# the `hypothesis_shard` fixture and uses its max_examples() and seeded().
+# With --shards=N such tests are parametrized into N items and shard k runs
+# total / N examples with seed base + k, where base is --hypothesis-seed or
+# a random seed printed in the report. Rerunning with the same --shards and
+# --hypothesis-seed explores the same examples. Without --shards tests run
+# as before, also under xdist.
+#
+# Shards are independent seeded runs, not a partition of the example space:
+# their examples can overlap, so N shards do not add up to the coverage of
+# one run of total examples.
+
+# number of shards and base seed of this session, set by pytest_configure:
+_count = 1
+_seed = None
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--shards",
+        type=int,
+        default=None,
+        help="split sharded hypothesis tests into this many items",
+    )
+
+
+def _shard_count(config):
+    return max(config.getoption("shards") or 1, 1)
+
+
+def pytest_configure(config):
+    global _count, _seed
+    _count = _shard_count(config)
+    if _count == 1:
+        return
+
+    # xdist workers take the seed of the controller (pytest_configure_node),
+    # so that all shards of a session share the same base seed:
+    workerinput = getattr(config, "workerinput", {})
+    if "hypothesis_shard_seed" in workerinput:
+        _seed = workerinput["hypothesis_shard_seed"]
+    elif config.getoption("hypothesis_seed") is not None:
+        _seed = int(config.getoption("hypothesis_seed"))
+    else:
+        _seed = random.getrandbits(32)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["hypothesis_shard_seed"] = _seed
+
+
+def pytest_report_header(config):
+    if _count > 1:
+        return f"hypothesis shards: {_count}, base seed {_seed}"
+
+
+def shard_examples(total):
+    """
+    max_examples of every shard of a test that runs total examples when it
+    is not sharded.
+    """
+    return max(-(-total // _count), 1)
+
+
+def pytest_generate_tests(metafunc):
+    if "hypothesis_shard" not in metafunc.fixturenames:
+        return
+    count = _shard_count(metafunc.config)
+    if count > 1:
+        metafunc.parametrize(
+            "hypothesis_shard",
+            range(count),
+            indirect=True,
+            ids=[f"shard{k}" for k in range(count)],
+        )
+
+
+class Shard:
+    def __init__(self, index=0, count=1, seed=None):
+        self.index = index
+        self.count = count
+        self.seed = seed
+
+    def max_examples(self, total):
+        return shard_examples(total)
+
+    def seeded(self, test):
+        # seed a @given test or a state machine class (see hypothesis.seed)
+        if self.count == 1:
+            return test
+        return hypothesis_seed(self.seed)(test)
+
+
+@pytest.fixture
+def hypothesis_shard(request):
+    count = _shard_count(request.config)
+    if count == 1 or not hasattr(request, "param"):
+        return Shard()
+
+    shard = Shard(request.param, count, _seed + request.param)
+    request.node.user_properties.append(
+        ("hypothesis_shard", (shard.index, shard.count, shard.seed))
+    )
+
+    # @given tests are seeded here, their max_examples is shard_examples().
+    # All shards of a session seed the test before they run, so the seed
+    # does not need to be reset. hypothesis.seed sets an attribute, which
+    # needs the underlying function of a bound method:
+    test = getattr(request.function, "__func__", request.function)
+    if getattr(test, "is_hypothesis_test", False):
+        shard.seeded(test)
+    return shard
+
+
+def _falsifying_example(report):
+    # hypothesis adds the example to the error message, which pytest prints
+    # as "E   " lines of the traceback (indented lines with --tb=no/line)
+    lines = report.longreprtext.splitlines()
+    starts = [
+        k for k, line in enumerate(lines) if "Falsifying example" in line
+    ]
+    if not starts:
+        # e.g. with --tb=no, or the test failed outside of hypothesis
+        crash = getattr(report.longrepr, "reprcrash", None)
+        if crash and crash.message:
+            return [crash.message]
+        return ["no falsifying example in the report"]
+
+    k = starts[-1]
+    indent = lines[k].index("Falsifying example")
+    example = []
+    for line in lines[k:]:
+        if len(line) <= indent or line[:indent].strip() not in ("", "E"):
+            break
+        example.append(line[indent:].rstrip())
+    return example
+
+
+def pytest_terminal_summary(terminalreporter):
+    # reports of all workers end up here: failing examples of all shards of
+    # a test are merged, shards that failed with the same example together
+    results = defaultdict(dict)
+    for outcome in ("passed", "failed"):
+        for report in terminalreporter.stats.get(outcome, []):
+            if getattr(report, "when", None) != "call":
+                continue
+            properties = dict(report.user_properties)
+            if "hypothesis_shard" not in properties:
+                continue
+            index, count, seed = properties["hypothesis_shard"]
+            test = report.nodeid.replace(f"shard{index}", "shard*")
+            example = None
+            if outcome == "failed":
+                example = tuple(_falsifying_example(report))
+            results[test][index] = (count, seed, report.nodeid, example)
+
+    if not results:
+        return
+
+    terminalreporter.section("hypothesis shards")
+    terminalreporter.write_line(f"base seed {_seed}")
+    for test, shards in sorted(results.items()):
+        count = next(iter(shards.values()))[0]
+        examples = defaultdict(list)
+        for k, (_, seed, nodeid, example) in sorted(shards.items()):
+            if example is not None:
+                examples[example].append((k, seed, nodeid))
+
+        failed = sum(len(v) for v in examples.values())
+        terminalreporter.write_line(
+            f"{test}: {len(shards) - failed}/{count} shards passed"
+        )
+        for example, failures in examples.items():
+            names = ", ".join(
+                f"shard{k} (seed {seed})" for k, seed, _ in failures
+            )
+            k, seed, nodeid = failures[0]
+            terminalreporter.write_line(f"  {names} failed:")
+            for line in example:
+                terminalreporter.write_line(f"    {line}")
+            terminalreporter.write_line(
+                f'  rerun with: pytest "{nodeid}" --shards={count} '
+                f"--hypothesis-seed={seed - k}"
+            )
@@ -1,9 +1,10 @@
-import unittest
 from itertools import permutations
 
 import hypothesis.strategies as st
+import pytest
 from hypothesis import given, settings
 
+from tests.boa.fixtures.shards import shard_examples
 from tests.boa.utils.simulation_int_many import Curve, solve_D, solve_x
 
 MAX_EXAMPLES_MEAN = 20000
@@ -27,8 +28,10 @@ MIN_GAMMA = 10**10
 MAX_GAMMA = 5 * 10**16
 
 
-# Test with 3 coins for simplicity
-class TestCurve(unittest.TestCase):
+# Test with 3 coins for simplicity. Not collected by default (fuzz_*.py),
+# run with e.g.: pytest tests/boa/fuzz_multicoin_curve.py -n 32
+@pytest.mark.usefixtures("hypothesis_shard")
+class TestCurve:
     @given(
         A=st.integers(MIN_A, MAX_A),
         x=st.integers(10**9, 10**15 * 10**18),  # 1e-9 USD to 1e15 USD
@@ -41,7 +44,7 @@ class TestCurve(unittest.TestCase):
         perm=st.integers(0, 5),  # <- permutation mapping to values
         gamma=st.integers(MIN_GAMMA, MAX_GAMMA),
     )
-    @settings(max_examples=MAX_EXAMPLES_D)
+    @settings(max_examples=shard_examples(MAX_EXAMPLES_D))
     def test_D_convergence(self, A, x, yx, zx, perm, gamma):
         # Price not needed for convergence testing
         pmap = list(permutations(range(3)))
@@ -67,7 +70,7 @@ class TestCurve(unittest.TestCase):
         dy=st.integers(0, 10**18),
         dz=st.integers(0, 10**18),
     )
-    @settings(max_examples=MAX_EXAMPLES_NOLOSS)
+    @settings(max_examples=shard_examples(MAX_EXAMPLES_NOLOSS))
     def test_D_noloss(self, A, x, yx, zx, perm, gamma, dx, dy, dz):
         # Add a little bit and check that D didn't decrease
         pmap = list(permutations(range(3)))
@@ -101,7 +104,7 @@ class TestCurve(unittest.TestCase):
         j=st.integers(0, 2),
         inx=st.integers(10**15, 10**21),
     )
-    @settings(max_examples=MAX_EXAMPLES_Y)
+    @settings(max_examples=shard_examples(MAX_EXAMPLES_Y))
     def test_y_convergence(self, A, x, yx, zx, gamma, i, j, inx):
         if i == j:
             return
@@ -123,7 +126,7 @@ class TestCurve(unittest.TestCase):
         j=st.integers(0, 2),
         inx=st.integers(3 * 10**15, 3 * 10**20),
     )
-    @settings(max_examples=MAX_EXAMPLES_NOLOSS)
+    @settings(max_examples=shard_examples(MAX_EXAMPLES_NOLOSS))
     def test_y_noloss(self, A, x, yx, zx, gamma, i, j, inx):
         if i == j:
             return
@@ -171,7 +174,7 @@ class TestCurve(unittest.TestCase):
         gamma=st.integers(MIN_GAMMA, MAX_GAMMA),
         j=st.integers(0, 2),
     )
-    @settings(max_examples=MAX_EXAMPLES_YD)
+    @settings(max_examples=shard_examples(MAX_EXAMPLES_YD))
     def test_y_from_D(self, A, D, xD, yD, zD, gamma, j):
 
         xp = [D * xD // 10**18, D * yD // 10**18, D * zD // 10**18]
@@ -190,4 +193,4 @@ class TestCurve(unittest.TestCase):
 
 
 if __name__ == "__main__":
-    unittest.main()
+    pytest.main([__file__])
@@ -5,7 +5,7 @@ from tests.boa.fixtures.pool import INITIAL_PRICES
 from tests.boa.utils.tokens import mint_for_testing
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def init_params():
     ma_time = 600  # 10 minutes
     return {
@@ -21,7 +21,7 @@ def init_params():
     }
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def token_legacy(deployer):
     with boa.env.prank(deployer):
         return boa.load(
@@ -31,18 +31,18 @@ def token_legacy(deployer):
         )
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def math_legacy():
     return boa.load("contracts/old/CurveCryptoMath3.vy")
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def views_legacy(deployer, math_legacy):
     with boa.env.prank(deployer):
         return boa.load("contracts/old/CurveCryptoViews3.vy", math_legacy)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def swap_legacy_empty(
     owner,
     fee_receiver,
@@ -106,13 +106,14 @@ def swap_legacy_empty(
             init_params["admin_fee"],
             init_params["ma_time"],
             INITIAL_PRICES[1:],
+            name="CurveCryptoSwap",
         )
         token_legacy.set_minter(swap.address)
 
     return swap
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def swap_legacy(swap_legacy_empty, coins, user):
     quantities = [10**6 * 10**36 // p for p in INITIAL_PRICES]  # $3M worth
 
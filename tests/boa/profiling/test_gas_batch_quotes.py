@@ -0,0 +1,80 @@
+from tests.boa.utils.gas import GasRecorder
+
+SIZES = [1, 4, 16, 64]
+
+
+def _quotes(swap, views):
+    # (name, single quote of amount k, batched quote of amounts)
+    balance, supply = swap.balances(0), swap.totalSupply()
+    return [
+        (
+            "get_dy",
+            lambda k: (views.get_dy, 0, 1, balance * k // 10**4, swap),
+            lambda n: (
+                views.get_dy_many,
+                0,
+                1,
+                [balance * k // 10**4 for k in range(1, n + 1)],
+                swap,
+            ),
+        ),
+        (
+            "get_dx",
+            lambda k: (views.get_dx, 1, 0, balance * k // 10**4, swap),
+            lambda n: (
+                views.get_dx_many,
+                1,
+                0,
+                [balance * k // 10**4 for k in range(1, n + 1)],
+                swap,
+            ),
+        ),
+        (
+            "calc_withdraw_one_coin",
+            lambda k: (
+                views.calc_withdraw_one_coin,
+                supply * k // 10**4,
+                2,
+                swap,
+            ),
+            lambda n: (
+                views.calc_withdraw_one_coin_many,
+                [supply * k // 10**4 for k in range(1, n + 1)],
+                2,
+                swap,
+            ),
+        ),
+    ]
+
+
+def test_gas_batch_quotes(swap_with_deposit, views_contract, gas_report):
+    """
+    Gas per quote of the batched views against one call per amount.
+    """
+    recorder = GasRecorder()
+    rows = []
+    for name, single, many in _quotes(swap_with_deposit, views_contract):
+        for k in range(1, max(SIZES) + 1):
+            recorder.call(name, *single(k))
+        per_quote = recorder.summary()[name]["p50"]
+
+        for n in SIZES:
+            recorder.call(f"{name}_many[{n}]", *many(n))
+            batched = recorder.summary()[f"{name}_many[{n}]"]["p50"] / n
+            rows.append((name, n, per_quote, batched))
+
+            if n > 1:
+                assert batched < per_quote
+
+    out = [
+        "## Gas per quote",
+        "",
+        "| quote | amounts | single calls | batched | saving |",
+        "|---|---|---|---|---|",
+    ]
+    for name, n, per_quote, batched in rows:
+        out.append(
+            f"| {name} | {n} | {per_quote} | {batched:.0f} "
+            f"| {100 * (1 - batched / per_quote):.1f}% |"
+        )
+    gas_report("batch_quotes", "\n".join(out) + "\n")
@@ -0,0 +1,199 @@
+import os
+import random
+
+import boa
+
+from tests.boa.utils.gas import GasRecorder, compare
+from tests.boa.utils.tokens import mint_for_testing
+
+NUM_ROUNDS = 50
+BASELINE = os.path.join(os.path.dirname(__file__), "gas_baseline.json")
+
+
+def _sleep(rng):
+    # shorter than MIN_ADMIN_FEE_CLAIM_INTERVAL, fees are claimed separately
+    boa.env.time_travel(rng.randint(12, 600))
+
+
+def _fraction_of_balances(swap, rng, low, high):
+    return [int(swap.balances(k) * rng.uniform(low, high)) for k in range(3)]
+
+
+def _exchanges(swap, coins, recorder, rng):
+
+    i, j = rng.sample(range(3), 2)
+    dx = int(swap.balances(i) * rng.uniform(1e-3, 1e-2))
+    recorder.call("exchange", swap.exchange, i, j, dx, 0)
+    _sleep(rng)
+
+    i, j = rng.sample(range(3), 2)
+    dx = int(swap.balances(i) * rng.uniform(1e-3, 1e-2))
+    coins[i].transfer(swap, dx)
+    recorder.call("exchange_received", swap.exchange_received, i, j, dx, 0)
+    _sleep(rng)
+
+
+def _deposits(swap, recorder, rng):
+
+    c = rng.uniform(1e-3, 1e-2)
+    amounts = [int(swap.balances(k) * c) for k in range(3)]
+    recorder.call("add_liquidity_balanced", swap.add_liquidity, amounts, 0)
+    _sleep(rng)
+
+    amounts = _fraction_of_balances(swap, rng, 0, 1e-2)
+    recorder.call("add_liquidity_imbalanced", swap.add_liquidity, amounts, 0)
+    _sleep(rng)
+
+    i = rng.randint(0, 1)
+    amounts = [0, 0, 0]
+    amounts[i] = int(swap.balances(i) * rng.uniform(1e-3, 1e-2))
+    recorder.call("add_liquidity_one", swap.add_liquidity, amounts, 0)
+    _sleep(rng)
+
+    # coins[2] is WETH:
+    amounts = [0, 0, int(swap.balances(2) * rng.uniform(1e-3, 1e-2))]
+    recorder.call("add_liquidity_weth", swap.add_liquidity, amounts, 0)
+    _sleep(rng)
+
+
+def _withdrawals(swap, user, recorder, rng):
+
+    amount = int(swap.balanceOf(user) * rng.uniform(1e-3, 1e-2))
+    recorder.call("remove_liquidity", swap.remove_liquidity, amount, [0, 0, 0])
+    _sleep(rng)
+
+    amount = int(swap.balanceOf(user) * rng.uniform(1e-3, 1e-2))
+    recorder.call(
+        "remove_liquidity_one_coin",
+        swap.remove_liquidity_one_coin,
+        amount,
+        rng.randint(0, 2),
+        0,
+    )
+    _sleep(rng)
+
+
+def _rebalancing_exchange(swap, recorder, rng):
+    # a round trip earns the fees that rebalancing spends, then a trade
+    # moves the spot price away from price_scale. The oracle follows it
+    # while time passes and the next trade adjusts price_scale:
+    i, j = rng.sample(range(3), 2)
+    dy = swap.exchange(i, j, int(swap.balances(i) * 0.05), 0)
+    swap.exchange(j, i, dy, 0)
+
+    i, j = rng.sample(range(3), 2)
+    swap.exchange(i, j, int(swap.balances(i) * rng.uniform(0.01, 0.02)), 0)
+    boa.env.time_travel(rng.randint(600, 3600))
+
+    i, j = rng.sample(range(3), 2)
+    dx = int(swap.balances(i) * rng.uniform(1e-3, 1e-2))
+    price_scale = [swap.price_scale(k) for k in range(2)]
+    with boa.env.anchor():
+        swap.exchange(i, j, dx, 0)
+        rebalances = [swap.price_scale(k) for k in range(2)] != price_scale
+
+    if rebalances:
+        recorder.call("exchange_rebalance", swap.exchange, i, j, dx, 0)
+    else:
+        swap.exchange(i, j, dx, 0)
+    _sleep(rng)
+
+
+def _claim_admin_fees(swap, recorder, rng):
+    # admin fees are claimed by liquidity actions once a day:
+    boa.env.time_travel(86400)
+    amounts = _fraction_of_balances(swap, rng, 1e-4, 1e-3)
+    recorder.call(
+        "add_liquidity_claim_admin_fees", swap.add_liquidity, amounts, 0
+    )
+
+
+def _views(swap, recorder, rng):
+
+    i, j = rng.sample(range(3), 2)
+    amount = int(swap.balances(i) * rng.uniform(1e-3, 1e-2))
+    recorder.call("get_dy", swap.get_dy, i, j, amount)
+    recorder.call("get_dx", swap.get_dx, i, j, swap.get_dy(i, j, amount))
+
+    amounts = _fraction_of_balances(swap, rng, 0, 1e-2)
+    recorder.call("calc_token_amount", swap.calc_token_amount, amounts, True)
+
+    amount = int(swap.totalSupply() * rng.uniform(1e-3, 1e-2))
+    recorder.call(
+        "calc_withdraw_one_coin",
+        swap.calc_withdraw_one_coin,
+        amount,
+        rng.randint(0, 2),
+    )
+
+    recorder.call("lp_price", swap.lp_price)
+    recorder.call("get_virtual_price", swap.get_virtual_price)
+    recorder.call("fee", swap.fee)
+    recorder.call("price_oracle", swap.price_oracle, rng.randint(0, 1))
+
+
+def test_gas_benchmark(
+    swap_with_deposit, coins, user, factory_admin, check_gas
+):
+    """
+    Gas distributions of the pool's user facing methods over a seeded
+    sequence of operations, checked against gas_baseline.json.
+    """
+    swap = swap_with_deposit
+    rng = random.Random(0)
+    recorder = GasRecorder()
+
+    for coin in coins:
+        mint_for_testing(coin, user, 10**30)
+
+    fee_receiver = swap.fee_receiver()
+    lp_fee_receiver = swap.balanceOf(fee_receiver)
+
+    with boa.env.prank(user):
+        for coin in coins:
+            coin.approve(swap, 2**256 - 1)
+
+        for _ in range(NUM_ROUNDS):
+            _exchanges(swap, coins, recorder, rng)
+            _deposits(swap, recorder, rng)
+            _withdrawals(swap, user, recorder, rng)
+            _views(swap, recorder, rng)
+            _claim_admin_fees(swap, recorder, rng)
+
+        # after the other operations, so that they see the same states. Fees
+        # are raised for enough profit to rebalance most of the time:
+        with boa.env.prank(factory_admin):
+            swap.apply_new_parameters(  # <----- out of range values are kept.
+                3 * 10**7,
+                10**8,
+                10**18,
+                2 * 10**18,
+                2 * 10**18,
+                10**6,
+                10**6,
+            )
+        for _ in range(NUM_ROUNDS):
+            _rebalancing_exchange(swap, recorder, rng)
+
+    # the claim path was measured:
+    assert (
+        any(coin.balanceOf(fee_receiver) > 0 for coin in coins)
+        or swap.balanceOf(fee_receiver) > lp_fee_receiver
+    )
+
+    assert recorder.summary()["exchange_rebalance"]["n"] >= NUM_ROUNDS // 2
+    check_gas(recorder.summary(), BASELINE)
+
+
+def test_compare():
+    baseline = {"exchange": {"p50": 100000, "p95": 110000}}
+    assert (
+        compare({"exchange": {"p50": 100500, "p95": 110000}}, baseline, 0.01)
+        == []
+    )
+    assert compare(
+        {"exchange": {"p50": 102000, "p95": 110000}}, baseline, 0.01
+    ) == ["exchange p50: 100000 -> 102000 (+2.00%)"]
+    assert compare({"get_dy": {"p50": 1, "p95": 1}}, baseline, 0.01) == [
+        "get_dy: no baseline"
+    ]
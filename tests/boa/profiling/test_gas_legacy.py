@@ -0,0 +1,116 @@
+import random
+
+import boa
+
+from tests.boa.utils.gas import GasRecorder, markdown_comparison
+from tests.boa.utils.tokens import mint_for_testing
+
+NUM_ROUNDS = 10
+
+
+def _sleep(rng):
+    boa.env.time_travel(rng.randint(12, 600))
+
+
+def _operations(swap, lp_token, coins, user, recorder, seed):
+    """
+    The same seeded sequence of operations for both pools. Amounts are
+    fractions of the pool's balances, so the sequence does not depend on
+    how the pools were seeded.
+    """
+    rng = random.Random(seed)
+
+    def _fraction(k, low=1e-3, high=1e-2):
+        return int(swap.balances(k) * rng.uniform(low, high))
+
+    with boa.env.prank(user):
+        for coin in coins:
+            coin.approve(swap, 2**256 - 1)
+
+        for _ in range(NUM_ROUNDS):
+
+            i, j = rng.sample(range(3), 2)
+            recorder.call("exchange", swap.exchange, i, j, _fraction(i), 0)
+            _sleep(rng)
+
+            c = rng.uniform(1e-3, 1e-2)
+            amounts = [int(swap.balances(k) * c) for k in range(3)]
+            recorder.call(
+                "add_liquidity_balanced", swap.add_liquidity, amounts, 0
+            )
+            _sleep(rng)
+
+            amounts = [_fraction(k, 0) for k in range(3)]
+            recorder.call(
+                "add_liquidity_imbalanced", swap.add_liquidity, amounts, 0
+            )
+            _sleep(rng)
+
+            i = rng.randint(0, 2)
+            amounts = [0, 0, 0]
+            amounts[i] = _fraction(i)
+            recorder.call("add_liquidity_one", swap.add_liquidity, amounts, 0)
+            _sleep(rng)
+
+            amount = int(lp_token.balanceOf(user) * rng.uniform(1e-3, 1e-2))
+            recorder.call(
+                "remove_liquidity", swap.remove_liquidity, amount, [0, 0, 0]
+            )
+            _sleep(rng)
+
+            amount = int(lp_token.balanceOf(user) * rng.uniform(1e-3, 1e-2))
+            recorder.call(
+                "remove_liquidity_one_coin",
+                swap.remove_liquidity_one_coin,
+                amount,
+                rng.randint(0, 2),
+                0,
+            )
+            _sleep(rng)
+
+            i, j = rng.sample(range(3), 2)
+            recorder.call("get_dy", swap.get_dy, i, j, _fraction(i))
+
+            amounts = [_fraction(k, 0) for k in range(3)]
+            recorder.call(
+                "calc_token_amount", swap.calc_token_amount, amounts, True
+            )
+
+            amount = int(lp_token.totalSupply() * rng.uniform(1e-3, 1e-2))
+            recorder.call(
+                "calc_withdraw_one_coin",
+                swap.calc_withdraw_one_coin,
+                amount,
+                rng.randint(0, 2),
+            )
+
+            recorder.call("get_virtual_price", swap.get_virtual_price)
+            recorder.call("fee", swap.fee)
+            recorder.call("price_oracle", swap.price_oracle, rng.randint(0, 1))
+
+
+def test_gas_legacy(
+    swap_legacy, token_legacy, swap_with_deposit, coins, user, gas_report
+):
+    """
+    Runs the same operations through the legacy tricrypto pool and
+    tricrypto-ng and writes a markdown comparison (gas per operation, math
+    calls and line hotspots) to --gas-report.
+    """
+    for coin in coins:
+        mint_for_testing(coin, user, 10**30)
+
+    legacy = GasRecorder(profile=True)
+    ng = GasRecorder(profile=True)
+    _operations(swap_legacy, token_legacy, coins, user, legacy, seed=0)
+    _operations(swap_with_deposit, swap_with_deposit, coins, user, ng, seed=0)
+
+    recorders = {"legacy": legacy, "tricrypto-ng": ng}
+    report = markdown_comparison(recorders)
+    gas_report("legacy", report)
+
+    for recorder in recorders.values():
+        assert recorder.summary()["exchange"]["n"] == NUM_ROUNDS
+        assert any("Math" in call for call in recorder.calls["exchange"])
+        assert recorder.hotspots("exchange")
+    assert "| exchange |" in report
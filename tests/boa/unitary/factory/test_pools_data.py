@@ -0,0 +1,75 @@
+import boa
+import pytest
+
+from scripts.pools_data import FACTORY_FIELDS, iter_pools_data
+from tests.boa.fixtures.pool import (
+    INITIAL_PRICES,
+    _crypto_swap_with_deposit,
+    _deploy_swap,
+)
+
+NUM_POOLS = 5
+
+
+@pytest.fixture(scope="module")
+def factory_handler(tricrypto_factory, deployer):
+    with boa.env.prank(deployer):
+        return boa.load(
+            "contracts/main/CurveTricryptoFactoryHandler.vy", tricrypto_factory
+        )
+
+
+@pytest.fixture
+def pools(
+    tricrypto_factory, amm_interface, coins, weth, params, deployer, user
+):
+    for k in range(NUM_POOLS):
+        swap = _deploy_swap(
+            tricrypto_factory, amm_interface, coins, weth, params, deployer
+        )
+        if k % 2 == 0:  # <--------------- leave some of the pools empty.
+            _crypto_swap_with_deposit(coins, user, swap, INITIAL_PRICES)
+
+    return [
+        tricrypto_factory.pool_list(k)
+        for k in range(tricrypto_factory.pool_count())
+    ]
+
+
+def test_factory_pools_data(pools, tricrypto_factory):
+    data = list(
+        iter_pools_data(tricrypto_factory, FACTORY_FIELDS, page_size=2)
+    )
+    assert [d["pool"] for d in data] == pools
+
+    for d in data:
+        pool = d["pool"]
+        assert d["coins"] == list(tricrypto_factory.get_coins(pool))
+        assert d["decimals"] == list(tricrypto_factory.get_decimals(pool))
+        assert d["balances"] == list(tricrypto_factory.get_balances(pool))
+        assert d["liquidity_gauge"] == tricrypto_factory.get_gauge(pool)
+
+
+def test_handler_pools_data(pools, factory_handler):
+    data = list(iter_pools_data(factory_handler, page_size=3))
+    assert [d["pool"] for d in data] == pools
+
+    for d in data:
+        pool = d["pool"]
+        assert d["coins"] == list(factory_handler.get_coins(pool))
+        assert d["decimals"] == list(factory_handler.get_decimals(pool))
+        assert d["balances"] == list(factory_handler.get_balances(pool))
+        assert d["fees"] == list(factory_handler.get_fees(pool))
+        assert d["params"] == list(factory_handler.get_pool_params(pool))
+
+
+def test_pages(pools, tricrypto_factory):
+    n = len(pools)
+    assert len(tricrypto_factory.get_pools_data(0, n + 10)) == n
+    assert len(tricrypto_factory.get_pools_data(n - 1, 10)) == 1
+    assert tricrypto_factory.get_pools_data(n, 10) == []
+    assert tricrypto_factory.get_pools_data(0, 0) == []
+    assert tricrypto_factory.get_pools_data(2**256 - 1, 1) == []
+
+    pages = [tricrypto_factory.get_pools_data(k, 1)[0][0] for k in range(n)]
+    assert pages == pools
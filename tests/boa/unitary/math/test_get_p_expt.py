@@ -7,9 +7,10 @@ from boa.test import strategy
 from hypothesis import given, settings
 
 from tests.boa.fixtures.pool import INITIAL_PRICES
+from tests.boa.fixtures.shards import shard_examples
 from tests.boa.utils.tokens import mint_for_testing
 
-SETTINGS = {"max_examples": 1000, "deadline": None}
+SETTINGS = {"max_examples": shard_examples(1000), "deadline": None}
 PRECISION_THRESHOLD = 1e-5
 
 
@@ -267,6 +268,7 @@ def _imbalance_swap(swap, coins, imbalance_frac, user, dollar_amount, i, j):
 @settings(**SETTINGS)
 @pytest.mark.parametrize("i", [0, 1, 2])
 @pytest.mark.parametrize("j", [0, 1, 2])
+@pytest.mark.usefixtures("hypothesis_shard")
 def test_dxdy_similar(
     swap_with_deposit,
     dydx_optimised_math,
@@ -312,6 +314,7 @@ def test_dxdy_similar(
 )
 @settings(**SETTINGS)
 @pytest.mark.parametrize("j", [1, 2])
+@pytest.mark.usefixtures("hypothesis_shard")
 def test_dxdy_pump(
     swap_with_deposit,
     dydx_optimised_math,
@@ -353,6 +356,7 @@ def test_dxdy_pump(
 )
 @settings(**SETTINGS)
 @pytest.mark.parametrize("j", [1, 2])
+@pytest.mark.usefixtures("hypothesis_shard")
 def test_dxdy_dump(
     swap_with_deposit,
     dydx_optimised_math,
@@ -0,0 +1,183 @@
+# flake8: noqa
+import boa
+from boa.test import strategy
+from hypothesis import example, given, settings
+from hypothesis import strategies as st
+from vyper.utils import SizeLimits
+
+import tests.boa.utils.math_optimized as math_py
+
+MAX_SAMPLES = 1000  # Increase for fuzzing
+SETTINGS = {"max_examples": MAX_SAMPLES, "deadline": None}
+
+A_MUL = 10000 * 3**3
+MIN_A = int(0.01 * A_MUL)
+MAX_A = 1000 * A_MUL
+
+# gamma from 1e-8 up to 0.05
+MIN_GAMMA = 10**10
+MAX_GAMMA = 5 * 10**16
+
+REVERT = "revert"
+
+
+def _call_contract(fn, *args):
+    try:
+        return fn(*args)
+    except boa.BoaError:
+        return REVERT
+
+
+def _call_python(fn, *args):
+    try:
+        return fn(*args)
+    except ValueError:
+        return REVERT
+
+
+def _assert_same(contract_fn, python_fn, *args):
+    result_contract = _call_contract(contract_fn, *args)
+    result_python = _call_python(python_fn, *args)
+    assert result_contract == result_python, args
+    return result_python
+
+
+def _xp(D, xD, yD, zD):
+    return [D * xD // 10**18, D * yD // 10**18, D * zD // 10**18]
+
+
+@given(
+    A=st.integers(min_value=MIN_A, max_value=MAX_A),
+    D=st.integers(min_value=10**18, max_value=10**14 * 10**18),
+    xD=st.integers(min_value=int(1.001e16), max_value=int(0.999e20)),
+    yD=st.integers(min_value=int(1.001e16), max_value=int(0.999e20)),
+    zD=st.integers(min_value=int(1.001e16), max_value=int(0.999e20)),
+    gamma=st.integers(min_value=MIN_GAMMA, max_value=MAX_GAMMA),
+    j=st.integers(min_value=0, max_value=2),
+)
+@settings(**SETTINGS)
+def test_get_y(math_optimized, A, D, xD, yD, zD, gamma, j):
+    X = _xp(D, xD, yD, zD)
+    _assert_same(math_optimized.get_y, math_py.get_y, A, gamma, X, D, j)
+    _assert_same(
+        math_optimized.internal._newton_y,
+        math_py._newton_y,
+        A,
+        gamma,
+        X,
+        D,
+        j,
+    )
+
+
+@given(
+    A=st.integers(min_value=MIN_A, max_value=MAX_A),
+    D=st.integers(min_value=10**18, max_value=10**14 * 10**18),
+    xD=st.integers(min_value=int(1.001e16), max_value=int(0.999e20)),
+    yD=st.integers(min_value=int(1.001e16), max_value=int(0.999e20)),
+    zD=st.integers(min_value=int(1.001e16), max_value=int(0.999e20)),
+    gamma=st.integers(min_value=MIN_GAMMA, max_value=MAX_GAMMA),
+    j=st.integers(min_value=0, max_value=2),
+    dy_frac=st.integers(min_value=0, max_value=95),
+)
+@settings(**SETTINGS)
+def test_newton_D(math_optimized, A, D, xD, yD, zD, gamma, j, dy_frac):
+    X = _xp(D, xD, yD, zD)
+    _assert_same(math_optimized.newton_D, math_py.newton_D, A, gamma, X)
+
+    # newton_D with K0_prev, as done in the pool after get_y:
+    get_y = _call_python(math_py.get_y, A, gamma, X, D, j)
+    if get_y == REVERT or get_y[0] >= X[j]:
+        return
+
+    X[j] -= (X[j] - get_y[0]) * dy_frac // 100
+    _assert_same(
+        math_optimized.newton_D, math_py.newton_D, A, gamma, X, get_y[1]
+    )
+
+
+@given(
+    A=st.integers(min_value=MIN_A, max_value=MAX_A),
+    D=st.integers(min_value=10**18, max_value=10**14 * 10**18),
+    xD=st.integers(min_value=int(1.001e16), max_value=int(0.999e20)),
+    yD=st.integers(min_value=int(1.001e16), max_value=int(0.999e20)),
+    zD=st.integers(min_value=int(1.001e16), max_value=int(0.999e20)),
+    gamma=st.integers(min_value=MIN_GAMMA, max_value=MAX_GAMMA),
+)
+@settings(**SETTINGS)
+def test_get_p(math_optimized, A, D, xD, yD, zD, gamma):
+    X = _xp(D, xD, yD, zD)
+    D = _call_python(math_py.newton_D, A, gamma, X)
+    if D == REVERT:
+        return
+    _assert_same(math_optimized.get_p, math_py.get_p, X, D, [A, gamma])
+
+
+@given(
+    x=strategy(
+        "int256",
+        min_value=SizeLimits.MIN_INT256,
+        max_value=SizeLimits.MAX_INT256,
+    )
+)
+@settings(**SETTINGS)
+@example(135305999368893231588)
+@example(-42139678854452767550)
+@example(0)
+def test_wad_exp(math_optimized, x):
+    _assert_same(math_optimized.wad_exp, math_py.wad_exp, x)
+
+
+@given(
+    x=strategy("uint256", min_value=0, max_value=SizeLimits.MAX_UINT256),
+    roundup=st.booleans(),
+)
+@settings(**SETTINGS)
+@example(0, False)
+@example(1, True)
+def test_log2(math_optimized, x, roundup):
+    _assert_same(
+        math_optimized.internal._snekmate_log_2,
+        math_py._snekmate_log_2,
+        x,
+        roundup,
+    )
+
+
+@given(val=strategy("uint256", min_value=0, max_value=SizeLimits.MAX_UINT256))
+@settings(**SETTINGS)
+@example(0)
+@example(1)
+@example(SizeLimits.MAX_UINT256)
+@example(math_py.CBRT_LIMIT)
+@example(math_py.CBRT_LIMIT * 10**18)
+def test_cbrt(math_optimized, val):
+    _assert_same(math_optimized.cbrt, math_py.cbrt, val)
+
+
+@given(
+    x=strategy("uint256[3]", min_value=10**18, max_value=10**9 * 10**18),
+)
+@settings(**SETTINGS)
+def test_geometric_mean(math_optimized, x):
+    _assert_same(math_optimized.geometric_mean, math_py.geometric_mean, x)
+
+
+@given(
+    x=strategy("uint256[3]", min_value=10**9, max_value=10**9 * 10**18),
+    gamma=strategy("uint256", min_value=0, max_value=2**100),
+)
+@settings(**SETTINGS)
+def test_reduction_coefficient(math_optimized, x, gamma):
+    _assert_same(
+        math_optimized.reduction_coefficient,
+        math_py.reduction_coefficient,
+        x,
+        gamma,
+    )
+
+
+@given(x=strategy("uint256[3]"))
+@settings(**SETTINGS)
+def test_sort(math_optimized, x):
+    _assert_same(math_optimized.internal._sort, math_py._sort, x)
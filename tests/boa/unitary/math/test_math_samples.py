@@ -0,0 +1,59 @@
+import random
+
+import boa
+
+from tests.boa.utils import math_samples as samples
+from tests.boa.utils import simulation_int_many as sim
+from tests.boa.utils.gas import GasRecorder
+
+
+def test_sample_state_is_deterministic():
+    a = [samples.sample_state(random.Random(1)) for _ in range(3)]
+    b = [samples.sample_state(random.Random(1)) for _ in range(3)]
+    assert a == b
+
+
+def test_math_args_run_on_contract(math_optimized):
+    rng = random.Random(0)
+    recorder = GasRecorder()
+    for fn_name in ["newton_D", "get_y", "get_p", "wad_exp", "cbrt"]:
+        for _ in range(5):
+            args = samples.math_args(fn_name, samples.sample_state(rng), rng)
+            try:
+                recorder.call(fn_name, getattr(math_optimized, fn_name), *args)
+            except boa.BoaError:
+                pass
+
+        # tx_gas includes the 21000 intrinsic gas of every call:
+        assert recorder.samples[fn_name]
+        assert all(gas > 21000 for gas in recorder.samples[fn_name])
+
+
+def test_trader_states(tmp_path):
+    trader = sim.Trader(
+        135 * 3**3 * 10000,
+        int(7e-5 * 1e18),
+        3 * 10**6 * 10**18,
+        3,
+        [10**18, 30000 * 10**18, 2000 * 10**18],
+        log=False,
+    )
+    candles = [
+        {
+            "t": 1700000000 + 300 * k,
+            "open": 30000.0,
+            "high": 30000.0 * (1 + 0.002 * k),
+            "low": 30000.0 * (1 - 0.002 * k),
+            "close": 30000.0,
+            "volume": 10.0,
+            "pair": (0, 1),
+        }
+        for k in range(4)
+    ]
+    states = samples.trader_states(trader, candles)
+    assert len(states) == 4
+    assert states[-1] == samples.curve_state(trader.curve)
+
+    path = tmp_path / "states.jsonl"
+    samples.write_states(path, states)
+    assert samples.load_states(path) == states
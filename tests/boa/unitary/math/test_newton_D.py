@@ -7,6 +7,7 @@ from hypothesis import given, settings
 from hypothesis import strategies as st
 
 import tests.boa.utils.simulation_int_many as sim
+from tests.boa.fixtures.shards import shard_examples
 
 sys.stdout = sys.stderr
 
@@ -60,7 +61,8 @@ pytest.gas_new = 0
     out_fee=st.sampled_from([int(4.0e-3 * 10**10), int(10.0e-3 * 10**10)]),
     fee_gamma=st.sampled_from([int(1e-2 * 1e18), int(2e-6 * 1e18)]),
 )
-@settings(max_examples=MAX_SAMPLES, deadline=None)
+@settings(max_examples=shard_examples(MAX_SAMPLES), deadline=None)
+@pytest.mark.usefixtures("hypothesis_shard")
 def test_newton_D(
     math_optimized,
     math_unoptimized,
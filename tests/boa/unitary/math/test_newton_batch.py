@@ -0,0 +1,103 @@
+# flake8: noqa
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+import tests.boa.utils.simulation_batch as batch
+import tests.boa.utils.simulation_int_many as sim
+
+MAX_SAMPLES = 100  # Increase for fuzzing
+BATCH_SIZE = 50
+
+A_MUL = 10000 * 3**3
+MIN_A = int(0.01 * A_MUL)
+MAX_A = 1000 * A_MUL
+
+# gamma from 1e-8 up to 0.05
+MIN_GAMMA = 10**10
+MAX_GAMMA = 5 * 10**16
+
+state = st.tuples(
+    st.integers(min_value=MIN_A, max_value=MAX_A),
+    st.integers(min_value=MIN_GAMMA, max_value=MAX_GAMMA),
+    st.integers(min_value=10**18, max_value=10**14 * 10**18),
+    st.lists(
+        st.integers(min_value=int(0.2e18), max_value=int(5e18)),
+        min_size=3,
+        max_size=3,
+    ),  # <- ratios 1e18 * x/D
+    st.integers(min_value=0, max_value=2),
+)
+
+
+def _scalar_states(states):
+    # keep only the states that the scalar solvers can handle
+    out = []
+    for A, gamma, D, xD, i in states:
+        x = [D * _xD // 10**18 for _xD in xD]
+        try:
+            D = sim.solve_D(A, gamma, x)
+            y = sim.newton_y(A, gamma, x, D, i)
+        except Exception:
+            continue
+        out.append((A, gamma, x, D, i, y))
+    return out
+
+
+@given(states=st.lists(state, min_size=1, max_size=BATCH_SIZE))
+@settings(max_examples=MAX_SAMPLES, deadline=None)
+def test_newton_D_batch(states):
+    states = _scalar_states(states)
+    if not states:
+        return
+
+    A, gamma, x, D, _, _ = zip(*states)
+    result = batch.newton_D_batch(A, gamma, x)
+
+    assert result == list(D)
+
+
+@given(states=st.lists(state, min_size=1, max_size=BATCH_SIZE))
+@settings(max_examples=MAX_SAMPLES, deadline=None)
+def test_newton_D_batch_with_D0(states):
+    states = _scalar_states(states)
+    if not states:
+        return
+
+    A, gamma, x, _, _, _ = zip(*states)
+    D0 = [3 * sim.geometric_mean(_x) for _x in x]
+    result = batch.newton_D_batch(A, gamma, x, D0)
+
+    assert result == [sim.solve_D(*s) for s in zip(A, gamma, x, D0)]
+
+
+@given(states=st.lists(state, min_size=1, max_size=BATCH_SIZE))
+@settings(max_examples=MAX_SAMPLES, deadline=None)
+def test_newton_y_batch(states):
+    states = _scalar_states(states)
+    if not states:
+        return
+
+    A, gamma, x, D, i, y = zip(*states)
+    result = batch.newton_y_batch(A, gamma, x, D, i)
+
+    assert result == list(y)
+
+
+def test_float_pass_fallback(monkeypatch):
+    # states the float pass screens out are handed to the scalar solvers:
+    A, gamma = 135 * A_MUL, 7 * 10**13
+    x = [
+        [10**24, 2 * 10**24, 10**24],
+        [10**24, 10**24, 3 * 10**24],
+    ]
+    D = [sim.solve_D(A, gamma, _x) for _x in x]
+    y = [sim.newton_y(A, gamma, _x, _D, 0) for _x, _D in zip(x, D)]
+
+    def _failed(*args):
+        return None, [False] * len(x)
+
+    monkeypatch.setattr(batch, "estimate_D", _failed)
+    monkeypatch.setattr(batch, "estimate_y", _failed)
+
+    assert batch.newton_D_batch(A, gamma, x) == D
+    assert batch.newton_y_batch(A, gamma, x, D, 0) == y
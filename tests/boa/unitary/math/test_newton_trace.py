@@ -0,0 +1,81 @@
+import random
+
+import boa
+
+from tests.boa.utils import math_optimized as math_py
+from tests.boa.utils import math_samples as samples
+from tests.boa.utils.newton_trace import trace_call
+
+NUM_SAMPLES = 50
+
+
+def _python_records(fn_name, *args):
+    with math_py.trace() as records:
+        result = getattr(math_py, fn_name)(*args)
+    # residuals do not leave the EVM:
+    return result, [
+        {k: v for k, v in r.items() if k not in ("residual", "converged")}
+        for r in records
+    ]
+
+
+def test_trace_matches_port(math_optimized):
+    rng = random.Random(0)
+    for _ in range(NUM_SAMPLES):
+        state = samples.sample_state(rng)
+        for fn_name in ["newton_D", "get_y"]:
+            args = samples.math_args(fn_name, state, rng)
+            try:
+                expected = _python_records(fn_name, *args)
+            except ValueError:
+                continue
+            result, records = trace_call(math_optimized, fn_name, *args)
+            assert (list(result) if fn_name == "get_y" else result) == (
+                expected[0]
+            )
+            assert records == expected[1]
+
+
+def test_get_y_fallback(math_optimized):
+    # large A and gamma: no analytical solution, get_y uses _newton_y
+    args = (
+        90961842,
+        48468873550768765,
+        [
+            429317842458341474304,
+            394130693518512168960,
+            313296721691490910208,
+        ],
+        1125168420741756368958,
+        0,
+    )
+    with math_py.trace() as records:
+        y, K0 = math_py.get_y(*args)
+
+    fallback, solve = records
+    assert fallback == {"fn": "get_y", "fallback": True}
+    assert solve["fn"] == "_newton_y" and solve["converged"]
+    assert K0 == 0
+
+    _, boa_records = trace_call(math_optimized, "get_y", *args)
+    assert boa_records == [
+        fallback,
+        {"fn": "_newton_y", "iterations": solve["iterations"]},
+    ]
+
+
+def test_trace_is_off_by_default():
+    assert math_py._telemetry is None
+    with math_py.trace():
+        with math_py.trace() as inner:
+            math_py.newton_D(135 * 27 * 10000, 7 * 10**13, [10**24] * 3)
+        assert len(inner) == 1
+    assert math_py._telemetry is None
+
+
+def test_boa_reverts_raise(math_optimized):
+    try:
+        trace_call(math_optimized, "newton_D", 1, 1, [0, 0, 0])
+    except boa.BoaError:
+        return
+    raise AssertionError("newton_D of an empty pool did not revert")
@@ -0,0 +1,58 @@
+# flake8: noqa
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+import tests.boa.utils.simulation_int_many as sim
+
+MAX_SAMPLES = 300  # Increase for fuzzing
+
+A_MUL = 10000 * 3**3
+MIN_A = int(0.01 * A_MUL)
+MAX_A = 1000 * A_MUL
+
+# gamma from 1e-8 up to 0.05
+MIN_GAMMA = 10**10
+MAX_GAMMA = 5 * 10**16
+
+
+def _curve(A, gamma, D, xD, p, exact_p):
+    curve = sim.Curve(A, gamma, D, 3, p=[10**18] + p, exact_p=exact_p)
+    curve.x = [D * _xD // _p for _xD, _p in zip(xD, curve.p)]
+    return curve
+
+
+@given(
+    A=st.integers(min_value=MIN_A, max_value=MAX_A),
+    gamma=st.integers(min_value=MIN_GAMMA, max_value=MAX_GAMMA),
+    D=st.integers(min_value=10**18, max_value=10**14 * 10**18),
+    xD=st.lists(
+        st.integers(min_value=int(0.2e18), max_value=int(0.5e18)),
+        min_size=3,
+        max_size=3,
+    ),
+    p=st.lists(
+        st.integers(min_value=10**15, max_value=10**24),
+        min_size=2,
+        max_size=2,
+    ),
+)
+@settings(max_examples=MAX_SAMPLES, deadline=None)
+def test_get_p_matches_contract(math_optimized, A, gamma, D, xD, p):
+    curve = _curve(A, gamma, D, xD, p, True)
+    try:
+        D = curve.D()
+    except Exception:
+        return
+
+    # last_prices in tweak_price:
+    expected = math_optimized.get_p(curve.xp(), D, [A, gamma])
+    expected = [
+        _p * curve.p[k + 1] // 10**18 for k, _p in enumerate(expected)
+    ]
+    assert curve.get_p() == expected
+
+    # the float mode is only approximate:
+    approx = _curve(A, gamma, D, xD, p, False)
+    approx.x = curve.x
+    for a, b in zip(approx.get_p(), expected):
+        assert abs(a - b) <= b * 1e-2 + 1
@@ -79,12 +79,19 @@ class StatefulAdmin(ProfitableState):
         )
 
 
-def test_admin_fee(swap, views_contract, users, pool_coins, tricrypto_factory):
+def test_admin_fee(
+    swap,
+    views_contract,
+    users,
+    pool_coins,
+    tricrypto_factory,
+    hypothesis_shard,
+):
     from hypothesis import settings
     from hypothesis._settings import HealthCheck
 
     StatefulAdmin.TestCase.settings = settings(
-        max_examples=MAX_SAMPLES,
+        max_examples=hypothesis_shard.max_examples(MAX_SAMPLES),
         stateful_step_count=STEP_COUNT,
         suppress_health_check=HealthCheck.all(),
         deadline=None,
@@ -93,4 +100,4 @@ def test_admin_fee(swap, views_contract, users, pool_coins, tricrypto_factory):
     for k, v in locals().items():
         setattr(StatefulAdmin, k, v)
 
-    run_state_machine_as_test(StatefulAdmin)
+    run_state_machine_as_test(hypothesis_shard.seeded(StatefulAdmin))
@@ -74,13 +74,18 @@ class MultiPrecision(ProfitableState):
 
 
 def test_multiprecision(
-    swap, views_contract, users, pool_coins, tricrypto_factory
+    swap,
+    views_contract,
+    users,
+    pool_coins,
+    tricrypto_factory,
+    hypothesis_shard,
 ):
     from hypothesis import settings
     from hypothesis._settings import HealthCheck
 
     MultiPrecision.TestCase.settings = settings(
-        max_examples=MAX_SAMPLES,
+        max_examples=hypothesis_shard.max_examples(MAX_SAMPLES),
         stateful_step_count=MAX_COUNT,
         suppress_health_check=HealthCheck.all(),
         deadline=None,
@@ -89,4 +94,4 @@ def test_multiprecision(
     for k, v in locals().items():
         setattr(MultiPrecision, k, v)
 
-    run_state_machine_as_test(MultiPrecision)
+    run_state_machine_as_test(hypothesis_shard.seeded(MultiPrecision))
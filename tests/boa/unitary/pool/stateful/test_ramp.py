@@ -106,12 +106,19 @@ class RampTest(ProfitableState):
         assert self.swap.xcp_profit_a() == self.xcp_profit_a_init
 
 
-def test_ramp(swap, views_contract, users, pool_coins, tricrypto_factory):
+def test_ramp(
+    swap,
+    views_contract,
+    users,
+    pool_coins,
+    tricrypto_factory,
+    hypothesis_shard,
+):
     from hypothesis import settings
     from hypothesis._settings import HealthCheck
 
     RampTest.TestCase.settings = settings(
-        max_examples=MAX_SAMPLES,
+        max_examples=hypothesis_shard.max_examples(MAX_SAMPLES),
         stateful_step_count=MAX_COUNT,
         suppress_health_check=HealthCheck.all(),
         deadline=None,
@@ -120,4 +127,4 @@ def test_ramp(swap, views_contract, users, pool_coins, tricrypto_factory):
     for k, v in locals().items():
         setattr(RampTest, k, v)
 
-    run_state_machine_as_test(RampTest)
+    run_state_machine_as_test(hypothesis_shard.seeded(RampTest))
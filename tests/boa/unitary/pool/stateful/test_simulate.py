@@ -11,6 +11,11 @@ from tests.boa.utils.tokens import mint_for_testing
 MAX_SAMPLES = 20
 STEP_COUNT = 10
 
+# The simulator prices trades with the integer get_p of the pool, so it
+# only differs from the pool by newton convergence and float moving average
+# rounding:
+PRECISION = 1e-8
+
 
 def approx(x1, x2, precision):
     return abs(log(x1 / x2)) <= precision
@@ -100,14 +105,14 @@ class StatefulSimulation(StatefulBase):
             self.trader.tweak_price(boa.env.vm.state.timestamp)
 
             # check if output value from exchange is similar:
-            assert abs(log(self.swap_out / dy_trader)) < 1e-3
+            assert approx(self.swap_out, dy_trader, PRECISION)
 
             # check if price oracles are updated as expected:
             for k in range(1, len(self.trader.price_oracle) - 1):
                 assert approx(
                     self.swap.price_oracle(k - 1),
                     self.trader.price_oracle[k],
-                    1e-3,
+                    PRECISION,
                 )
 
             boa.env.time_travel(12)
@@ -120,26 +125,33 @@ class StatefulSimulation(StatefulBase):
             assert (
                 abs(self.trader.xcp_profit - self.swap.xcp_profit())
                 / (self.trader.xcp_profit - 10**18)
-                < 0.05
+                < 1e-5
             )
 
         for i in range(2):
             try:
                 price_scale = self.swap.price_scale(i)
                 price_trader = self.trader.curve.p[i + 1]
-                assert approx(price_scale, price_trader, 1e-3)
+                assert approx(price_scale, price_trader, PRECISION)
             except:  # noqa: E722
 
                 if self.check_limits([0, 0, 0]):
                     assert False
 
 
-def test_sim(swap, views_contract, users, pool_coins, tricrypto_factory):
+def test_sim(
+    swap,
+    views_contract,
+    users,
+    pool_coins,
+    tricrypto_factory,
+    hypothesis_shard,
+):
     from hypothesis import settings
     from hypothesis._settings import HealthCheck
 
     StatefulSimulation.TestCase.settings = settings(
-        max_examples=MAX_SAMPLES,
+        max_examples=hypothesis_shard.max_examples(MAX_SAMPLES),
         stateful_step_count=STEP_COUNT,
         suppress_health_check=HealthCheck.all(),
         deadline=None,
@@ -148,4 +160,4 @@ def test_sim(swap, views_contract, users, pool_coins, tricrypto_factory):
     for k, v in locals().items():
         setattr(StatefulSimulation, k, v)
 
-    run_state_machine_as_test(StatefulSimulation)
+    run_state_machine_as_test(hypothesis_shard.seeded(StatefulSimulation))
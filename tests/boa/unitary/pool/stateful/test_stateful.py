@@ -197,13 +197,18 @@ class ProfitableState(StatefulBase):
 
 
 def test_numba_go_up(
-    swap, views_contract, users, pool_coins, tricrypto_factory
+    swap,
+    views_contract,
+    users,
+    pool_coins,
+    tricrypto_factory,
+    hypothesis_shard,
 ):
     from hypothesis import settings
     from hypothesis._settings import HealthCheck
 
     ProfitableState.TestCase.settings = settings(
-        max_examples=MAX_SAMPLES,
+        max_examples=hypothesis_shard.max_examples(MAX_SAMPLES),
         stateful_step_count=MAX_COUNT,
         suppress_health_check=HealthCheck.all(),
         deadline=None,
@@ -212,4 +217,4 @@ def test_numba_go_up(
     for k, v in locals().items():
         setattr(ProfitableState, k, v)
 
-    run_state_machine_as_test(ProfitableState)
+    run_state_machine_as_test(hypothesis_shard.seeded(ProfitableState))
@@ -0,0 +1,190 @@
+import boa
+import pytest
+from boa.test import strategy
+from hypothesis.stateful import (
+    RuleBasedStateMachine,
+    invariant,
+    rule,
+    run_state_machine_as_test,
+)
+
+from tests.boa.fixtures.pool import INITIAL_PRICES, _crypto_swap_with_deposit
+from tests.boa.utils.tokens import mint_for_testing
+
+MAX_SAMPLES = 10
+STEP_COUNT = 40
+
+# tweak_price warm starts the newton_D of a price_scale adjustment. The
+# reference solves it from scratch, as before: both converge to the same
+# invariant up to newton's tolerance, and the pools must not drift apart.
+WARM_START = "MATH.newton_D(A_gamma[0], A_gamma[1], xp, K0)"
+COLD_START = "MATH.newton_D(A_gamma[0], A_gamma[1], xp, 0)"
+PRECISION = 1e-12
+
+
+def approx(x1, x2, precision=PRECISION):
+    # a few wei of absolute slack for values that round to ~0
+    return abs(x1 - x2) <= max(abs(x1), abs(x2)) * precision + 2
+
+
+def _state(swap):
+    return {
+        "balances": [swap.balances(k) for k in range(3)],
+        "D": swap.D(),
+        "totalSupply": swap.totalSupply(),
+        "virtual_price": swap.virtual_price(),
+        "xcp_profit": swap.xcp_profit(),
+        "price_scale": [swap.price_scale(k) for k in range(2)],
+        "price_oracle": [swap.price_oracle(k) for k in range(2)],
+        "last_prices": [swap.last_prices(k) for k in range(2)],
+    }
+
+
+@pytest.fixture(scope="module")
+def reference_implementation(amm_interface, deployer):
+    source = amm_interface.compiler_data.source_code
+    assert WARM_START in source
+    with boa.env.prank(deployer):
+        return boa.loads_partial(
+            source.replace(WARM_START, COLD_START),
+            name="CurveTricryptoOptimizedWETHColdStart",
+        ).deploy_as_blueprint()
+
+
+def _deploy(factory, amm_interface, coins, weth, params, index):
+    swap = factory.deploy_pool(
+        "Curve.fi USDC-BTC-ETH",
+        "USDCBTCETH",
+        [coin.address for coin in coins],
+        weth,
+        index,
+        params["A"],
+        params["gamma"],
+        params["mid_fee"],
+        params["out_fee"],
+        params["fee_gamma"],
+        params["allowed_extra_profit"],
+        params["adjustment_step"],
+        params["ma_time"],
+        params["initial_prices"],
+    )
+    return amm_interface.at(swap)
+
+
+class TweakPriceDiff(RuleBasedStateMachine):
+    fraction = strategy("uint256", min_value=10**14, max_value=5 * 10**16)
+    i = strategy("uint8", max_value=2)
+    j = strategy("uint8", max_value=2)
+    sleep_time = strategy("uint256", min_value=12, max_value=3600)
+
+    def __init__(self):
+        super().__init__()
+
+        # raised fees earn the profit that price_scale adjustments need:
+        params = dict(self.params, mid_fee=3 * 10**7, out_fee=10**8)
+        self.pools = [
+            _deploy(
+                self.tricrypto_factory,
+                self.amm_interface,
+                self.coins,
+                self.weth,
+                params,
+                index,
+            )
+            for index in (0, 1)  # <------------- warm start, cold start.
+        ]
+        for swap in self.pools:
+            _crypto_swap_with_deposit(
+                self.coins, self.user, swap, INITIAL_PRICES
+            )
+
+    def _both(self, fn_name, *args):
+        # call fn_name on both pools: both revert or neither. Amounts out
+        # are a difference of invariants, which amplifies newton's
+        # tolerance: they are compared in the balances and supply.
+        reverts = []
+        for swap in self.pools:
+            try:
+                with boa.env.prank(self.user):
+                    getattr(swap, fn_name)(*args)
+                reverts.append(False)
+            except boa.BoaError:
+                reverts.append(True)
+        assert reverts[0] == reverts[1], (fn_name, args, reverts)
+
+        if self.pools[0].price_scale(0) != self.price_scale:
+            self.rebalances[0] += 1
+
+    def _mint(self, k, amount):
+        mint_for_testing(self.coins[k], self.user, 2 * amount)
+
+    @rule(fraction=fraction, i=i, j=j)
+    def exchange(self, fraction, i, j):
+        if i == j:
+            return
+        dx = self.pools[0].balances(i) * fraction // 10**18
+        self._mint(i, dx)
+        self.price_scale = self.pools[0].price_scale(0)
+        self._both("exchange", i, j, dx, 0)
+
+    @rule(fraction=fraction, i=i)
+    def add_liquidity(self, fraction, i):
+        amounts = [0, 0, 0]
+        amounts[i] = self.pools[0].balances(i) * fraction // 10**18
+        self._mint(i, amounts[i])
+        self.price_scale = self.pools[0].price_scale(0)
+        self._both("add_liquidity", amounts, 0)
+
+    @rule(fraction=fraction, i=i)
+    def remove_liquidity_one_coin(self, fraction, i):
+        amount = self.pools[1].balanceOf(self.user) * fraction // 10**18
+        self.price_scale = self.pools[0].price_scale(0)
+        self._both("remove_liquidity_one_coin", amount, i, 0)
+
+    @rule(sleep_time=sleep_time)
+    def sleep(self, sleep_time):
+        boa.env.time_travel(sleep_time)
+
+    @invariant()
+    def same_state(self):
+        new, reference = [_state(swap) for swap in self.pools]
+        for name, value in new.items():
+            if isinstance(value, list):
+                assert all(
+                    approx(a, b) for a, b in zip(value, reference[name])
+                ), (name, value, reference[name])
+            else:
+                assert approx(value, reference[name]), (name, value)
+
+
+def test_tweak_price_diff(
+    tricrypto_factory,
+    amm_interface,
+    reference_implementation,
+    coins,
+    weth,
+    params,
+    owner,
+    user,
+    hypothesis_shard,
+):
+    from hypothesis import settings
+    from hypothesis._settings import HealthCheck
+
+    with boa.env.prank(owner):
+        tricrypto_factory.set_pool_implementation(reference_implementation, 1)
+
+    TweakPriceDiff.TestCase.settings = settings(
+        max_examples=hypothesis_shard.max_examples(MAX_SAMPLES),
+        stateful_step_count=STEP_COUNT,
+        suppress_health_check=HealthCheck.all(),
+        deadline=None,
+    )
+    rebalances = [0]
+    for k, v in locals().items():
+        setattr(TweakPriceDiff, k, v)
+
+    run_state_machine_as_test(hypothesis_shard.seeded(TweakPriceDiff))
+
+    # the warm started newton_D was compared:
+    assert rebalances[0] > 0
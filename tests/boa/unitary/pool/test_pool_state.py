@@ -0,0 +1,100 @@
+import boa
+from boa.test import strategy
+from hypothesis import given, settings
+
+from tests.boa.utils import pool_state, quotes
+from tests.boa.utils.tokens import mint_for_testing
+
+SETTINGS = {"max_examples": 20, "deadline": None}
+
+
+def _getters(swap):
+    return {
+        "balances": [swap.balances(k) for k in range(3)],
+        "D": swap.D(),
+        "token_supply": swap.totalSupply(),
+        "price_scale": [swap.price_scale(k) for k in range(2)],
+        "price_oracle": [swap.price_oracle(k) for k in range(2)],
+        "last_prices": [swap.last_prices(k) for k in range(2)],
+        "last_prices_timestamp": swap.last_prices_timestamp(),
+        "mid_fee": swap.mid_fee(),
+        "out_fee": swap.out_fee(),
+        "fee_gamma": swap.fee_gamma(),
+        "allowed_extra_profit": swap.allowed_extra_profit(),
+        "adjustment_step": swap.adjustment_step(),
+        "A": swap.A(),
+        "gamma": swap.gamma(),
+        "initial_A_gamma_time": swap.initial_A_gamma_time(),
+        "future_A_gamma_time": swap.future_A_gamma_time(),
+        "xcp_profit": swap.xcp_profit(),
+        "xcp_profit_a": swap.xcp_profit_a(),
+        "virtual_price": swap.virtual_price(),
+        "xcp_oracle": swap.xcp_oracle(),
+        "last_xcp": swap.last_xcp(),
+        "xcp_ma_time": swap.xcp_ma_time(),
+        "precisions": list(swap.precisions()),
+    }
+
+
+def _check(swap):
+    state = pool_state.decode(swap.pool_state())
+    assert state["timestamp"] == boa.env.vm.patch.timestamp
+    for name, value in _getters(swap).items():
+        assert state[name] == value, name
+    return state
+
+
+@given(
+    dx_bps=strategy("uint", min_value=1, max_value=1000),
+    i=strategy("uint", min_value=0, max_value=2),
+    j=strategy("uint", min_value=0, max_value=2),
+    elapsed=strategy("uint", min_value=0, max_value=3 * 86400),
+)
+@settings(**SETTINGS)
+def test_pool_state_matches_getters(
+    swap_with_deposit, coins, user, factory_admin, dx_bps, i, j, elapsed
+):
+    swap = swap_with_deposit
+    _check(swap)
+
+    with boa.env.anchor():
+        if i != j:
+            dx = swap.balances(i) * dx_bps // 10**4
+            mint_for_testing(coins[i], user, dx)
+            with boa.env.prank(user):
+                swap.exchange(i, j, dx, 0)
+        boa.env.time_travel(seconds=86400)
+        with boa.env.prank(factory_admin):
+            swap.ramp_A_gamma(
+                swap.A() * 2,
+                swap.gamma() * 2,
+                boa.env.vm.patch.timestamp + 7 * 86400,
+            )
+        boa.env.time_travel(seconds=elapsed)
+        _check(swap)
+
+
+def test_quotes_from_pool_state(swap_with_deposit, views_contract):
+    swap = swap_with_deposit
+    state = quotes.PoolState.from_snapshot(
+        pool_state.decode(swap.pool_state())
+    )
+    assert state == quotes.PoolState.from_pool(swap)
+    assert quotes.get_dy(state, 0, 1, 10**18) == views_contract.get_dy(
+        0, 1, 10**18, swap
+    )
+
+
+def test_decode_later_timestamp(swap_with_deposit, coins, user):
+    swap = swap_with_deposit
+    with boa.env.anchor():
+        mint_for_testing(coins[0], user, 10**22)
+        with boa.env.prank(user):
+            swap.exchange(0, 1, 10**22, 0)
+        values = swap.pool_state()
+        boa.env.time_travel(seconds=600)
+        later = pool_state.decode(values, boa.env.vm.patch.timestamp)
+        assert later["price_oracle"] == [
+            swap.price_oracle(k) for k in range(2)
+        ]
+        assert later["xcp_oracle"] == swap.xcp_oracle()
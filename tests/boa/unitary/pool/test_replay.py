@@ -0,0 +1,170 @@
+import random
+
+import boa
+import pytest
+
+from tests.boa.fixtures.pool import _deploy_swap, _get_deposit_amounts
+from tests.boa.utils import replay
+from tests.boa.utils.tokens import mint_for_testing
+
+NUM_BLOCKS = 40
+
+
+def _history(swap, coins, user, admin):
+    """
+    Seeded operations on swap, several per block, recorded as events.
+    """
+    rng = random.Random(0)
+    events = []
+
+    def _call(tx_index, fn, *args, sender=user):
+        with boa.env.prank(sender):
+            fn(*args)
+        events.extend(replay.pool_events(swap, tx_index))
+
+    for block in range(NUM_BLOCKS):
+        for tx_index in range(rng.randint(1, 3)):
+            op = rng.random()
+            if op < 0.5:
+                i, j = rng.sample(range(3), 2)
+                dx = int(swap.balances(i) * rng.uniform(1e-3, 1e-2))
+                _call(tx_index, swap.exchange, i, j, dx, 0)
+            elif op < 0.7:
+                amounts = [
+                    int(swap.balances(k) * rng.uniform(0, 1e-2))
+                    for k in range(3)
+                ]
+                _call(tx_index, swap.add_liquidity, amounts, 0)
+            elif op < 0.85:
+                amount = int(swap.balanceOf(user) * rng.uniform(0, 1e-2))
+                _call(tx_index, swap.remove_liquidity, amount, [0, 0, 0])
+            else:
+                amount = int(swap.balanceOf(user) * rng.uniform(0, 1e-2))
+                i = rng.randint(0, 2)
+                _call(tx_index, swap.remove_liquidity_one_coin, amount, i, 0)
+
+        if block == NUM_BLOCKS // 2:
+            future_time = boa.env.vm.patch.timestamp + 7 * 86400
+            _call(
+                tx_index + 1,
+                swap.ramp_A_gamma,
+                swap.A() * 2,
+                swap.gamma(),
+                future_time,
+                sender=admin,
+            )
+            _call(
+                tx_index + 2,
+                swap.apply_new_parameters,
+                swap.mid_fee() + 1,
+                swap.out_fee() + 1,
+                # out of range values keep the current parameters:
+                10**18,
+                2 * 10**18,
+                2 * 10**18,
+                10**6,
+                10**6,
+                sender=admin,
+            )
+
+        # every tenth block is more than a day later, to claim admin fees:
+        boa.env.time_travel(
+            seconds=86400 if block % 10 == 9 else rng.randint(12, 600)
+        )
+
+    return events
+
+
+def _record(swap, coins, user, admin, params):
+    # swap is empty: the history starts with its first deposit
+    for coin in coins:
+        mint_for_testing(coin, user, 10**30)
+        with boa.env.prank(user):
+            coin.approve(swap, 2**256 - 1)
+
+    amounts = _get_deposit_amounts(
+        10**6, [10**18] + params["initial_prices"], coins
+    )
+    with boa.env.prank(user):
+        swap.add_liquidity(amounts, 0)
+    return replay.pool_events(swap) + _history(swap, coins, user, admin)
+
+
+def test_replay_boa_is_exact(
+    swap,
+    tricrypto_factory,
+    amm_interface,
+    coins,
+    weth,
+    params,
+    deployer,
+    user,
+    factory_admin,
+):
+    start = boa.env.vm.patch.block_number, boa.env.vm.patch.timestamp
+    events = _record(swap, coins, user, factory_admin, params)
+    # views such as price_oracle depend on the time they are read at:
+    engine = replay.BoaEngine(swap, coins, factory_admin)
+    engine.set_block(events[-1]["blockNumber"], events[-1]["timestamp"])
+    recorded = engine.state()
+
+    names = {event["event"] for event in events}
+    assert {"TokenExchange", "RampAgamma", "ClaimAdminFee"} <= names
+
+    boa.env.vm.patch.block_number, boa.env.vm.patch.timestamp = start
+    fresh = _deploy_swap(
+        tricrypto_factory, amm_interface, coins, weth, params, deployer
+    )
+    engine = replay.BoaEngine(fresh, coins, factory_admin)
+    stats = replay.replay(engine, events, strict=True)
+
+    assert stats["ClaimAdminFee skipped"] > 0
+    assert sum(n for name, n in stats.items() if " " not in name) == len(
+        [e for e in events if e["event"] != "ClaimAdminFee"]
+    )
+    assert engine.state() == recorded
+
+
+def test_replay_sim(swap, coins, user, factory_admin, params):
+    events = _record(swap, coins, user, factory_admin, params)
+
+    precisions = [10 ** (18 - coin.decimals()) for coin in coins]
+    engine = replay.SimEngine(params, precisions)
+    stats = replay.replay(engine, events)
+
+    assert not any(name.endswith("failed") for name in stats), stats
+    for replayed, pool in zip(
+        engine.state()["balances"], [swap.balances(k) for k in range(3)]
+    ):
+        assert replayed == pytest.approx(pool, rel=1e-3)
+
+
+def test_load_events(tmp_path):
+    events = [
+        {
+            "event": name,
+            "blockNumber": block,
+            "timestamp": 12 * block,
+            "logIndex": log_index,
+            "args": {},
+        }
+        for name, block, log_index in [
+            ("TokenExchange", 2, 1),
+            ("Transfer", 1, 0),
+            ("AddLiquidity", 1, 3),
+            ("TokenExchange", 1, 2),
+        ]
+    ]
+    path = tmp_path / "events.jsonl"
+    replay.write_events(path, events)
+
+    loaded = replay.load_events(path)
+    assert [(e["event"], e["blockNumber"]) for e in loaded] == [
+        ("TokenExchange", 1),
+        ("AddLiquidity", 1),
+        ("TokenExchange", 2),
+    ]
+    assert [
+        (number, [e["event"] for e in block])
+        for number, _, block in replay.blocks(loaded)
+    ] == [(1, ["TokenExchange", "AddLiquidity"]), (2, ["TokenExchange"])]
@@ -0,0 +1,65 @@
+import boa
+import pytest
+
+from tests.boa.utils.tokens import mint_for_testing
+
+
+def _snapshot(swap, coins, user):
+    return {
+        "balances": [swap.balances(i) for i in range(3)],
+        "price_scale": [swap.price_scale(i) for i in range(2)],
+        "totalSupply": swap.totalSupply(),
+        "user_coins": [coin.balanceOf(user) for coin in coins],
+        "timestamp": boa.env.vm.patch.timestamp,
+    }
+
+
+def _mutate(swap, coins, user):
+    amount = 10**5 * 10**18
+    mint_for_testing(coins[0], user, amount)
+    with boa.env.prank(user):
+        swap.exchange(0, 1, amount, 0)
+    boa.env.time_travel(seconds=86400)
+
+
+@pytest.fixture(scope="module")
+def baseline(swap_with_deposit, coins, user):
+    # module fixtures are set up before the autouse rollback fixture, so
+    # this is the state of the session pool outside of any test:
+    return {
+        "state": _snapshot(swap_with_deposit, coins, user),
+        "mutated": False,
+    }
+
+
+def test_rollback(swap_with_deposit, coins, user):
+    state = _snapshot(swap_with_deposit, coins, user)
+
+    # the autouse rollback fixture wraps every test in the same kind of
+    # anchor, so a nested one sees exactly what the next test would:
+    with boa.env.anchor():
+        _mutate(swap_with_deposit, coins, user)
+        assert _snapshot(swap_with_deposit, coins, user) != state
+
+    assert _snapshot(swap_with_deposit, coins, user) == state
+
+
+# boa's pytest plugin anchors the call of every test as well; without it
+# only the rollback fixture isolates these tests:
+@pytest.mark.ignore_isolation
+def test_mutate_session_pool(swap_with_deposit, coins, user, baseline):
+    assert _snapshot(swap_with_deposit, coins, user) == baseline["state"]
+
+    _mutate(swap_with_deposit, coins, user)
+    assert _snapshot(swap_with_deposit, coins, user) != baseline["state"]
+    baseline["mutated"] = True
+
+
+@pytest.mark.ignore_isolation
+def test_session_pool_rolled_back(swap_with_deposit, coins, user, baseline):
+    # runs after test_mutate_session_pool: the rollback fixture of that test
+    # must have undone its changes to the session pool
+    if not baseline["mutated"]:
+        pytest.skip("test_mutate_session_pool did not run in this process")
+
+    assert _snapshot(swap_with_deposit, coins, user) == baseline["state"]
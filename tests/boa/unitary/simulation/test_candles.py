@@ -0,0 +1,60 @@
+import json
+import random
+
+import pytest
+
+from tests.boa.utils import candles as candles_io
+from tests.boa.utils import simulation_ma_4 as sim
+from tests.boa.utils import simulation_sweep as sweep
+
+
+@pytest.fixture(scope="module")
+def json_path(tmp_path_factory):
+    # binance klines, out of order and with prices as strings:
+    random.seed(1)
+    klines = []
+    for k in range(20):
+        p = 0.07 * (1 + random.uniform(-0.01, 0.01))
+        klines.append(
+            [k * 60_000, str(p), str(p * 1.001), str(p * 0.999), str(p), 1e-3]
+        )
+    random.shuffle(klines)
+
+    path = tmp_path_factory.mktemp("candles") / "ethbtc.json"
+    path.write_text(json.dumps(klines))
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def dataset(json_path, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("candles") / "ethbtc")
+    assert candles_io.convert(json_path, path) == 20
+    return candles_io.Candles(path)
+
+
+def test_same_candles_as_json(json_path, dataset):
+    expected = sim.get_all(json_path)
+
+    assert len(dataset) == len(expected)
+    assert list(dataset) == expected
+    assert dataset[0] == expected[0]
+    assert dataset[-1] == expected[-1]
+    with pytest.raises(IndexError):
+        dataset[len(expected)]
+
+
+def test_slice(json_path, dataset):
+    expected = sim.get_all(json_path)
+
+    assert list(dataset[5:12]) == expected[5:12]
+    assert list(dataset[5:12][2:]) == expected[7:12]
+    assert dataset[5:12][-1] == expected[11]
+    assert len(dataset[30:]) == 0
+
+
+def test_same_backtest(json_path, dataset):
+    params = {"A": 100, "gamma": 10**16, "mid_fee": 7e-4, "ma_time": 600}
+    assert sweep.backtest(params, dataset) == sweep.backtest(
+        params, sim.get_all(json_path)
+    )
+    assert isinstance(candles_io.load(dataset.path), candles_io.Candles)
@@ -0,0 +1,104 @@
+import json
+from itertools import islice
+
+from tests.boa.utils import candles as candles_io
+from tests.boa.utils.simulation_traders import make_trader
+
+# btcusdt, ethusdt and ethbtc with prices rising 0.1% every 5 minutes:
+PAIRS = {(0, 1): 47500.0, (0, 2): 1500.0, (1, 2): 1500.0 / 47500.0}
+NUM_CANDLES = 30
+
+
+def _candles(pair, offset=0):
+    price = PAIRS[pair]
+    for k in range(NUM_CANDLES):
+        close = price * 1.001
+        yield {
+            "open": price,
+            "high": close * 1.0005,
+            "low": price * 0.9995,
+            "close": close,
+            "t": 300 * k + offset,
+            "volume": 10**6 / PAIRS[(0, pair[1])],  # <- ~1M usd
+            "pair": pair,
+        }
+        price = close
+
+
+def _consumed(candles, counter):
+    for d in candles:
+        counter[d["pair"]] += 1
+        yield d
+
+
+def test_merge_is_ordered_and_lazy():
+    counter = {pair: 0 for pair in PAIRS}
+    merged = candles_io.merge(
+        *(
+            _consumed(_candles(pair, offset), counter)
+            for offset, pair in enumerate(PAIRS)
+        )
+    )
+
+    first = list(islice(merged, 6))
+    assert [d["pair"] for d in first] == list(PAIRS) * 2
+    assert sum(counter.values()) <= len(first) + len(PAIRS)
+
+    rest = list(merged)
+    assert len(first) + len(rest) == len(PAIRS) * NUM_CANDLES
+    times = [d["t"] for d in first + rest]
+    assert times == sorted(times)
+
+
+def test_load_pairs(tmp_path):
+    # one columnar dataset and one klines json per pair:
+    paths = {}
+    for pair in PAIRS:
+        rows = list(_candles(pair))
+        path = tmp_path / f"{pair[0]}{pair[1]}.json"
+        path.write_text(
+            json.dumps(
+                [
+                    [
+                        d["t"] * 1000,
+                        d["open"],
+                        d["high"],
+                        d["low"],
+                        d["close"],
+                        d["volume"],
+                    ]
+                    for d in rows
+                ]
+            )
+        )
+        paths[pair] = str(path)
+    candles_io.convert(paths[0, 1], str(tmp_path / "01"), (0, 1))
+    paths[0, 1] = str(tmp_path / "01")
+
+    merged = list(candles_io.load_pairs(paths))
+    assert merged == sorted(
+        (d for pair in PAIRS for d in _candles(pair)), key=lambda d: d["t"]
+    )
+
+
+def test_simulate_three_coins():
+    streamed = make_trader(log=False)
+    streamed.simulate(candles_io.merge(*(_candles(p) for p in PAIRS)))
+
+    # same result as a fully materialized and sorted candle list:
+    materialized = make_trader(log=False)
+    materialized.simulate(
+        sorted(
+            (d for pair in PAIRS for d in _candles(pair)),
+            key=lambda d: d["t"],
+        )
+    )
+    assert streamed.curve.x == materialized.curve.x
+    assert streamed.xcp_profit == materialized.xcp_profit
+
+    # pool earned fees and both price oracles followed the market up:
+    assert streamed.total_vol > 0
+    assert streamed.xcp_profit > 10**18
+    p0 = make_trader(log=False).price_oracle
+    assert streamed.price_oracle[1] > p0[1] * 1.01
+    assert streamed.price_oracle[2] > p0[2] * 1.01
@@ -0,0 +1,69 @@
+import pytest
+
+from tests.boa.utils import simulation_int_many as sim
+from tests.boa.utils.simulation_traders import (
+    GAMMA,
+    P0,
+    A,
+    D,
+    make_trader,
+    run_trades,
+)
+
+
+def test_D_cache_tracks_mutations():
+    curve = sim.Curve(A, GAMMA, D, 3, p=P0[:])
+
+    assert curve.D() == sim.solve_D(A, GAMMA, curve.xp())
+    assert curve.D() == sim.solve_D(A, GAMMA, curve.xp())
+    assert (curve.cache_hits, curve.cache_misses) == (1, 1)
+
+    # in-place mutation of x:
+    curve.x[0] += 10**21
+    assert curve.D() == sim.solve_D(A, GAMMA, curve.xp())
+
+    # in-place mutation of p:
+    curve.p[1] = curve.p[1] * 1001 // 1000
+    assert curve.D() == sim.solve_D(A, GAMMA, curve.xp())
+
+    # reassignment of x and parameter changes:
+    curve.x = [x * 2 for x in curve.x]
+    curve.gamma += 1
+    assert curve.D() == sim.solve_D(A, GAMMA + 1, curve.xp())
+
+    assert (curve.cache_hits, curve.cache_misses) == (1, 4)
+
+
+def test_xp_copy():
+    curve = sim.Curve(A, GAMMA, D, 3, p=P0[:])
+    xp = curve.xp()
+    xp[0] = 0
+    assert curve.xp()[0] > 0
+
+
+def test_empty_balance():
+    curve = sim.Curve(A, GAMMA, D, 3, p=P0[:])
+    curve.x[2] = 0
+    with pytest.raises(ValueError):
+        curve.D()
+
+
+def test_cached_trader_matches_uncached():
+    cached = make_trader()
+    uncached = make_trader()
+    uncached.curve.cache_size = 0
+    for trader in (cached, uncached):
+        trader.curve.cache_hits = trader.curve.cache_misses = 0
+
+    run_trades(cached)
+    run_trades(uncached)
+
+    assert cached.curve.x == uncached.curve.x
+    assert cached.curve.p == uncached.curve.p
+    assert cached.xcp_profit == uncached.xcp_profit
+    assert cached.xcp_profit_real == uncached.xcp_profit_real
+    assert cached.price_oracle == uncached.price_oracle
+
+    assert uncached.curve.cache_hits == 0
+    assert cached.curve.cache_hits > 0
+    assert cached.curve.cache_misses < uncached.curve.cache_misses
@@ -0,0 +1,50 @@
+import pytest
+
+from tests.boa.utils import simulation_ma_4 as sim
+
+
+def _doubling_step(trader, dp, sign):
+    # previous step_for_price: double the step until the price moves by dp
+    p0 = trader.price(0, 1)
+    x0 = trader.curve.x[:]
+    step = trader.dx
+    while True:
+        trader.curve.x[0] = x0[0] + sign * step
+        dp_ = abs(p0 - trader.price(0, 1))
+        if dp_ >= dp or step >= 0.1 * trader.curve.x[0]:
+            trader.curve.x = x0
+            return step
+        step *= 2
+
+
+def _trader(A):
+    return sim.Trader(
+        A,
+        10**16,
+        10**18,
+        2,
+        0.07,
+        mid_fee=7e-4,
+        out_fee=4e-3,
+        price_threshold=0.004,
+        fee_gamma=0.01,
+        log=False,
+    )
+
+
+@pytest.mark.parametrize("A", [10, 100, 2000])
+@pytest.mark.parametrize("imbalance", [0, 10**16, -(10**16)])
+def test_same_step_as_doubling(A, imbalance):
+    trader = _trader(A)
+    trader.curve.x[0] += imbalance
+
+    # simulate uses dp from 0.002 * mid_fee to 0.002 * 0.1; much smaller dp
+    # are below the float precision of price():
+    for dp in [1.4e-6, 1e-5, 1e-4, 2e-4, 1e-3, 1.0]:
+        for sign in [1, -1]:
+            x = trader.curve.x[:]
+            expected = _doubling_step(trader, dp, sign)
+            assert trader.step_for_price(dp, sign) == expected
+            assert trader.curve.x == x
+
+    assert trader.price_evals_saved > trader.price_evals
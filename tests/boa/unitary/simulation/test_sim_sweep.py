@@ -0,0 +1,85 @@
+import csv
+import json
+import random
+
+import pytest
+
+from tests.boa.utils import simulation_ma_4 as sim
+from tests.boa.utils import simulation_sweep as sweep
+
+
+@pytest.fixture(scope="module")
+def candles_path(tmp_path_factory):
+    # binance klines: [t_ms, open, high, low, close, volume]
+    random.seed(0)
+    price = 0.07
+    klines = []
+    for k in range(10):
+        close = price * (1 + random.uniform(-0.01, 0.01))
+        high = max(price, close) * 1.002
+        low = min(price, close) * 0.998
+        klines.append([k * 300_000, price, high, low, close, 0.001])
+        price = close
+
+    path = tmp_path_factory.mktemp("candles") / "ethbtc.json"
+    path.write_text(json.dumps(klines))
+    return str(path)
+
+
+def test_grid():
+    runs = sweep.grid(A=[100, 400], gamma=[1e-4], mid_fee=[5e-4, 7e-4])
+    assert len(runs) == 4
+    assert {(r["A"], r["mid_fee"]) for r in runs} == {
+        (100, 5e-4),
+        (100, 7e-4),
+        (400, 5e-4),
+        (400, 7e-4),
+    }
+    with pytest.raises(AssertionError):
+        sweep.grid(D=[10**18])
+
+
+def test_sweep_matches_serial(candles_path, tmp_path):
+    runs = sweep.grid(
+        A=[100, 1000],
+        gamma=[10**16],
+        mid_fee=[7e-4],
+        out_fee=[4e-3],
+        fee_gamma=[0.01],
+        price_threshold=[0.004],
+        adjustment_step=[3e-3, 1e-3],
+        ma_time=[None, 600],
+    )
+    out_path = tmp_path / "sweep.csv"
+    sweep.sweep(runs, candles_path, out_path, max_workers=2)
+
+    with open(out_path) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(runs)
+
+    candles = sim.get_all(candles_path)
+    expected = {
+        (str(r["A"]), str(r["adjustment_step"]), str(r["ma_time"] or "")): r
+        for r in (sweep.backtest(params, candles) for params in runs)
+    }
+    for row in rows:
+        r = expected[(row["A"], row["adjustment_step"], row["ma_time"])]
+        for name in sweep.RESULTS:
+            assert float(row[name]) == r[name]
+
+
+def test_sweep_errors(candles_path, tmp_path):
+    runs = sweep.grid(A=[100], gamma=[10**16], ma_time=[600, 0])
+    out_path = tmp_path / "sweep.csv"
+    with pytest.raises(ZeroDivisionError):
+        sweep.sweep(runs, candles_path, out_path, max_workers=2)
+
+    # ma_time=0 fails, the other run goes on:
+    sweep.sweep(
+        runs, candles_path, out_path, max_workers=2, continue_on_error=True
+    )
+    with open(out_path) as f:
+        rows = {row["ma_time"]: row for row in csv.DictReader(f)}
+    assert rows["600"]["error"] == "" and float(rows["600"]["volume"]) > 0
+    assert rows["0"]["error"].startswith("ZeroDivisionError")
+    assert all(rows["0"][name] == "" for name in sweep.RESULTS)
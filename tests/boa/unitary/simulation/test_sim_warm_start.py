@@ -0,0 +1,73 @@
+from collections import Counter
+
+from tests.boa.utils import simulation_int_many as sim
+from tests.boa.utils.simulation_traders import (
+    GAMMA,
+    P0,
+    A,
+    make_trader,
+    run_trades,
+)
+
+
+def _total(histogram):
+    return sum(n * count for n, count in histogram.items())
+
+
+def _close(a, b, rtol=10**8):
+    # each solve converges to 1e-14, errors then add up over the trades
+    return abs(a - b) <= max(100, a // rtol)
+
+
+def test_warm_start_matches_cold():
+    warm = make_trader()
+    cold = make_trader(warm_start=False)
+    for trader in (warm, cold):
+        trader.curve.iterations = {"D": Counter(), "y": Counter()}
+        for _ in range(3):
+            run_trades(trader)
+
+    for a, b in zip(warm.curve.x, cold.curve.x):
+        assert _close(a, b)
+    for a, b in zip(warm.curve.p, cold.curve.p):
+        assert _close(a, b)
+    assert _close(warm.xcp_profit, cold.xcp_profit)
+    assert _close(warm.xcp_profit_real, cold.xcp_profit_real)
+
+    # same number of solves, fewer newton_D iterations:
+    D_warm, D_cold = warm.curve.iterations["D"], cold.curve.iterations["D"]
+    assert sum(D_warm.values()) == sum(D_cold.values())
+    assert _total(D_warm) < _total(D_cold)
+    assert warm.curve.iterations["y"] == cold.curve.iterations["y"]
+
+
+def test_iteration_histogram():
+    curve = sim.Curve(A, GAMMA, 3 * 10**24, 3, p=P0[:])
+    curve.D()
+    curve.D()  # <- cached, not solved again
+    curve.y(curve.x[0] * 11 // 10, 0, 1)
+
+    assert sum(curve.iterations["D"].values()) == curve.cache_misses == 1
+    assert sum(curve.iterations["y"].values()) == 1
+
+
+def test_D_from_K0_prev():
+    curve = sim.Curve(A, GAMMA, 3 * 10**24, 3, p=P0[:])
+    K0_prev = curve.K0()
+    curve.x[0] = curve.x[0] * 101 // 100
+
+    D_cold = sim.solve_D(A, GAMMA, curve.xp())
+    assert _close(curve.D(K0_prev), D_cold, 10**14)
+
+
+def test_cold_D_reuses_warm_seed():
+    curves = [sim.Curve(A, GAMMA, 3 * 10**24, 3, p=P0[:]) for _ in range(2)]
+    curves[1].cache_size = 0
+    for curve in curves:
+        K0_prev = curve.K0()
+        curve.x[0] = curve.x[0] * 101 // 100
+        curve.D(K0_prev)
+
+    # the same result with and without the cache:
+    assert curves[0].D() == curves[1].D() == curves[1].D(K0_prev)
+    assert curves[0].cache_hits == 1
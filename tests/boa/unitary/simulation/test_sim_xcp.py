@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from tests.boa.utils import math_optimized
+from tests.boa.utils.simulation_traders import ReferenceTrader, make_trader
+
+
+def _replay(trader, seed=0, num_trades=300):
+    random.seed(seed)
+    trader.t = 0
+    history = []
+    for k in range(num_trades):
+        i, j = random.sample(range(3), 2)
+        dx = random.randint(1, 10**5) * 10**36 // trader.price_oracle[i]
+        if k % 2:
+            trader.buy(dx, i, j)
+        else:
+            trader.sell(dx, i, j)
+        trader.tweak_price(12 * (k + 1) + random.randint(0, 600))
+        history.append((trader.xcp, trader.xcp_profit, trader.xcp_profit_real))
+    return history
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_profit_bit_identical(seed):
+    # warm starts and the integer get_p change results within newton's
+    # tolerance by design, the D cache and get_xcp must not change them:
+    trader = make_trader(log=False, warm_start=False, exact_p=False)
+    reference = make_trader(ReferenceTrader, log=False)
+
+    assert _replay(trader, seed) == _replay(reference, seed)
+
+
+def test_cbrt_xcp():
+    trader = make_trader(log=False, cbrt_xcp=True)
+    X = [trader.D0 * 10**18 // (3 * p) for p in trader.curve.p]
+    assert trader.xcp_0 == math_optimized.geometric_mean(X)
+
+    # the closed form differs from the iterative mean by rounding only:
+    for (xcp, profit, real), (_xcp, _profit, _real) in zip(
+        _replay(trader), _replay(make_trader(log=False))
+    ):
+        assert abs(xcp - _xcp) <= _xcp // 10**15
+        assert abs(profit - _profit) <= _profit // 10**12
+        assert abs(real - _real) <= _real // 10**12
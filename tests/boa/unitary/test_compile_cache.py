@@ -0,0 +1,46 @@
+import json
+
+from boa.vyper.contract import VyperDeployer
+
+from tests.boa.utils.compile_cache import CompileCache
+
+SOURCE = """
+x: public(uint256)
+
+@external
+def __init__(_x: uint256):
+    self.x = _x
+
+@external
+@view
+def double() -> uint256:
+    return 2 * self.x
+"""
+
+
+def test_compile_cache(tmp_path):
+    cache = CompileCache(tmp_path)
+
+    data = cache.compiler_data(SOURCE, "Foo")
+    assert (cache.hits, cache.misses) == (0, 1)
+    (entry_path,) = tmp_path.iterdir()
+
+    with entry_path.open() as f:
+        entry = json.load(f)
+    assert entry["bytecode_runtime"] == data.bytecode_runtime.hex()
+    assert {item.get("name") for item in entry["abi"]} >= {"x", "double"}
+
+    # a second cache on the same directory, e.g. in another xdist worker:
+    other = CompileCache(tmp_path)
+    cached = other.compiler_data(SOURCE, "Foo")
+    assert (other.hits, other.misses) == (1, 0)
+    assert cached.bytecode == data.bytecode
+
+    contract = VyperDeployer(cached).deploy(21)
+    assert contract.double() == 42
+
+    # a different source or contract name is a miss:
+    other.compiler_data(SOURCE.replace("2 *", "3 *"), "Foo")
+    other.compiler_data(SOURCE, "Bar")
+    assert (other.hits, other.misses) == (1, 2)
+    assert len(list(tmp_path.iterdir())) == 3
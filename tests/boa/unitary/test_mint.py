@@ -0,0 +1,73 @@
+import boa
+
+from tests.boa.utils import tokens
+from tests.boa.utils.tokens import mint_for_testing, mint_many
+
+
+def test_mint_matches_eval(coins, swap_with_deposit, users):
+    usd = coins[0]
+    for token in (usd, swap_with_deposit):
+        supply = token.totalSupply()
+        balances = [token.balanceOf(u) for u in users[:2]]
+
+        mint_for_testing(token, users[0], 10**20)
+        tokens._mint_eval(token, users[1], 10**20)
+
+        assert token.balanceOf(users[0]) == balances[0] + 10**20
+        assert token.balanceOf(users[1]) == balances[1] + 10**20
+        assert token.totalSupply() == supply + 2 * 10**20
+
+    # balances written to storage can be spent:
+    with boa.env.prank(users[0]):
+        usd.transfer(users[2], 10**20)
+    assert usd.balanceOf(users[2]) >= 10**20
+
+
+def test_mint_weth(weth, user):
+    eth = boa.env.get_balance(user)
+    balance = weth.balanceOf(user)
+
+    mint_for_testing(weth, user, 10**18)
+    assert weth.balanceOf(user) == balance + 10**18
+    assert boa.env.get_balance(user) == eth
+
+    mint_for_testing(weth, user, 10**18, mint_eth=True)
+    assert weth.balanceOf(user) == balance + 10**18
+    assert boa.env.get_balance(user) == eth + 10**18
+
+
+def test_mint_many(coins, users):
+    amounts = [10**18, 2 * 10**8, 3 * 10**18]
+    supplies = [coin.totalSupply() for coin in coins]
+    balances = [[coin.balanceOf(u) for u in users] for coin in coins]
+
+    mint_many(coins, users, amounts)
+
+    for k, coin in enumerate(coins):
+        if k < 2:  # <- the WETH mock does not track its supply
+            assert coin.totalSupply() == supplies[k] + amounts[k] * len(users)
+        for u, balance in zip(users, balances[k]):
+            assert coin.balanceOf(u) == balance + amounts[k]
+
+
+def test_mint_reused_address(deployer, user):
+    # a factory's CREATE reuses an address after a rollback, possibly for a
+    # contract with a different storage layout:
+    address = boa.env.generate_address()
+    with boa.env.anchor():
+        with boa.env.prank(deployer):
+            token = boa.load(
+                "contracts/mocks/ERC20Mock.vy",
+                "USD",
+                "USD",
+                18,
+                override_address=address,
+            )
+        mint_for_testing(token, user, 10**18)
+
+    with boa.env.prank(deployer):
+        weth = boa.load("contracts/mocks/WETH.vy", override_address=address)
+
+    mint_for_testing(weth, user, 10**18)
+    assert weth.balanceOf(user) == 10**18
+    assert boa.env.get_balance(weth.address) == 10**18
@@ -0,0 +1,123 @@
+import boa
+from boa.test import strategy
+from hypothesis import given, settings
+
+from tests.boa.fixtures.pool import (
+    INITIAL_PRICES,
+    _crypto_swap_with_deposit,
+    _deploy_swap,
+)
+
+SETTINGS = {"max_examples": 20, "deadline": None}
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def _markets(factory, _from, _to):
+    return [
+        factory.find_pool_for_coins(_from, _to, k)
+        for k in range(factory.get_market_counts(_from, _to))
+    ]
+
+
+def _best(factory, views, amm_interface, _from, _to, amount):
+    best_pool, best_dy = ZERO_ADDRESS, 0
+    for pool in _markets(factory, _from, _to):
+        swap = amm_interface.at(pool)
+        pool_coins = [swap.coins(k) for k in range(3)]
+        i, j = pool_coins.index(_from), pool_coins.index(_to)
+        try:
+            dy = views.get_dy(i, j, amount, swap)
+        except boa.BoaError:
+            continue
+        if dy > best_dy:
+            best_pool, best_dy = pool, dy
+    return best_pool, best_dy
+
+
+def _more_pools(factory, amm_interface, coins, weth, params, deployer, user):
+    # a smaller and a cheaper pool next to swap_with_deposit, and an empty
+    # one that cannot quote at all:
+    small = _deploy_swap(factory, amm_interface, coins, weth, params, deployer)
+    _crypto_swap_with_deposit(
+        coins, user, small, INITIAL_PRICES, dollar_amt_each_coin=10**5
+    )
+    cheap = _deploy_swap(
+        factory,
+        amm_interface,
+        coins,
+        weth,
+        params | {"mid_fee": params["mid_fee"] // 4},
+        deployer,
+    )
+    _crypto_swap_with_deposit(coins, user, cheap, INITIAL_PRICES)
+    _deploy_swap(factory, amm_interface, coins, weth, params, deployer)
+
+
+@given(
+    fractions=strategy("uint256[8]", min_value=1, max_value=5000),
+    i=strategy("uint", min_value=0, max_value=2),
+    j=strategy("uint", min_value=0, max_value=2),
+)
+@settings(**SETTINGS)
+def test_get_best_dy_many(
+    swap_with_deposit,
+    tricrypto_factory,
+    views_contract,
+    amm_interface,
+    coins,
+    weth,
+    params,
+    deployer,
+    user,
+    fractions,
+    i,
+    j,
+):
+    if i == j:
+        return
+
+    with boa.env.anchor():
+        _more_pools(
+            tricrypto_factory,
+            amm_interface,
+            coins,
+            weth,
+            params,
+            deployer,
+            user,
+        )
+        _from, _to = coins[i].address, coins[j].address
+        assert len(_markets(tricrypto_factory, _from, _to)) >= 4
+
+        # up to half the balance of the largest pool, so the small pool
+        # cannot quote some of the amounts:
+        dx = [swap_with_deposit.balances(i) * f // 10**4 for f in fractions]
+        pools, dy = tricrypto_factory.get_best_dy_many(_from, _to, dx)
+
+        for amount, pool, out in zip(dx, pools, dy):
+            best_pool, best_dy = _best(
+                tricrypto_factory,
+                views_contract,
+                amm_interface,
+                _from,
+                _to,
+                amount,
+            )
+            assert (pool, out) == (best_pool, best_dy)
+
+
+def test_get_best_dy_many_edge_cases(
+    swap_with_deposit, tricrypto_factory, coins
+):
+    _from, _to = coins[0].address, coins[1].address
+    assert tricrypto_factory.get_best_dy_many(_from, _to, []) == ([], [])
+
+    # zero amounts revert in every pool, a pair without pools has no quotes:
+    pools, dy = tricrypto_factory.get_best_dy_many(_from, _to, [0, 10**18])
+    assert pools[0] == ZERO_ADDRESS and dy[0] == 0
+    assert pools[1] == swap_with_deposit.address and dy[1] > 0
+
+    pools, dy = tricrypto_factory.get_best_dy_many(
+        _from, boa.env.generate_address(), [10**18]
+    )
+    assert pools == [ZERO_ADDRESS] and dy == [0]
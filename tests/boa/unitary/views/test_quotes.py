@@ -0,0 +1,115 @@
+import boa
+import pytest
+from boa.test import strategy
+from hypothesis import given, settings
+
+from tests.boa.utils import quotes
+from tests.boa.utils.math_optimized import MAX_UINT256
+
+SETTINGS = {"max_examples": 100, "deadline": None}
+
+
+def _quote(views_fn, quote_fn, state, swap, *args):
+    # the python quote reverts exactly when the views contract does
+    try:
+        expected = views_fn(*args, swap)
+    except boa.BoaError:
+        with pytest.raises(ValueError):
+            quote_fn(state, *args)
+        return
+    assert quote_fn(state, *args) == expected
+
+
+def _check_quotes(views, swap, state, i, j, amount, amounts):
+    supply = state.token_supply
+    for views_fn, quote_fn, args in [
+        (views.get_dy, quotes.get_dy, (i, j, amount)),
+        (views.calc_fee_get_dy, quotes.calc_fee_get_dy, (i, j, amount)),
+        (views.get_dx, quotes.get_dx, (i, j, amount // 10)),
+        (views.calc_token_amount, quotes.calc_token_amount, (amounts, True)),
+        (
+            views.calc_fee_token_amount,
+            quotes.calc_fee_token_amount,
+            (amounts, True),
+        ),
+        (
+            views.calc_token_amount,
+            quotes.calc_token_amount,
+            ([a // 10 for a in amounts], False),
+        ),
+        (
+            views.calc_withdraw_one_coin,
+            quotes.calc_withdraw_one_coin,
+            (amount * supply // 10**25, i),
+        ),
+        (
+            views.calc_fee_withdraw_one_coin,
+            quotes.calc_fee_withdraw_one_coin,
+            (amount * supply // 10**25, i),
+        ),
+    ]:
+        _quote(views_fn, quote_fn, state, swap, *args)
+
+
+@given(
+    amount=strategy("uint256", min_value=1, max_value=10**25),
+    amounts=strategy("uint256[3]", max_value=10**25),
+    i=strategy("uint", min_value=0, max_value=2),
+    j=strategy("uint", min_value=0, max_value=2),
+)
+@settings(**SETTINGS)
+def test_quotes_match_views(
+    swap_with_deposit, views_contract, amount, amounts, i, j
+):
+    state = quotes.PoolState.from_pool(swap_with_deposit)
+    _check_quotes(
+        views_contract, swap_with_deposit, state, i, j, amount, amounts
+    )
+
+
+@given(
+    amount=strategy("uint256", min_value=10**15, max_value=10**24),
+    amounts=strategy("uint256[3]", max_value=10**24),
+    i=strategy("uint", min_value=0, max_value=2),
+    j=strategy("uint", min_value=0, max_value=2),
+    elapsed=strategy("uint", min_value=1, max_value=7 * 86400),
+)
+@settings(**SETTINGS)
+def test_quotes_match_views_ramp(
+    swap_with_deposit,
+    views_contract,
+    factory_admin,
+    amount,
+    amounts,
+    i,
+    j,
+    elapsed,
+):
+    swap = swap_with_deposit
+    with boa.env.anchor():
+        boa.env.time_travel(seconds=86400)
+        with boa.env.prank(factory_admin):
+            swap.ramp_A_gamma(
+                swap.A() * 3,
+                swap.gamma() * 2,
+                boa.env.vm.state.timestamp + 7 * 86400,
+            )
+        boa.env.time_travel(seconds=elapsed)
+
+        state = quotes.PoolState.from_pool(swap)
+        assert state.ramping or elapsed == 7 * 86400
+        _check_quotes(views_contract, swap, state, i, j, amount, amounts)
+
+
+def test_quote_reverts(swap_with_deposit):
+    state = quotes.PoolState.from_pool(swap_with_deposit)
+    for quote_fn, args in [
+        (quotes.get_dy, (0, 0, 10**18)),
+        (quotes.get_dy, (0, 1, 0)),
+        (quotes.get_dx, (0, 1, state.balances[1])),
+        (quotes.calc_token_amount, ([0, 0, 0], True)),
+        (quotes.calc_token_amount, ([MAX_UINT256, 0, 0], True)),
+        (quotes.calc_withdraw_one_coin, (state.token_supply + 1, 0)),
+    ]:
+        with pytest.raises(ValueError):
+            quote_fn(state, *args)
@@ -0,0 +1,105 @@
+import boa
+import pytest
+from boa.test import strategy
+from hypothesis import given, settings
+
+SETTINGS = {"max_examples": 50, "deadline": None}
+
+
+def _singles(fn, *args):
+    try:
+        return fn(*args)
+    except boa.BoaError:
+        return None
+
+
+@given(
+    fractions=strategy("uint256[8]", min_value=1, max_value=2 * 10**4),
+    i=strategy("uint", min_value=0, max_value=2),
+    j=strategy("uint", min_value=0, max_value=2),
+)
+@settings(**SETTINGS)
+def test_get_dy_dx_many(swap_with_deposit, views_contract, fractions, i, j):
+    swap = swap_with_deposit
+    if i == j:
+        return
+
+    # up to twice the balance of the coin in (get_dy) or out (get_dx):
+    for many, single, k in [
+        (views_contract.get_dy_many, views_contract.get_dy, i),
+        (views_contract.get_dx_many, views_contract.get_dx, j),
+    ]:
+        amounts = [swap.balances(k) * f // 10**4 for f in fractions]
+        expected = [_singles(single, i, j, a, swap) for a in amounts]
+        if None in expected:
+            with boa.reverts():
+                many(i, j, amounts, swap)
+        else:
+            assert many(i, j, amounts, swap) == expected
+
+
+@given(
+    fractions=strategy("uint256[8]", min_value=1, max_value=10**4),
+    i=strategy("uint", min_value=0, max_value=2),
+)
+@settings(**SETTINGS)
+def test_calc_withdraw_one_coin_many(
+    swap_with_deposit, views_contract, fractions, i
+):
+    swap = swap_with_deposit
+    amounts = [swap.totalSupply() * f // 10**4 for f in fractions]
+
+    expected = [
+        _singles(views_contract.calc_withdraw_one_coin, a, i, swap)
+        for a in amounts
+    ]
+    if None in expected:
+        with boa.reverts():
+            views_contract.calc_withdraw_one_coin_many(amounts, i, swap)
+    else:
+        assert (
+            views_contract.calc_withdraw_one_coin_many(amounts, i, swap)
+            == expected
+        )
+
+
+def test_many_during_ramp(swap_with_deposit, views_contract, factory_admin):
+    swap = swap_with_deposit
+    amounts = [10**18 * 10**k for k in range(6)]
+    with boa.env.anchor():
+        boa.env.time_travel(seconds=86400)
+        with boa.env.prank(factory_admin):
+            swap.ramp_A_gamma(
+                swap.A() * 2,
+                swap.gamma() * 2,
+                boa.env.vm.patch.timestamp + 7 * 86400,
+            )
+        boa.env.time_travel(seconds=3 * 86400)
+
+        assert views_contract.get_dy_many(0, 1, amounts, swap) == [
+            views_contract.get_dy(0, 1, a, swap) for a in amounts
+        ]
+        lp_amounts = [swap.totalSupply() // 10**k for k in range(1, 7)]
+        assert views_contract.calc_withdraw_one_coin_many(
+            lp_amounts, 2, swap
+        ) == [
+            views_contract.calc_withdraw_one_coin(a, 2, swap)
+            for a in lp_amounts
+        ]
+
+
+def test_many_edge_cases(swap_with_deposit, views_contract):
+    swap = swap_with_deposit
+    assert views_contract.get_dy_many(0, 1, [], swap) == []
+
+    with boa.reverts("do not exchange 0 coins"):
+        views_contract.get_dy_many(0, 1, [10**18, 0], swap)
+    with boa.reverts("coin index out of range"):
+        views_contract.get_dx_many(1, 1, [10**18], swap)
+
+    supply = swap.totalSupply()
+    with boa.reverts():
+        views_contract.calc_withdraw_one_coin_many([1, supply + 1], 0, swap)
+
+    with pytest.raises(Exception):
+        views_contract.get_dy_many(0, 1, [10**18] * 65, swap)
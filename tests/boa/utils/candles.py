@@ -0,0 +1,158 @@
+import heapq
+import json
+import os
+
+import numpy as np
+
+from tests.boa.utils import simulation_ma_4
+
+# Column name -> dtype. A dataset is a directory with one .npy file per
+# column, sorted by t, so that it can be memory-mapped column by column.
+COLUMNS = {
+    "t": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    "pair": np.int8,  # <- shape (n, 2)
+}
+CHUNK_SIZE = 4096
+
+
+def convert(json_path, out_dir, pair=(0, 1)):
+    """
+    One-time conversion of binance klines json
+    ([[t_ms, open, high, low, close, volume, ...], ...]) to a columnar
+    dataset in out_dir. Returns the number of candles.
+    """
+    with open(json_path, "r") as f:
+        klines = json.load(f)
+
+    columns = {
+        "t": np.array([k[0] // 1000 for k in klines], dtype=np.int64),
+        "open": np.array([float(k[1]) for k in klines]),
+        "high": np.array([float(k[2]) for k in klines]),
+        "low": np.array([float(k[3]) for k in klines]),
+        "close": np.array([float(k[4]) for k in klines]),
+        "volume": np.array([float(k[5]) for k in klines]),
+        "pair": np.tile(np.array(pair, dtype=np.int8), (len(klines), 1)),
+    }
+    write(columns, out_dir)
+    return len(klines)
+
+
+def write(columns, out_dir):
+    # columns: name -> array of equal length, sorted by t here
+    order = np.argsort(columns["t"], kind="stable")
+    os.makedirs(out_dir, exist_ok=True)
+    for name, dtype in COLUMNS.items():
+        column = np.asarray(columns[name], dtype=dtype)[order]
+        np.save(os.path.join(out_dir, f"{name}.npy"), column)
+
+
+class Candles:
+    """
+    Memory-mapped columnar candles. Iterating or indexing gives the same
+    dicts as simulation_ma_4.get_all(), created one at a time, so it can be
+    passed to Trader.simulate directly.
+    """
+
+    def __init__(self, path, start=0, stop=None):
+        self.path = path
+        self.columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in COLUMNS
+        }
+        n = len(self.columns["t"])
+        self.start = start
+        self.stop = n if stop is None else min(stop, n)
+
+    def __len__(self):
+        return max(self.stop - self.start, 0)
+
+    def _candle(self, k):
+        c = self.columns
+        return {
+            "open": float(c["open"][k]),
+            "high": float(c["high"][k]),
+            "low": float(c["low"][k]),
+            "close": float(c["close"][k]),
+            "t": int(c["t"][k]),
+            "volume": float(c["volume"][k]),
+            "pair": (int(c["pair"][k][0]), int(c["pair"][k][1])),
+        }
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            start, stop, step = k.indices(len(self))
+            assert step == 1
+            return Candles(self.path, self.start + start, self.start + stop)
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError(k)
+        return self._candle(self.start + k)
+
+    def __iter__(self):
+        # convert whole chunks of the columns to python objects at once,
+        # which is much faster than going through numpy scalars per candle
+        for k in range(self.start, self.stop, CHUNK_SIZE):
+            end = min(k + CHUNK_SIZE, self.stop)
+            chunk = {
+                name: self.columns[name][k:end].tolist() for name in COLUMNS
+            }
+            for t, o, h, l, c, v, pair in zip(
+                chunk["t"],
+                chunk["open"],
+                chunk["high"],
+                chunk["low"],
+                chunk["close"],
+                chunk["volume"],
+                chunk["pair"],
+            ):
+                yield {
+                    "open": o,
+                    "high": h,
+                    "low": l,
+                    "close": c,
+                    "t": t,
+                    "volume": v,
+                    "pair": tuple(pair),
+                }
+
+
+def load(path):
+    """
+    Candles from a columnar dataset directory, or from binance klines json
+    via simulation_ma_4.get_all().
+    """
+    if os.path.isdir(path):
+        return Candles(path)
+    return simulation_ma_4.get_all(path)
+
+
+def _with_pair(candles, pair):
+    for d in candles:
+        d["pair"] = pair
+        yield d
+
+
+def merge(*sources):
+    """
+    Lazily merge several time-sorted candle streams into one ordered by t.
+    Candles with the same t keep the order of the sources. Only one pending
+    candle per source is held in memory.
+    """
+    return heapq.merge(*sources, key=lambda d: d["t"])
+
+
+def load_pairs(paths):
+    """
+    Merged candles of several pairs, e.g. for a 3-coin pool:
+    load_pairs({(0, 1): "download/btcusdt", (0, 2): "download/ethusdt"}).
+    pair (a, b) means prices of coin b in units of coin a.
+    """
+    return merge(
+        *(_with_pair(load(path), pair) for pair, path in paths.items())
+    )
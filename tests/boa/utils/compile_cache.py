@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import boa.interpret
+import vyper
+from vyper.cli.vyper_compile import get_interface_codes
+from vyper.compiler.output import build_abi_output
+from vyper.compiler.phases import CompilerData
+
+CACHE_DIR = os.environ.get("BOA_CACHE_DIR", ".boa_cache")
+
+# CompilerData arguments that change the output. boa.load and friends only
+# pass the contract name and interface codes, the rest are defaults:
+SETTINGS = {
+    "no_optimize": False,
+    "no_bytecode_metadata": False,
+}
+
+
+class CompileCache:
+    """
+    Content-addressed on-disk cache of compiled contracts.
+
+    An entry is a json file with the abi, initcode and runtime bytecode of
+    a contract, keyed on the sha256 of the vyper version, SETTINGS, contract
+    name, interface codes and source code. On a hit the cached bytecode is
+    set on a fresh CompilerData, so only the (cheap) vyper front end runs
+    and codegen is skipped. boa falls back to codegen for source maps, which
+    are only needed to render errors.
+
+    Entries are written to a temporary file and renamed into place, so
+    several processes (e.g. xdist workers) can share a cache directory.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source_code, contract_name, interface_codes):
+        preimage = json.dumps(
+            [
+                vyper.__version__,
+                vyper.__commit__,
+                SETTINGS,
+                contract_name,
+                interface_codes,
+                source_code,
+            ],
+            sort_keys=True,
+        )
+        return hashlib.sha256(preimage.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return self.cache_dir.joinpath(f"{key}.json")
+
+    def compiler_data(self, source_code, contract_name):
+        interface_codes = get_interface_codes(
+            Path("."), {contract_name: source_code}
+        )[contract_name]
+        data = CompilerData(
+            source_code,
+            contract_name,
+            interface_codes=interface_codes,
+            **SETTINGS,
+        )
+
+        p = self.path(self.key(source_code, contract_name, interface_codes))
+        try:
+            with p.open("r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+
+        if entry is not None:
+            self.hits += 1
+            # pre-populate the cached properties of CompilerData:
+            data.__dict__["bytecode"] = bytes.fromhex(entry["bytecode"])
+            data.__dict__["bytecode_runtime"] = bytes.fromhex(
+                entry["bytecode_runtime"]
+            )
+            return data
+
+        self.misses += 1
+        entry = {
+            "contract_name": contract_name,
+            "abi": build_abi_output(data),
+            "bytecode": data.bytecode.hex(),
+            "bytecode_runtime": data.bytecode_runtime.hex(),
+        }
+        self._write(p, entry)
+        return data
+
+    def _write(self, p, entry):
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp_p = p.with_suffix(f".{os.getpid()}.unfinished")
+        with tmp_p.open("w") as f:
+            json.dump(entry, f)
+        # atomic, concurrent writers of the same key write the same entry
+        os.replace(tmp_p, p)
+
+
+def install(cache_dir=CACHE_DIR):
+    """
+    Route boa.load, boa.loads, boa.load_partial and boa.loads_partial
+    through a CompileCache in cache_dir and return it.
+    """
+    cache = CompileCache(cache_dir)
+    boa.interpret.compiler_data = cache.compiler_data
+    return cache
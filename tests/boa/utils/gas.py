@@ -0,0 +1,302 @@
+import contextlib
+import json
+import os
+from collections import Counter, defaultdict
+
+import boa
+from boa.profiling import LineProfile
+from boa.vm.gas_meters import ProfilingGasMeter
+from boa.vyper.ast_utils import get_fn_name_from_lineno, get_line
+
+TX_BASE_GAS = 21000
+REFUND_QUOTIENT = 5  # <- EIP-3529
+
+
+def calldata_gas(data):
+    return sum(16 if b else 4 for b in data)
+
+
+def tx_gas(computation):
+    """
+    Gas a transaction executing computation would be charged: intrinsic
+    gas, execution gas and the capped refund (no access lists).
+    """
+    used = (
+        TX_BASE_GAS
+        + calldata_gas(computation.msg.data)
+        + computation.get_gas_used()
+    )
+    return used - min(computation.get_gas_refund(), used // REFUND_QUOTIENT)
+
+
+@contextlib.contextmanager
+def cold_access():
+    """
+    Run a call with all addresses and storage slots cold, like a new
+    transaction. boa.env._reset_access_counters() would drop the journal
+    checkpoints of enclosing boa.env.anchor() blocks, so the access journal
+    is swapped out for the call and restored afterwards.
+    """
+    account_db = boa.env.vm.state._account_db
+    journal = account_db._journal_accessed_state
+    account_db._reset_access_counters()
+    try:
+        yield
+    finally:
+        account_db._journal_accessed_state = journal
+
+
+def percentile(values, q):
+    # nearest rank
+    values = sorted(values)
+    k = max(int(round(q / 100 * len(values))) - 1, 0)
+    return values[min(k, len(values) - 1)]
+
+
+def contract_name(contract):
+    name = os.path.basename(contract.compiler_data.contract_name)
+    return os.path.splitext(name)[0]
+
+
+def line_info(contract, line):
+    # (function name, stripped source) of a line of contract
+    return (
+        get_fn_name_from_lineno(contract.ast_map, line),
+        get_line(contract.compiler_data.source_code, line).strip(),
+    )
+
+
+def _external_fns(contract):
+    if not hasattr(contract, "_gas_external_fns"):
+        contract._gas_external_fns = {
+            fn.name
+            for fn in contract.global_ctx.functions
+            if fn._metadata["type"].is_external
+        }
+    return contract._gas_external_fns
+
+
+def _entry_point(contract, computation):
+    # the calldata of a child computation is a view into the caller's
+    # memory and may have been overwritten since, so the function is found
+    # from the gas per source line instead of the selector (needs the
+    # profiling gas meter). The selector table touches the signature lines
+    # of other external functions too, so take the most expensive one.
+    gas = Counter()
+    profile = LineProfile.from_single(contract, computation).profile
+    for (_, line), datum in profile.items():
+        fn_name = get_fn_name_from_lineno(contract.ast_map, line)
+        if fn_name in _external_fns(contract):
+            gas[fn_name] += datum.gas_used
+    return gas.most_common(1)[0][0] if gas else "__default__"
+
+
+def child_calls(computation):
+    """
+    Counter of "Contract.function" for all calls made by computation
+    (recursively) into contracts known to boa. Needs a computation that ran
+    with the profiling gas meter.
+    """
+    calls = Counter()
+    for child in computation.children:
+        contract = boa.env.lookup_contract(child.msg.code_address)
+        if contract is not None:
+            fn_name = _entry_point(contract, child)
+            calls[f"{contract_name(contract)}.{fn_name}"] += 1
+        calls.update(child_calls(child))
+    return calls
+
+
+class GasRecorder:
+    """
+    Records the gas of contract calls by name. Every recorded call is a
+    fresh transaction: storage and addresses accessed by earlier calls are
+    cold again.
+
+    With profile=True calls run with boa's profiling gas meter, and the
+    recorder also keeps a merged line profile (self.lines) and the calls
+    into other contracts (self.calls) per name.
+    """
+
+    def __init__(self, profile=False):
+        self.profile = profile
+        self.samples = defaultdict(list)
+        self.lines = defaultdict(LineProfile)
+        self.calls = defaultdict(Counter)
+
+    def call(self, name, fn, *args, **kwargs):
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(cold_access())
+            if self.profile:
+                stack.enter_context(boa.env.gas_meter_class(ProfilingGasMeter))
+            result = fn(*args, **kwargs)
+
+        computation = fn.contract._computation
+        self.samples[name].append(tx_gas(computation))
+        if self.profile:
+            self.lines[name].merge(fn.contract.line_profile(computation))
+            self.calls[name].update(child_calls(computation))
+        return result
+
+    def hotspots(self, name, limit=3):
+        """
+        The limit most expensive source lines of the calls recorded as name:
+        (contract, function, line number, source, share of the gas).
+        Gas of a line excludes calls it makes into other contracts.
+        """
+        # boa's Datum.gas_used already excludes child calls, net_tot_gas
+        # would subtract them twice:
+        profile = self.lines[name].profile
+        total = sum(datum.net_gas for datum in profile.values())
+        ranked = sorted(profile.items(), key=lambda item: -item[1].net_gas)
+        out = []
+        for (contract, line), datum in ranked[:limit]:
+            fn_name, source = line_info(contract, line)
+            out.append(
+                (
+                    contract_name(contract),
+                    fn_name,
+                    line,
+                    source,
+                    datum.net_gas / total,
+                )
+            )
+        return out
+
+    def folded_stacks(self, name):
+        """
+        The line profile of name in the folded stack format of flamegraph
+        tools ("frame;frame;frame gas" per line). Frames are the recorded
+        name, the contract function and the source line: boa does not keep
+        the internal call stack, so internal functions are siblings.
+        """
+        out = []
+        for (contract, line), datum in self.lines[name].profile.items():
+            if datum.net_gas <= 0:
+                continue
+            fn_name, source = line_info(contract, line)
+            frame = contract_name(contract)
+            if fn_name:
+                frame += f".{fn_name}"
+            frames = [name, frame, f"{line}: {source}"]
+            out.append(
+                ";".join(f.replace(";", ",") for f in frames)
+                + f" {datum.net_gas}"
+            )
+        return out
+
+    def summary(self):
+        return {
+            name: {
+                "n": len(gas),
+                "min": min(gas),
+                "p50": percentile(gas, 50),
+                "p95": percentile(gas, 95),
+                "max": max(gas),
+            }
+            for name, gas in sorted(self.samples.items())
+        }
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def write_baseline(path, summary):
+    with open(path, "w") as f:
+        json.dump(summary, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(summary, baseline, threshold, stats=("p50", "p95")):
+    """
+    Regressions of summary against baseline: a list of messages for every
+    stat that grew by more than threshold (relative), or has no baseline.
+    """
+    regressions = []
+    for name, current in summary.items():
+        if name not in baseline:
+            regressions.append(f"{name}: no baseline")
+            continue
+        for stat in stats:
+            old, new = baseline[name][stat], current[stat]
+            if new > old * (1 + threshold):
+                regressions.append(
+                    f"{name} {stat}: {old} -> {new} "
+                    f"(+{100 * (new - old) / old:.2f}%)"
+                )
+    return regressions
+
+
+def markdown_comparison(recorders, calls_filter="Math", hotspots=3):
+    """
+    Markdown report comparing GasRecorders that ran the same operations,
+    e.g. {"legacy": ..., "tricrypto-ng": ...}. The first recorder is the
+    reference for the deltas. Needs profiling recorders for the call counts
+    (of contracts with calls_filter in their name) and line hotspots.
+    """
+    labels = list(recorders)
+    summaries = {label: r.summary() for label, r in recorders.items()}
+    names = [
+        name
+        for name in summaries[labels[0]]
+        if all(name in summary for summary in summaries.values())
+    ]
+
+    out = ["## Gas per operation", ""]
+    header = ["operation"]
+    for label in labels:
+        header += [f"{label} p50", f"{label} p95"]
+    for label in labels[1:]:
+        header += [f"{label} vs {labels[0]} (p50)"]
+    out += [_row(header), _row(["---"] * len(header))]
+    for name in names:
+        row = [name]
+        for label in labels:
+            row += [
+                summaries[label][name]["p50"],
+                summaries[label][name]["p95"],
+            ]
+        old = summaries[labels[0]][name]["p50"]
+        for label in labels[1:]:
+            new = summaries[label][name]["p50"]
+            row += [f"{new - old:+d} ({100 * (new - old) / old:+.1f}%)"]
+        out.append(_row(row))
+
+    out += ["", f"## {calls_filter} calls per operation", ""]
+    out += [_row(["operation"] + labels), _row(["---"] * (len(labels) + 1))]
+    for name in names:
+        row = [name]
+        for label in labels:
+            recorder = recorders[label]
+            n = len(recorder.samples[name])
+            row.append(
+                ", ".join(
+                    f"{call} x{count / n:.2f}"
+                    for call, count in sorted(recorder.calls[name].items())
+                    if calls_filter in call
+                )
+                or "-"
+            )
+        out.append(_row(row))
+
+    out += ["", "## Line hotspots", ""]
+    header = ["operation", "pool", "contract", "function", "line", "share"]
+    out += [_row(header), _row(["---"] * len(header))]
+    for name in names:
+        for label in labels:
+            hot = recorders[label].hotspots(name, hotspots)
+            for contract, fn_name, line, source, share in hot:
+                cells = [name, label, contract, fn_name]
+                cells += [f"{line}: `{source}`", f"{100 * share:.1f}%"]
+                out.append(_row(cells))
+
+    return "\n".join(out) + "\n"
+
+
+def _row(cells):
+    return "| " + " | ".join(str(c).replace("|", "\\|") for c in cells) + " |"
@@ -0,0 +1,859 @@
+# Pure python port of contracts/main/CurveCryptoMathOptimized3.vy
+#
+# Every expression mirrors the contract line by line: `unsafe_*` builtins
+# wrap around modulo 2**256 (two's complement for int256), while checked
+# arithmetic raises ValueError wherever the EVM would revert. This makes the
+# module a drop-in, bit-exact replacement for calls to the deployed math
+# contract in off-chain tooling (routing, backtests, simulations).
+
+from contextlib import contextmanager
+from math import isqrt
+
+N_COINS = 3
+A_MULTIPLIER = 10000
+
+MIN_GAMMA = 10**10
+MAX_GAMMA = 5 * 10**16
+
+MIN_A = N_COINS**N_COINS * A_MULTIPLIER // 100
+MAX_A = N_COINS**N_COINS * A_MULTIPLIER * 1000
+
+MAX_UINT256 = 2**256 - 1
+MAX_INT256 = 2**255 - 1
+MIN_INT256 = -(2**255)
+
+# 115792089237316195423570985008687907853269 == floor(MAX_UINT256 / 10**36)
+CBRT_LIMIT = 115792089237316195423570985008687907853269
+
+version = "v2.0.0"
+
+# Records of the newton solvers while a trace() block is active:
+_telemetry = None
+
+
+# ------------------------------ Telemetry -----------------------------------
+
+
+@contextmanager
+def trace():
+    """
+    Record the convergence of every newton_D and _newton_y call (including
+    reverting ones) made inside the block. Yields a list of records:
+    {"fn", "iterations", "residual", "converged"} per newton_D / _newton_y
+    solve, residual being the last newton step, and {"fn": "get_y",
+    "fallback"} per get_y, fallback meaning that get_y skipped the
+    analytical solution for _newton_y. Results are not affected.
+    """
+    global _telemetry
+    previous, _telemetry = _telemetry, []
+    try:
+        yield _telemetry
+    finally:
+        _telemetry = previous
+
+
+def _record(fn, **data):
+    if _telemetry is not None:
+        _telemetry.append({"fn": fn, **data})
+
+
+# --------------------------- EVM arithmetic ---------------------------------
+
+
+def _revert(reason="revert"):
+    raise ValueError(reason)
+
+
+def _u(x):
+    # checked uint256
+    if x < 0 or x > MAX_UINT256:
+        _revert("uint256 overflow")
+    return x
+
+
+def _i(x):
+    # checked int256
+    if x < MIN_INT256 or x > MAX_INT256:
+        _revert("int256 overflow")
+    return x
+
+
+def _wrap_u(x):
+    return x % 2**256
+
+
+def _wrap_i(x):
+    x %= 2**256
+    return x - 2**256 if x > MAX_INT256 else x
+
+
+def _div_u(x, y):
+    # checked uint256 division
+    if y == 0:
+        _revert("division by zero")
+    return x // y
+
+
+def _unsafe_div_u(x, y):
+    # DIV: division by zero yields zero
+    return x // y if y != 0 else 0
+
+
+def _sdiv(x, y):
+    # SDIV: truncates towards zero, division by zero yields zero
+    if y == 0:
+        return 0
+    q = abs(x) // abs(y)
+    return _wrap_i(q if (x < 0) == (y < 0) else -q)
+
+
+def _div_i(x, y):
+    # checked int256 division
+    if y == 0 or (x == MIN_INT256 and y == -1):
+        _revert("division by zero")
+    return _sdiv(x, y)
+
+
+def _abs(x):
+    if x == MIN_INT256:
+        _revert("int256 overflow")
+    return abs(x)
+
+
+def _to_int(x):
+    # convert(uint256, int256)
+    if x > MAX_INT256:
+        _revert("int256 conversion")
+    return x
+
+
+def _to_uint(x):
+    # convert(int256, uint256)
+    if x < 0:
+        _revert("uint256 conversion")
+    return x
+
+
+# ------------------------ AMM math functions --------------------------------
+
+
+def get_y(_ANN, _gamma, x, _D, i):
+    """
+    Calculate x[i] given other balances x[0..N_COINS-1] and invariant D.
+    Returns [y, K0]; K0 is zero if the analytical solution was skipped in
+    favour of `_newton_y`.
+    """
+
+    # Safety checks
+    if not (_ANN > MIN_A - 1 and _ANN < MAX_A + 1):
+        _revert("unsafe values A")
+    if not (_gamma > MIN_GAMMA - 1 and _gamma < MAX_GAMMA + 1):
+        _revert("unsafe values gamma")
+    if not (_D > 10**17 - 1 and _D < 10**15 * 10**18 + 1):
+        _revert("unsafe values D")
+
+    for k in range(3):
+        if k != i:
+            frac = _div_u(_u(x[k] * 10**18), _D)
+            if not (frac > 10**16 - 1 and frac < 10**20 + 1):
+                _revert("Unsafe values x[i]")
+
+    j, k = [(1, 2), (0, 2), (0, 1)][i]
+
+    ANN = _to_int(_ANN)
+    gamma = _to_int(_gamma)
+    D = _to_int(_D)
+    x_j = _to_int(x[j])
+    x_k = _to_int(x[k])
+    gamma2 = _wrap_i(gamma * gamma)
+
+    a = 10**36 // 27
+
+    # 10**36/9 + 2*10**18*gamma/27
+    #     - D**2/x_j*gamma**2*ANN/27**2/A_MULTIPLIER/x_k
+    b = _i(
+        _wrap_i(10**36 // 9 + _sdiv(_wrap_i(2 * 10**18 * gamma), 27))
+        - _sdiv(
+            _sdiv(
+                _sdiv(
+                    _i(_wrap_i(_sdiv(_wrap_i(D * D), x_j) * gamma2) * ANN),
+                    27**2,
+                ),
+                A_MULTIPLIER,
+            ),
+            x_k,
+        )
+    )
+
+    # 10**36/9 + gamma*(gamma + 4*10**18)/27
+    #     + gamma**2*(x_j+x_k-D)/D*ANN/27/A_MULTIPLIER
+    c = _i(
+        _wrap_i(
+            10**36 // 9
+            + _sdiv(_wrap_i(gamma * _wrap_i(gamma + 4 * 10**18)), 27)
+        )
+        + _sdiv(
+            _sdiv(
+                _wrap_i(
+                    _sdiv(_i(gamma2 * _wrap_i(_wrap_i(x_j + x_k) - D)), D)
+                    * ANN
+                ),
+                27,
+            ),
+            A_MULTIPLIER,
+        )
+    )
+
+    # (10**18 + gamma)**2/27
+    d = _sdiv(_i(_wrap_i(10**18 + gamma) ** 2), 27)
+
+    # abs(3*a*c/b - b)
+    d0 = _abs(_i(_div_i(_i(_wrap_i(3 * a) * c), b) - b))
+
+    if d0 > 10**48:
+        divider = 10**30
+    elif d0 > 10**44:
+        divider = 10**26
+    elif d0 > 10**40:
+        divider = 10**22
+    elif d0 > 10**36:
+        divider = 10**18
+    elif d0 > 10**32:
+        divider = 10**14
+    elif d0 > 10**28:
+        divider = 10**10
+    elif d0 > 10**24:
+        divider = 10**6
+    elif d0 > 10**20:
+        divider = 10**2
+    else:
+        divider = 1
+
+    if _abs(a) > _abs(b):
+        additional_prec = _abs(_sdiv(a, b))
+        a = _sdiv(_wrap_i(a * additional_prec), divider)
+        b = _sdiv(_i(b * additional_prec), divider)
+        c = _sdiv(_i(c * additional_prec), divider)
+        d = _sdiv(_i(d * additional_prec), divider)
+    else:
+        additional_prec = _abs(_sdiv(b, a))
+        a = _sdiv(_div_i(a, additional_prec), divider)
+        b = _sdiv(_sdiv(b, additional_prec), divider)
+        c = _sdiv(_sdiv(c, additional_prec), divider)
+        d = _sdiv(_sdiv(d, additional_prec), divider)
+
+    # 3*a*c/b - b
+    _3ac = _i(_wrap_i(3 * a) * c)
+    delta0 = _i(_sdiv(_3ac, b) - b)
+
+    # 9*a*c/b - 2*b - 27*a**2/b*d/b
+    delta1 = _i(
+        _i(_sdiv(_i(3 * _3ac), b) - _wrap_i(2 * b))
+        - _sdiv(_i(_sdiv(_i(27 * _i(a**2)), b) * d), b)
+    )
+
+    # delta1**2 + 4*delta0**2/b*delta0
+    sqrt_arg = _i(
+        _i(delta1**2) + _i(_sdiv(_i(4 * _i(delta0**2)), b) * delta0)
+    )
+
+    if sqrt_arg > 0:
+        sqrt_val = _to_int(isqrt(_to_uint(sqrt_arg)))
+    else:
+        _record("get_y", fallback=True)
+        return [_newton_y(_ANN, _gamma, x, _D, i), 0]
+    _record("get_y", fallback=False)
+
+    if b >= 0:
+        b_cbrt = _to_int(_cbrt(_to_uint(b)))
+    else:
+        b_cbrt = -_to_int(_cbrt(_to_uint(_i(-b))))
+
+    if delta1 > 0:
+        second_cbrt = _to_int(
+            _cbrt(_unsafe_div_u(_to_uint(_i(delta1 + sqrt_val)), 2))
+        )
+    else:
+        second_cbrt = -_to_int(
+            _cbrt(_unsafe_div_u(_to_uint(_i(-_i(delta1 - sqrt_val))), 2))
+        )
+
+    # b_cbrt*b_cbrt/10**18*second_cbrt/10**18
+    C1 = _sdiv(
+        _i(_sdiv(_i(b_cbrt * b_cbrt), 10**18) * second_cbrt), 10**18
+    )
+
+    # (b + b*delta0/C1 - C1)/3
+    root_K0 = _sdiv(_i(_i(b + _div_i(_i(b * delta0), C1)) - C1), 3)
+
+    # D*D/27/x_k*D/x_j*root_K0/a
+    root = _sdiv(
+        _i(_sdiv(_i(_sdiv(_sdiv(_i(D * D), 27), x_k) * D), x_j) * root_K0),
+        a,
+    )
+
+    out = [
+        _to_uint(root),
+        _to_uint(_sdiv(_i(10**18 * root_K0), a)),
+    ]
+
+    frac = _unsafe_div_u(_u(out[0] * 10**18), _D)
+    if not (frac >= 10**16 - 1 and frac < 10**20 + 1):
+        _revert("Unsafe value for y")
+    # due to precision issues, get_y can be off by 2 wei or so wrt _newton_y
+
+    return out
+
+
+def _newton_y(ANN, gamma, x, D, i):
+
+    # Calculate x[i] given A, gamma, xp and D using newton's method.
+    # Only checked arithmetic is used in the contract, so the python
+    # operators are guarded with _u() where results could overflow.
+
+    for k in range(3):
+        if k != i:
+            frac = _div_u(_u(x[k] * 10**18), D)
+            if not (frac > 10**16 - 1 and frac < 10**20 + 1):
+                _revert("Unsafe values x[i]")
+
+    y = D // N_COINS
+    K0_i = 10**18
+    S_i = 0
+
+    x_sorted = list(x)
+    x_sorted[i] = 0
+    x_sorted = _sort(x_sorted)  # From high to low
+
+    convergence_limit = max(max(x_sorted[0] // 10**14, D // 10**14), 100)
+
+    for j in range(2, N_COINS + 1):
+        _x = x_sorted[N_COINS - j]
+        y = _div_u(_u(y * D), _u(_x * N_COINS))  # Small _x first
+        S_i = _u(S_i + _x)
+
+    for j in range(N_COINS - 1):
+        K0_i = _div_u(
+            _u(_u(K0_i * x_sorted[j]) * N_COINS), D
+        )  # Large _x first
+
+    diff = None
+    for j in range(255):
+        y_prev = y
+
+        K0 = _div_u(_u(_u(K0_i * y) * N_COINS), D)
+        S = _u(S_i + y)
+
+        _g1k0 = _u(gamma + 10**18)
+        if _g1k0 > K0:
+            _g1k0 = _g1k0 - K0 + 1
+        else:
+            _g1k0 = _u(K0 - _g1k0 + 1)
+
+        # mul1 = 10**18 * D / gamma * _g1k0 / gamma * _g1k0 * A_MUL / ANN
+        mul1 = _div_u(
+            _u(
+                _u(
+                    _div_u(_u(_div_u(_u(10**18 * D), gamma) * _g1k0), gamma)
+                    * _g1k0
+                )
+                * A_MULTIPLIER
+            ),
+            ANN,
+        )
+
+        # 2*K0 / _g1k0
+        mul2 = _u(10**18 + _div_u(_u(2 * 10**18 * K0), _g1k0))
+
+        yfprime = _u(_u(_u(10**18 * y) + _u(S * mul2)) + mul1)
+        _dyfprime = _u(D * mul2)
+        if yfprime < _dyfprime:
+            y = y_prev // 2
+            continue
+        else:
+            yfprime -= _dyfprime
+
+        fprime = _div_u(yfprime, y)
+
+        # y -= f / f_prime;  y = (y * fprime - f) / fprime
+        y_minus = _div_u(mul1, fprime)
+        y_plus = _u(
+            _div_u(_u(yfprime + _u(10**18 * D)), fprime)
+            + _div_u(_u(y_minus * 10**18), K0)
+        )
+        y_minus = _u(y_minus + _div_u(_u(10**18 * S), fprime))
+
+        if y_plus < y_minus:
+            y = y_prev // 2
+        else:
+            y = y_plus - y_minus
+
+        diff = abs(y - y_prev)
+
+        if diff < max(convergence_limit, y // 10**14):
+            _record(
+                "_newton_y", iterations=j + 1, residual=diff, converged=True
+            )
+            frac = _div_u(_u(y * 10**18), D)
+            if not (frac > 10**16 - 1 and frac < 10**20 + 1):
+                _revert("Unsafe value for y")
+            return y
+
+    _record("_newton_y", iterations=255, residual=diff, converged=False)
+    _revert("Did not converge")
+
+
+def newton_D(ANN, gamma, x_unsorted, K0_prev=0):
+    """
+    Finding the invariant via newtons method using good initial guesses.
+    ANN is A * N**N and higher by the factor A_MULTIPLIER. K0_prev is the
+    apriori for newton's method derived from get_y (0 for no apriori).
+    """
+    x = _sort(x_unsorted)
+    if not x[0] < MAX_UINT256 // 10**18 * N_COINS**N_COINS:
+        _revert("out of limits")
+    if not x[0] > 0:
+        _revert("empty pool")
+
+    S = _wrap_u(x[0] + x[1] + x[2])
+
+    if K0_prev == 0:
+        D = _wrap_u(N_COINS * _geometric_mean(x))
+    else:
+        if S > 10**36:
+            D = _cbrt(
+                _u(
+                    _u(
+                        _unsafe_div_u(
+                            _u(
+                                _unsafe_div_u(_u(x[0] * x[1]), 10**36) * x[2]
+                            ),
+                            K0_prev,
+                        )
+                        * 27
+                    )
+                    * 10**12
+                )
+            )
+        elif S > 10**24:
+            D = _cbrt(
+                _u(
+                    _u(
+                        _unsafe_div_u(
+                            _u(
+                                _unsafe_div_u(_u(x[0] * x[1]), 10**24) * x[2]
+                            ),
+                            K0_prev,
+                        )
+                        * 27
+                    )
+                    * 10**6
+                )
+            )
+        else:
+            D = _cbrt(
+                _u(
+                    _unsafe_div_u(
+                        _u(_unsafe_div_u(_u(x[0] * x[1]), 10**18) * x[2]),
+                        K0_prev,
+                    )
+                    * 27
+                )
+            )
+
+    for i in range(255):
+
+        D_prev = D
+
+        # K0 = 10**18 * x[0] * N / D * x[1] * N / D * x[2] * N / D
+        K0 = _unsafe_div_u(
+            _wrap_u(
+                _wrap_u(
+                    _unsafe_div_u(
+                        _wrap_u(
+                            _wrap_u(
+                                _unsafe_div_u(
+                                    _wrap_u(
+                                        _wrap_u(10**18 * x[0]) * N_COINS
+                                    ),
+                                    D,
+                                )
+                                * x[1]
+                            )
+                            * N_COINS
+                        ),
+                        D,
+                    )
+                    * x[2]
+                )
+                * N_COINS
+            ),
+            D,
+        )
+
+        _g1k0 = _wrap_u(gamma + 10**18)
+
+        if _g1k0 > K0:
+            _g1k0 = _wrap_u(_g1k0 - K0 + 1)
+        else:
+            _g1k0 = _wrap_u(K0 - _g1k0 + 1)
+
+        # mul1 = 10**18 * D / gamma * _g1k0 / gamma * _g1k0 * A_MUL / ANN
+        mul1 = _unsafe_div_u(
+            _wrap_u(
+                _wrap_u(
+                    _unsafe_div_u(
+                        _wrap_u(
+                            _unsafe_div_u(_wrap_u(10**18 * D), gamma) * _g1k0
+                        ),
+                        gamma,
+                    )
+                    * _g1k0
+                )
+                * A_MULTIPLIER
+            ),
+            ANN,
+        )
+
+        # mul2 = (2 * 10**18) * N_COINS * K0 / _g1k0
+        mul2 = _unsafe_div_u(_wrap_u(2 * 10**18 * N_COINS * K0), _g1k0)
+
+        # neg_fprime = (S + S * mul2 / 10**18) + mul1 * N_COINS / K0
+        #     - mul2 * D / 10**18
+        neg_fprime = _wrap_u(
+            _wrap_u(
+                _wrap_u(S + _unsafe_div_u(_wrap_u(S * mul2), 10**18))
+                + _unsafe_div_u(_wrap_u(mul1 * N_COINS), K0)
+            )
+            - _unsafe_div_u(_wrap_u(mul2 * D), 10**18)
+        )
+
+        # D * (neg_fprime + S) / neg_fprime
+        D_plus = _unsafe_div_u(_u(D * _wrap_u(neg_fprime + S)), neg_fprime)
+
+        # D*D / neg_fprime
+        D_minus = _unsafe_div_u(_u(D * D), neg_fprime)
+
+        if 10**18 > K0:
+            # D_minus += D * (mul1 / neg_fprime) / 10**18 * (10**18 - K0) / K0
+            D_minus = _u(
+                D_minus
+                + _unsafe_div_u(
+                    _wrap_u(
+                        _unsafe_div_u(
+                            _u(D * _unsafe_div_u(mul1, neg_fprime)), 10**18
+                        )
+                        * (10**18 - K0)
+                    ),
+                    K0,
+                )
+            )
+        else:
+            # D_minus -= D * (mul1 / neg_fprime) / 10**18 * (K0 - 10**18) / K0
+            D_minus = _u(
+                D_minus
+                - _unsafe_div_u(
+                    _wrap_u(
+                        _unsafe_div_u(
+                            _u(D * _unsafe_div_u(mul1, neg_fprime)), 10**18
+                        )
+                        * (K0 - 10**18)
+                    ),
+                    K0,
+                )
+            )
+
+        if D_plus > D_minus:
+            D = D_plus - D_minus
+        else:
+            D = (D_minus - D_plus) // 2
+
+        diff = abs(D - D_prev)
+
+        if _wrap_u(diff * 10**14) < max(10**16, D):
+            _record(
+                "newton_D", iterations=i + 1, residual=diff, converged=True
+            )
+
+            # Test that we are safe with the next get_y
+            for _x in x:
+                frac = _unsafe_div_u(_wrap_u(_x * 10**18), D)
+                if not (frac >= 10**16 - 1 and frac < 10**20 + 1):
+                    _revert("Unsafe values x[i]")
+
+            return D
+
+    _record("newton_D", iterations=255, residual=diff, converged=False)
+    _revert("Did not converge")
+
+
+def get_p(_xp, _D, _A_gamma):
+    """
+    Calculates dx/dy. Output needs to be multiplied with price_scale to get
+    the actual value.
+    """
+
+    if not (_D > 10**17 - 1 and _D < 10**15 * 10**18 + 1):
+        _revert("unsafe D values")
+
+    # K0 = P * N**N / D**N, with 10**36 precision:
+    K0 = _unsafe_div_u(
+        _u(
+            _unsafe_div_u(
+                _u(_unsafe_div_u(_u(_u(27 * _xp[0]) * _xp[1]), _D) * _xp[2]),
+                _D,
+            )
+            * 10**36
+        ),
+        _D,
+    )
+
+    # GK0 is in 10**36 precision and is dimensionless.
+    GK0 = _u(
+        _u(
+            _unsafe_div_u(
+                _u(_unsafe_div_u(_u(_u(2 * K0) * K0), 10**36) * K0), 10**36
+            )
+            + _wrap_u(_wrap_u(_A_gamma[1] + 10**18) ** 2)
+        )
+        - _unsafe_div_u(
+            _u(
+                _unsafe_div_u(_wrap_u(K0**2), 10**36)
+                * _wrap_u(_wrap_u(2 * _A_gamma[1]) + 3 * 10**18)
+            ),
+            10**18,
+        )
+    )
+
+    # NNAG2 = N**N * A * gamma**2
+    NNAG2 = _unsafe_div_u(
+        _wrap_u(_A_gamma[0] * _wrap_u(_A_gamma[1] ** 2)), A_MULTIPLIER
+    )
+
+    # denominator = (GK0 + NNAG2 * x / D * _K0 / 10**36)
+    denominator = _u(
+        GK0
+        + _unsafe_div_u(
+            _u(_unsafe_div_u(_u(NNAG2 * _xp[0]), _D) * K0), 10**36
+        )
+    )
+
+    return [
+        _unsafe_div_u(
+            _u(
+                _div_u(
+                    _u(
+                        _xp[0]
+                        * _u(
+                            GK0
+                            + _unsafe_div_u(
+                                _u(_unsafe_div_u(_u(NNAG2 * _xp[k]), _D) * K0),
+                                10**36,
+                            )
+                        )
+                    ),
+                    _xp[k],
+                )
+                * 10**18
+            ),
+            denominator,
+        )
+        for k in (1, 2)
+    ]
+
+
+# --------------------------- Math Utils -------------------------------------
+
+
+def cbrt(x):
+    """Calculate the cubic root of a number in 1e18 precision."""
+    return _cbrt(x)
+
+
+def geometric_mean(_x):
+    """Calculate the geometric mean of 3 numbers in 1e18 precision."""
+    return _geometric_mean(_x)
+
+
+def reduction_coefficient(x, fee_gamma):
+    """Calculates the reduction coefficient for the given x and fee_gamma."""
+    return _reduction_coefficient(x, fee_gamma)
+
+
+def wad_exp(_power):
+    """Calculates e**x with 1e18 precision."""
+    return _snekmate_wad_exp(_power)
+
+
+def _reduction_coefficient(x, fee_gamma):
+
+    # fee_gamma / (fee_gamma + (1 - K))
+    # where
+    # K = prod(x) / (sum(x) / N)**N
+    # (all normalized to 1e18)
+
+    S = _u(_u(x[0] + x[1]) + x[2])
+
+    K = _div_u(_u(_u(10**18 * N_COINS) * x[0]), S)
+    K = _unsafe_div_u(_u(_u(K * N_COINS) * x[1]), S)
+    K = _unsafe_div_u(_u(_u(K * N_COINS) * x[2]), S)
+
+    if fee_gamma > 0:
+        K = _div_u(_u(fee_gamma * 10**18), _u(_u(fee_gamma + 10**18) - K))
+
+    return K
+
+
+def _snekmate_wad_exp(x):
+
+    # If the result is `< 0.5`, we return zero.
+    if x <= -42139678854452767551:
+        return 0
+
+    # When the result is "> (2 ** 255 - 1) / 1e18" we cannot represent it
+    # as a signed integer.
+    if not x < 135305999368893231589:
+        _revert("wad_exp overflow")
+
+    # Convert to "(-42, 136) * 2 ** 96" for higher intermediate precision.
+    value = _sdiv(_wrap_i(x << 78), 5**18)
+
+    # Reduce the range of `x` to "(-½ ln 2, ½ ln 2) * 2 ** 96".
+    k = (
+        _wrap_i(
+            _sdiv(_wrap_i(value << 96), 54916777467707473351141471128)
+            + 2**95
+        )
+        >> 96
+    )
+    value = _wrap_i(value - _wrap_i(k * 54916777467707473351141471128))
+
+    # Evaluate using a "(6, 7)"-term rational approximation.
+    y = _wrap_i(
+        (
+            _wrap_i(_wrap_i(value + 1346386616545796478920950773328) * value)
+            >> 96
+        )
+        + 57155421227552351082224309758442
+    )
+    p = _wrap_i(
+        _wrap_i(
+            _wrap_i(
+                (
+                    _wrap_i(
+                        _wrap_i(
+                            _wrap_i(y + value)
+                            - 94201549194550492254356042504812
+                        )
+                        * y
+                    )
+                    >> 96
+                )
+                + 28719021644029726153956944680412240
+            )
+            * value
+        )
+        + (4385272521454847904659076985693276 << 96)
+    )
+
+    q = _wrap_i(
+        (
+            _wrap_i(_wrap_i(value - 2855989394907223263936484059900) * value)
+            >> 96
+        )
+        + 50020603652535783019961831881945
+    )
+    q = _wrap_i((_wrap_i(q * value) >> 96) - 533845033583426703283633433725380)
+    q = _wrap_i(
+        (_wrap_i(q * value) >> 96) + 3604857256930695427073651918091429
+    )
+    q = _wrap_i(
+        (_wrap_i(q * value) >> 96) - 14423608567350463180887372962807573
+    )
+    q = _wrap_i(
+        (_wrap_i(q * value) >> 96) + 26449188498355588339934803723976023
+    )
+
+    r = _sdiv(p, q)
+
+    # r is reinterpreted as uint256 (two's complement) before scaling.
+    return _wrap_u(
+        _wrap_u(r) * 3822833074963236453042738258902158003155416615667
+    ) >> _to_uint(_wrap_i(195 - k))
+
+
+def _snekmate_log_2(x, roundup):
+
+    # Returns the log in base 2 of `x`, following the selected rounding
+    # direction. Returns 0 if given 0.
+    result = max(x.bit_length() - 1, 0)
+
+    if roundup and (1 << result) < x:
+        result += 1
+
+    return result
+
+
+def _cbrt(x):
+
+    if x >= CBRT_LIMIT * 10**18:
+        xx = x
+    elif x >= CBRT_LIMIT:
+        xx = _wrap_u(x * 10**18)
+    else:
+        xx = _wrap_u(x * 10**36)
+
+    log2x = _snekmate_log_2(xx, False)
+
+    # initial_guess = 2 ** pow * 1260 ** remainder // 1000 ** remainder
+    remainder = log2x % 3
+    a = _unsafe_div_u(
+        _wrap_u(pow(2, log2x // 3, 2**256) * pow(1260, remainder, 2**256)),
+        pow(1000, remainder, 2**256),
+    )
+
+    # 7 unrolled newton raphson iterations:
+    for _ in range(7):
+        a = _wrap_u(2 * a + _unsafe_div_u(xx, _wrap_u(a * a))) // 3
+
+    if x >= CBRT_LIMIT * 10**18:
+        a = _wrap_u(a * 10**12)
+    elif x >= CBRT_LIMIT:
+        a = _wrap_u(a * 10**6)
+
+    return a
+
+
+def _sort(unsorted_x):
+
+    # Sorts a three-array number in a descending order:
+
+    x = list(unsorted_x)
+    temp_var = x[0]
+    if x[0] < x[1]:
+        x[0] = x[1]
+        x[1] = temp_var
+    if x[0] < x[2]:
+        temp_var = x[0]
+        x[0] = x[2]
+        x[2] = temp_var
+    if x[1] < x[2]:
+        temp_var = x[1]
+        x[1] = x[2]
+        x[2] = temp_var
+
+    return x
+
+
+def _geometric_mean(_x):
+
+    # calculates a geometric mean for three numbers.
+
+    prod = _unsafe_div_u(
+        _u(_unsafe_div_u(_u(_x[0] * _x[1]), 10**18) * _x[2]), 10**18
+    )
+
+    if prod == 0:
+        return 0
+
+    return _cbrt(prod)
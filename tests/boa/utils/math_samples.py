@@ -0,0 +1,201 @@
+import json
+import random
+
+from tests.boa.utils import math_optimized as math
+
+# snekmate wad_exp returns 0 at or below WAD_EXP_MIN and reverts at or above
+# WAD_EXP_MAX:
+WAD_EXP_MIN = -42139678854452767551
+WAD_EXP_MAX = 135305999368893231589
+
+STATE_STRATEGIES = [
+    "typical",
+    "low_A",
+    "high_A",
+    "small_gamma",
+    "large_gamma",
+    "skewed",
+    "very_skewed",
+    "full_range",
+]
+
+
+def _weights(rng, skew):
+    # shares of D per coin, one coin holding skew of the pool value
+    weights = [rng.uniform(0.3, 0.36) for _ in range(3)]
+    if skew is not None:
+        weights[rng.randint(0, 2)] = skew
+    total = sum(weights)
+    return [w / total for w in weights]
+
+
+def sample_state(rng=random):
+    """
+    A pool state {"A", "gamma", "xp", "D"} from an opinionated mix of
+    parameter and balance regimes, in the spirit of the cbrt profiler's
+    opinionated_data_sampler. States the math rejects are resampled.
+    """
+    while True:
+
+        A = 135 * 3**3 * 10000
+        gamma = int(7e-5 * 1e18)
+        value = int(10 ** rng.uniform(21, 30))  # <- 1e3 to 1e12 USD
+        skew = None
+
+        match rng.choice(STATE_STRATEGIES):
+
+            case "typical":
+                pass
+
+            case "low_A":
+                A = rng.randint(math.MIN_A, 10 * 3**3 * 10000)
+
+            case "high_A":
+                A = rng.randint(1000 * 3**3 * 10000, math.MAX_A)
+
+            case "small_gamma":
+                gamma = rng.randint(math.MIN_GAMMA, 10**14)
+
+            case "large_gamma":
+                gamma = rng.randint(10**16, math.MAX_GAMMA)
+
+            case "skewed":
+                skew = rng.uniform(0.05, 0.2)
+
+            case "very_skewed":
+                skew = rng.uniform(0.001, 0.05)
+
+            case "full_range":
+                A = rng.randint(math.MIN_A, math.MAX_A)
+                gamma = rng.randint(math.MIN_GAMMA, math.MAX_GAMMA)
+                value = int(10 ** rng.uniform(18, 33))
+                skew = rng.uniform(0.001, 0.33)
+
+        xp = [int(value * w) for w in _weights(rng, skew)]
+        try:
+            D = math.newton_D(A, gamma, xp)
+        except ValueError:
+            continue
+        return {"A": A, "gamma": gamma, "xp": xp, "D": D}
+
+
+def sample_wad_exp(rng=random):
+
+    match rng.choice(["price_oracle", "small", "full_range"]):
+
+        case "price_oracle":
+            # -dt / ma_time as in tweak_price, ma_time = 866 (600 / ln(2))
+            return -rng.randint(1, 86400) * 10**18 // 866
+
+        case "small":
+            return rng.randint(-(10**18), 10**18)
+
+        case "full_range":
+            return rng.randint(WAD_EXP_MIN, WAD_EXP_MAX - 1)
+
+
+def sample_cbrt(rng=random):
+
+    match rng.choice(
+        [
+            "full_range",
+            "binary_exponent",
+            "perfect_cubes",
+            "small_numbers",
+            "medium_numbers",
+            "large_numbers",
+            "post_overflow",
+        ]
+    ):
+
+        case "full_range":
+            return rng.randint(0, math.MAX_UINT256)
+
+        case "binary_exponent":
+            return 2 ** rng.randint(0, 255)
+
+        case "perfect_cubes":
+            return rng.randint(0, 10**25) ** 3
+
+        case "small_numbers":
+            return rng.randint(0, 10**10)
+
+        case "medium_numbers":
+            return rng.randint(10**10, 10**30)
+
+        case "large_numbers":
+            return rng.randint(10**30, 10**59)
+
+        case "post_overflow":
+            return rng.randint(math.CBRT_LIMIT, math.MAX_UINT256)
+
+
+def math_args(fn_name, state, rng=random):
+    """
+    Arguments of the math contract's fn_name for a pool state: get_y trades
+    0.1% to 5% of coin i for coin j. wad_exp and cbrt do not depend on the
+    state and use their own samplers.
+    """
+    A, gamma, xp, D = state["A"], state["gamma"], state["xp"], state["D"]
+
+    match fn_name:
+
+        case "newton_D":
+            return (A, gamma, xp, 0)
+
+        case "get_y":
+            i, j = rng.sample(range(3), 2)
+            xp = xp[:]
+            xp[i] += int(xp[i] * rng.uniform(1e-3, 5e-2))
+            return (A, gamma, xp, D, j)
+
+        case "get_p":
+            return (xp, D, [A, gamma])
+
+        case "wad_exp":
+            return (sample_wad_exp(rng),)
+
+        case "cbrt":
+            return (sample_cbrt(rng),)
+
+    raise ValueError(f"no sampler for {fn_name}")
+
+
+def curve_state(curve):
+    # state of a simulation_int_many.Curve
+    return {
+        "A": curve.A,
+        "gamma": curve.gamma,
+        "xp": curve.xp(),
+        "D": curve.D(),
+    }
+
+
+def trader_states(trader, candles, every=1):
+    """
+    Pool states of a simulation_int_many.Trader after every `every` candles
+    of trader.simulate(candles), e.g. over real market data from
+    candles.load_pairs.
+    """
+    states = []
+
+    def _candles():
+        for k, candle in enumerate(candles):
+            yield candle
+            # the trader has finished trading against candle:
+            if k % every == 0:
+                states.append(curve_state(trader.curve))
+
+    trader.simulate(_candles())
+    return states
+
+
+def write_states(path, states):
+    with open(path, "w") as f:
+        for state in states:
+            f.write(json.dumps(state) + "\n")
+
+
+def load_states(path):
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,57 @@
+from boa.vyper.ast_utils import get_fn_name_from_lineno
+
+# Source lines executed exactly once per newton iteration:
+MARKERS = {"newton_D": "D_prev = D", "_newton_y": "y_prev = y"}
+
+
+def _marker_pcs(contract):
+    # solver -> first pc of its marker line
+    if not hasattr(contract, "_newton_markers"):
+        lines = contract.compiler_data.source_code.splitlines()
+        pc_pos_map = contract.source_map["pc_pos_map"]
+        markers = {}
+        for fn_name, marker in MARKERS.items():
+            (line,) = [
+                k + 1
+                for k, source in enumerate(lines)
+                if source.strip() == marker
+                and get_fn_name_from_lineno(contract.ast_map, k + 1) == fn_name
+            ]
+            markers[fn_name] = min(
+                pc
+                for pc, pos in pc_pos_map.items()
+                if pos is not None and pos[0] == line
+            )
+        contract._newton_markers = markers
+    return contract._newton_markers
+
+
+def iterations(contract, computation):
+    """
+    Newton iterations per solver executed by computation of the math
+    contract, counted from the executed program counters.
+    """
+    trace = computation.code._trace
+    return {
+        fn_name: trace.count(pc)
+        for fn_name, pc in _marker_pcs(contract).items()
+    }
+
+
+def trace_call(contract, fn_name, *args):
+    """
+    Call fn_name of the deployed CurveCryptoMathOptimized3 and return the
+    result with records in the format of math_optimized.trace(). The
+    residual of a solve does not leave the EVM, so only the iteration
+    counts and get_y fallbacks are recorded. Reverting calls raise.
+    """
+    result = getattr(contract, fn_name)(*args)
+    counts = iterations(contract, contract._computation)
+
+    records = []
+    if fn_name == "get_y":
+        records.append({"fn": "get_y", "fallback": counts["_newton_y"] > 0})
+    for solver, n in counts.items():
+        if n > 0:
+            records.append({"fn": solver, "iterations": n})
+    return result, records
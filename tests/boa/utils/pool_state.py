@@ -0,0 +1,157 @@
+# Decoder for the pool_state() view of
+# contracts/main/CurveTricryptoOptimizedWETH.vy
+#
+# pool_state() returns the raw storage of the pool in one call. decode()
+# unpacks it and derives what the pool's getters compute on the fly (ramped
+# A and gamma, the price and xcp oracles) bit for bit, with the math port.
+
+from tests.boa.utils import math_optimized as math
+
+N_COINS = 3
+PRICE_SIZE = 128  # <- 256 / (N_COINS - 1)
+PRICE_MASK = 2**PRICE_SIZE - 1
+
+# Members of the PoolState struct, in order:
+FIELDS = [
+    "balances",
+    "D",
+    "totalSupply",
+    "price_scale_packed",
+    "price_oracle_packed",
+    "last_prices_packed",
+    "last_prices_timestamp",
+    "packed_fee_params",
+    "packed_rebalancing_params",
+    "initial_A_gamma",
+    "initial_A_gamma_time",
+    "future_A_gamma",
+    "future_A_gamma_time",
+    "xcp_profit",
+    "xcp_profit_a",
+    "virtual_price",
+    "cached_xcp_oracle",
+    "last_xcp",
+    "xcp_ma_time",
+    "precisions",
+    "timestamp",
+]
+
+
+def unpack(packed):
+    # _unpack: 3 integers of 64 bits
+    return [
+        (packed >> 128) & 2**64 - 1,
+        (packed >> 64) & 2**64 - 1,
+        packed & 2**64 - 1,
+    ]
+
+
+def unpack_prices(packed_prices):
+    return [
+        (packed_prices >> (PRICE_SIZE * k)) & PRICE_MASK
+        for k in range(N_COINS - 1)
+    ]
+
+
+def unpack_A_gamma(A_gamma):
+    return A_gamma >> 128, A_gamma & 2**128 - 1
+
+
+def A_gamma(raw, timestamp):
+    # _A_gamma: linear ramp from initial_A_gamma to future_A_gamma
+    A1, gamma1 = unpack_A_gamma(raw["future_A_gamma"])
+    t1 = raw["future_A_gamma_time"]
+    if timestamp < t1:
+        A0, gamma0 = unpack_A_gamma(raw["initial_A_gamma"])
+        t0 = raw["initial_A_gamma_time"]
+        t1 -= t0
+        t0 = timestamp - t0
+        t2 = t1 - t0
+        A1 = (A0 * t2 + A1 * t0) // t1
+        gamma1 = (gamma0 * t2 + gamma1 * t0) // t1
+    return A1, gamma1
+
+
+def _alpha(dt, ma_time):
+    return math.wad_exp(-(dt * 10**18 // ma_time))
+
+
+def price_oracle(raw, timestamp):
+    # price_oracle(k): EMA of last_prices (capped at 2 * price_scale)
+    oracle = unpack_prices(raw["price_oracle_packed"])
+    last_timestamp = raw["last_prices_timestamp"]
+    if last_timestamp >= timestamp:
+        return oracle
+
+    ma_time = unpack(raw["packed_rebalancing_params"])[2]
+    alpha = _alpha(timestamp - last_timestamp, ma_time)
+    return [
+        (min(last, 2 * scale) * (10**18 - alpha) + p * alpha) // 10**18
+        for p, last, scale in zip(
+            oracle,
+            unpack_prices(raw["last_prices_packed"]),
+            unpack_prices(raw["price_scale_packed"]),
+        )
+    ]
+
+
+def xcp_oracle(raw, timestamp):
+    last_timestamp = raw["last_prices_timestamp"]
+    if last_timestamp >= timestamp:
+        return raw["cached_xcp_oracle"]
+
+    alpha = _alpha(timestamp - last_timestamp, raw["xcp_ma_time"])
+    return (
+        raw["last_xcp"] * (10**18 - alpha) + raw["cached_xcp_oracle"] * alpha
+    ) // 10**18
+
+
+def decode(values, timestamp=None):
+    """
+    Decode the return value of pool_state(). Time dependent values (A,
+    gamma, price_oracle, xcp_oracle) are computed at timestamp, by default
+    the block timestamp of the call, as the pool's getters would. ma_time
+    is in the pool's internal units (seconds / ln(2)).
+    """
+    raw = dict(zip(FIELDS, values))
+    timestamp = raw["timestamp"] if timestamp is None else timestamp
+
+    mid_fee, out_fee, fee_gamma = unpack(raw["packed_fee_params"])
+    allowed_extra_profit, adjustment_step, ma_time = unpack(
+        raw["packed_rebalancing_params"]
+    )
+    A, gamma = A_gamma(raw, timestamp)
+    initial_A, initial_gamma = unpack_A_gamma(raw["initial_A_gamma"])
+    future_A, future_gamma = unpack_A_gamma(raw["future_A_gamma"])
+
+    return {
+        "balances": list(raw["balances"]),
+        "D": raw["D"],
+        "token_supply": raw["totalSupply"],
+        "price_scale": unpack_prices(raw["price_scale_packed"]),
+        "price_oracle": price_oracle(raw, timestamp),
+        "last_prices": unpack_prices(raw["last_prices_packed"]),
+        "last_prices_timestamp": raw["last_prices_timestamp"],
+        "mid_fee": mid_fee,
+        "out_fee": out_fee,
+        "fee_gamma": fee_gamma,
+        "allowed_extra_profit": allowed_extra_profit,
+        "adjustment_step": adjustment_step,
+        "ma_time": ma_time,
+        "A": A,
+        "gamma": gamma,
+        "initial_A": initial_A,
+        "initial_gamma": initial_gamma,
+        "initial_A_gamma_time": raw["initial_A_gamma_time"],
+        "future_A": future_A,
+        "future_gamma": future_gamma,
+        "future_A_gamma_time": raw["future_A_gamma_time"],
+        "xcp_profit": raw["xcp_profit"],
+        "xcp_profit_a": raw["xcp_profit_a"],
+        "virtual_price": raw["virtual_price"],
+        "xcp_oracle": xcp_oracle(raw, timestamp),
+        "last_xcp": raw["last_xcp"],
+        "xcp_ma_time": raw["xcp_ma_time"],
+        "precisions": list(raw["precisions"]),
+        "timestamp": timestamp,
+    }
@@ -0,0 +1,259 @@
+# Pure python port of the quote views of
+# contracts/main/CurveCryptoViews3Optimized.vy
+#
+# The views contract reads a dozen pool getters and calls the math contract
+# for every quote. Here the pool is read once into a PoolState and every
+# quote is computed off-chain with the bit-exact math port, raising
+# ValueError wherever the views (or the pool's fee views) would revert.
+
+from dataclasses import dataclass
+from functools import cached_property
+
+import boa
+
+from tests.boa.utils import math_optimized as math
+from tests.boa.utils.math_optimized import _div_u, _revert, _u
+
+N_COINS = 3
+PRECISION = 10**18
+NOISE_FEE = 10**5
+
+
+@dataclass(frozen=True)
+class PoolState:
+    """
+    Everything the quote views read from a pool, at block timestamp. A and
+    gamma are the ramped values at timestamp, fee_params are the unpacked
+    [mid_fee, out_fee, fee_gamma]. Quotes are exact for that timestamp.
+    """
+
+    balances: list
+    price_scale: list
+    precisions: list
+    D: int
+    token_supply: int
+    A: int
+    gamma: int
+    fee_params: list
+    future_A_gamma_time: int
+    timestamp: int
+
+    @classmethod
+    def from_pool(cls, swap, timestamp=None):
+        # one getter call per field, as the views contract does:
+        return cls(
+            balances=[swap.balances(k) for k in range(N_COINS)],
+            price_scale=[swap.price_scale(k) for k in range(N_COINS - 1)],
+            precisions=list(swap.precisions()),
+            D=swap.D(),
+            token_supply=swap.totalSupply(),
+            A=swap.A(),
+            gamma=swap.gamma(),
+            fee_params=[swap.mid_fee(), swap.out_fee(), swap.fee_gamma()],
+            future_A_gamma_time=swap.future_A_gamma_time(),
+            timestamp=(
+                boa.env.vm.patch.timestamp if timestamp is None else timestamp
+            ),
+        )
+
+    @classmethod
+    def from_snapshot(cls, state):
+        # state: pool_state.decode() of the pool's single call pool_state()
+        return cls(
+            balances=state["balances"],
+            price_scale=state["price_scale"],
+            precisions=state["precisions"],
+            D=state["D"],
+            token_supply=state["token_supply"],
+            A=state["A"],
+            gamma=state["gamma"],
+            fee_params=[
+                state["mid_fee"],
+                state["out_fee"],
+                state["fee_gamma"],
+            ],
+            future_A_gamma_time=state["future_A_gamma_time"],
+            timestamp=state["timestamp"],
+        )
+
+    @property
+    def ramping(self):
+        return self.future_A_gamma_time > self.timestamp
+
+    @cached_property
+    def xp(self):
+        # balances in 1e18 precision at price_scale
+        return _scale(self.balances, self.price_scale, self.precisions)
+
+    @cached_property
+    def D_ramp(self):
+        # _calc_D_ramp: the stored D is stale while A and gamma ramp
+        if self.ramping:
+            return math.newton_D(self.A, self.gamma, self.xp, 0)
+        return self.D
+
+
+def _scale(x, price_scale, precisions):
+    xp = [_u(x[0] * precisions[0])]
+    for k in range(N_COINS - 1):
+        xp.append(
+            _u(x[k + 1] * price_scale[k] * precisions[k + 1]) // PRECISION
+        )
+    return xp
+
+
+# ------------------------------ Pool fees -----------------------------------
+
+
+def fee_calc(state, xp):
+    """Pool.fee_calc: the dynamic fee at balances xp, in 1e10 precision."""
+    mid_fee, out_fee, fee_gamma = state.fee_params
+    f = math.reduction_coefficient(xp, fee_gamma)
+    return _u(_u(mid_fee * f) + _u(out_fee * _u(10**18 - f))) // 10**18
+
+
+def calc_token_fee(state, amounts, xp):
+    """Pool.calc_token_fee: the fee on imbalanced liquidity amounts."""
+    fee = fee_calc(state, xp) * N_COINS // (4 * (N_COINS - 1))
+
+    S = _u(sum(amounts))
+    avg = S // N_COINS
+    Sdiff = _u(sum(abs(_x - avg) for _x in amounts))
+
+    return _u(_div_u(_u(fee * Sdiff), S) + NOISE_FEE)
+
+
+# ------------------------------ Quote views ---------------------------------
+
+
+def get_dy(state, i, j, dx):
+    dy, xp = _get_dy_nofee(state, i, j, dx)
+    return _u(dy - _u(fee_calc(state, xp) * dy) // 10**10)
+
+
+def get_dx(state, i, j, dy):
+    _dy = dy
+    # for more precise dx (but never exact), increase num loops
+    for k in range(5):
+        dx, xp = _get_dx_fee(state, i, j, _dy)
+        fee_dy = _u(fee_calc(state, xp) * _dy) // 10**10
+        _dy = _u(dy + fee_dy + 1)
+    return dx
+
+
+def calc_withdraw_one_coin(state, token_amount, i):
+    # The pool does not use the views here: its own calc_withdraw_one_coin
+    # charges the fee at an estimate of xp after the withdrawal, so it
+    # quotes (and pays) slightly less than the views.
+    return _calc_withdraw_one_coin(state, token_amount, i)[0]
+
+
+def calc_token_amount(state, amounts, deposit):
+    d_token, amountsp, xp = _calc_dtoken_nofee(state, amounts, deposit)
+    fee = _u(calc_token_fee(state, amountsp, xp) * d_token) // 10**10
+    return _u(d_token - _u(fee + 1))
+
+
+def calc_fee_get_dy(state, i, j, dx):
+    dy, xp = _get_dy_nofee(state, i, j, dx)
+    return _u(fee_calc(state, xp) * dy) // 10**10
+
+
+def calc_fee_withdraw_one_coin(state, token_amount, i):
+    return _calc_withdraw_one_coin(state, token_amount, i)[1]
+
+
+def calc_fee_token_amount(state, amounts, deposit):
+    d_token, amountsp, xp = _calc_dtoken_nofee(state, amounts, deposit)
+    return _u(calc_token_fee(state, amountsp, xp) * d_token) // 10**10 + 1
+
+
+# ------------------------------ Internals -----------------------------------
+
+
+def _check_indices(i, j):
+    if not (i != j and i < N_COINS and j < N_COINS):
+        _revert("coin index out of range")
+
+
+def _get_dx_fee(state, i, j, dy):
+    # here, dy must include fees (and 1 wei offset)
+    _check_indices(i, j)
+    if dy == 0:
+        _revert("do not exchange out 0 coins")
+
+    x = state.balances[:]
+    x[j] = _u(x[j] - dy)
+    xp = _scale(x, state.price_scale, state.precisions)
+
+    x_out = math.get_y(state.A, state.gamma, xp, state.D_ramp, i)
+    dx = _u(x_out[0] - xp[i])
+    xp[i] = x_out[0]
+    if i > 0:
+        dx = _div_u(_u(dx * PRECISION), state.price_scale[i - 1])
+    dx //= state.precisions[i]
+
+    return dx, xp
+
+
+def _get_dy_nofee(state, i, j, dx):
+    _check_indices(i, j)
+    if dx == 0:
+        _revert("do not exchange 0 coins")
+
+    x = state.balances[:]
+    x[i] = _u(x[i] + dx)
+    xp = _scale(x, state.price_scale, state.precisions)
+
+    y_out = math.get_y(state.A, state.gamma, xp, state.D_ramp, j)
+    dy = _u(_u(xp[j] - y_out[0]) - 1)
+    xp[j] = y_out[0]
+    if j > 0:
+        dy = _div_u(_u(dy * PRECISION), state.price_scale[j - 1])
+    dy //= state.precisions[j]
+
+    return dy, xp
+
+
+def _calc_dtoken_nofee(state, amounts, deposit):
+    sign = 1 if deposit else -1
+    x = [_u(b + sign * a) for b, a in zip(state.balances, amounts)]
+    xp = _scale(x, state.price_scale, state.precisions)
+    amountsp = _scale(amounts, state.price_scale, state.precisions)
+
+    D = math.newton_D(state.A, state.gamma, xp, 0)
+    d_token = _div_u(_u(state.token_supply * D), state.D_ramp)
+
+    if deposit:
+        d_token = _u(d_token - state.token_supply)
+    else:
+        d_token = _u(state.token_supply - d_token)
+
+    return d_token, amountsp, xp
+
+
+def _calc_withdraw_one_coin(state, token_amount, i):
+    if token_amount > state.token_supply:
+        _revert("token amount more than supply")
+    if i >= N_COINS:
+        _revert("coin out of range")
+
+    xp = state.xp[:]
+    if i == 0:
+        price_scale_i = PRECISION * state.precisions[0]
+    else:
+        price_scale_i = _u(state.price_scale[i - 1] * state.precisions[i])
+
+    D = state.D_ramp
+    fee = fee_calc(state, xp)
+    dD = _div_u(_u(token_amount * D), state.token_supply)
+
+    D_fee = _u(fee * dD) // (2 * 10**10) + 1
+    approx_fee = _div_u(_u(N_COINS * D_fee * state.balances[i]), D)
+
+    D = _u(D - _u(dD - D_fee))
+
+    y_out = math.get_y(state.A, state.gamma, xp, D, i)
+    dy = _div_u(_u(_u(xp[i] - y_out[0]) * PRECISION), price_scale_i)
+
+    return dy, approx_fee
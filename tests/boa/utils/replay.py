@@ -0,0 +1,421 @@
+import itertools
+import json
+from collections import Counter
+
+import boa
+
+from tests.boa.utils import simulation_int_many as sim
+from tests.boa.utils.tokens import mint_for_testing
+
+EVENTS = [
+    "TokenExchange",
+    "AddLiquidity",
+    "RemoveLiquidity",
+    "RemoveLiquidityOne",
+    "ClaimAdminFee",
+    "NewParameters",
+    "RampAgamma",
+    "StopRampA",
+]
+PRICE_SIZE = 128  # <- 256 / (N_COINS - 1)
+
+
+def unpack_prices(packed_prices):
+    # packed_price_scale of the pool's events -> [p1, p2]
+    return [
+        (packed_prices >> (PRICE_SIZE * k)) % 2**PRICE_SIZE for k in range(2)
+    ]
+
+
+def load_events(path):
+    """
+    Pool events from a json lines file with one log per line, as decoded by
+    web3 plus the timestamp of its block:
+
+        {"event": "TokenExchange", "blockNumber": 17000000,
+         "timestamp": 1681000000, "transactionIndex": 3, "logIndex": 12,
+         "args": {"buyer": "0x...", "sold_id": 0, ...}}
+
+    Events of other types are dropped. Returns the events in chain order.
+    """
+    with open(path, "r") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    events = [e for e in events if e["event"] in EVENTS]
+    events.sort(
+        key=lambda e: (
+            e["blockNumber"],
+            e.get("transactionIndex", 0),
+            e.get("logIndex", 0),
+        )
+    )
+    return events
+
+
+def write_events(path, events):
+    with open(path, "w") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+def pool_events(swap, tx_index=0):
+    """
+    The replayable events of the last call to swap in the format of
+    load_events, e.g. to record histories of boa runs. Calls in the same
+    block need distinct tx_index values to keep their order.
+    """
+    events = []
+    for log_index, log in enumerate(swap.get_logs()):
+        name = log.event_type.name
+        if log.address != swap.address or name not in EVENTS:
+            continue
+        topics, args = iter(log.topics), iter(log.args)
+        events.append(
+            {
+                "event": name,
+                "blockNumber": boa.env.vm.patch.block_number,
+                "timestamp": boa.env.vm.patch.timestamp,
+                "transactionIndex": tx_index,
+                "logIndex": log_index,
+                "args": {
+                    arg: next(topics) if indexed else next(args)
+                    for arg, indexed in zip(
+                        log.event_type.arguments, log.event_type.indexed
+                    )
+                },
+            }
+        )
+    return events
+
+
+def blocks(events):
+    # (block number, timestamp, events of the block)
+    for number, group in itertools.groupby(events, lambda e: e["blockNumber"]):
+        group = list(group)
+        yield number, group[0]["timestamp"], group
+
+
+def deploy_pool(params, decimals=(18, 18, 18)):
+    """
+    A fresh tricrypto-ng pool with mock coins (the last one WETH) deployed
+    through the factory, as in the test fixtures. Returns the pool, its
+    coins and the factory admin.
+    """
+    deployer, admin = boa.env.generate_address(), boa.env.generate_address()
+    with boa.env.prank(deployer):
+        coins = [
+            boa.load("contracts/mocks/ERC20Mock.vy", name, name, decimals)
+            for name, decimals in zip(["C0", "C1"], decimals[:2])
+        ]
+        weth = boa.load("contracts/mocks/WETH.vy")
+        amm = boa.load_partial("contracts/main/CurveTricryptoOptimizedWETH.vy")
+        amm_implementation = amm.deploy_as_blueprint()
+        math = boa.load("contracts/main/CurveCryptoMathOptimized3.vy")
+        views = boa.load("contracts/main/CurveCryptoViews3Optimized.vy")
+        factory = boa.load(
+            "contracts/main/CurveTricryptoFactory.vy", admin, admin
+        )
+
+    with boa.env.prank(admin):
+        factory.set_pool_implementation(amm_implementation, 0)
+        factory.set_views_implementation(views)
+        factory.set_math_implementation(math)
+
+    coins.append(weth)
+    with boa.env.prank(deployer):
+        swap = factory.deploy_pool(
+            "Replay",
+            "REPLAY",
+            [coin.address for coin in coins],
+            weth,
+            0,
+            params["A"],
+            params["gamma"],
+            params["mid_fee"],
+            params["out_fee"],
+            params["fee_gamma"],
+            params["allowed_extra_profit"],
+            params["adjustment_step"],
+            params["ma_time"],
+            params["initial_prices"],
+        )
+
+    return amm.at(swap), coins, admin
+
+
+class BoaEngine:
+    """
+    Replays events against a deployed tricrypto-ng pool. A single replay
+    account trades and provides liquidity: it is funded with direct storage
+    writes once per block, and it can only withdraw the LP tokens of its
+    replayed deposits. Admin fees are claimed by the pool itself, so
+    ClaimAdminFee events are skipped.
+    """
+
+    errors = (boa.BoaError,)
+
+    def __init__(self, swap, coins, admin):
+        self.swap = swap
+        self.coins = coins
+        self.admin = admin
+        self.user = boa.env.generate_address()
+        with boa.env.prank(self.user):
+            for coin in coins:
+                coin.approve(swap, 2**256 - 1)
+
+    def set_block(self, number, timestamp):
+        boa.env.vm.patch.block_number = number
+        boa.env.vm.patch.timestamp = timestamp
+
+    def fund(self, events):
+        needed = [0] * 3
+        for event in events:
+            args = event["args"]
+            if event["event"] == "TokenExchange":
+                needed[args["sold_id"]] += args["tokens_sold"]
+            elif event["event"] == "AddLiquidity":
+                for k in range(3):
+                    needed[k] += args["token_amounts"][k]
+
+        for coin, amount in zip(self.coins, needed):
+            shortfall = amount - coin.balanceOf(self.user)
+            if shortfall > 0:
+                mint_for_testing(coin, self.user, shortfall)
+
+    def TokenExchange(self, sold_id, tokens_sold, bought_id, **_):
+        with boa.env.prank(self.user):
+            self.swap.exchange(sold_id, bought_id, tokens_sold, 0)
+
+    def AddLiquidity(self, token_amounts, **_):
+        with boa.env.prank(self.user):
+            self.swap.add_liquidity(token_amounts, 0)
+
+    def RemoveLiquidity(self, token_amounts, token_supply, **_):
+        # burn the same share of the (replayed) pool, or exactly the
+        # recorded amount while the replay has not diverged:
+        supply = self.swap.totalSupply()
+        k = max(range(3), key=lambda k: token_amounts[k])
+        amount = token_amounts[k] * supply // self.swap.balances(k)
+        if abs(supply - token_supply - amount) <= amount // 10**6 + 1:
+            amount = supply - token_supply
+        amount = min(amount, self.swap.balanceOf(self.user))
+        with boa.env.prank(self.user):
+            self.swap.remove_liquidity(amount, [0, 0, 0])
+
+    def RemoveLiquidityOne(self, token_amount, coin_index, **_):
+        amount = min(token_amount, self.swap.balanceOf(self.user))
+        with boa.env.prank(self.user):
+            self.swap.remove_liquidity_one_coin(amount, coin_index, 0)
+
+    def NewParameters(
+        self,
+        mid_fee,
+        out_fee,
+        fee_gamma,
+        allowed_extra_profit,
+        adjustment_step,
+        ma_time,
+        xcp_ma_time,
+        **_,
+    ):
+        with boa.env.prank(self.admin):
+            self.swap.apply_new_parameters(
+                mid_fee,
+                out_fee,
+                fee_gamma,
+                allowed_extra_profit,
+                adjustment_step,
+                ma_time,
+                xcp_ma_time,
+            )
+
+    def RampAgamma(self, future_A, future_gamma, future_time, **_):
+        with boa.env.prank(self.admin):
+            self.swap.ramp_A_gamma(future_A, future_gamma, future_time)
+
+    def StopRampA(self, **_):
+        with boa.env.prank(self.admin):
+            self.swap.stop_ramp_A_gamma()
+
+    def state(self):
+        return {
+            "balances": [self.swap.balances(k) for k in range(3)],
+            "price_scale": [self.swap.price_scale(k) for k in range(2)],
+            "price_oracle": [self.swap.price_oracle(k) for k in range(2)],
+            "D": self.swap.D(),
+            "virtual_price": self.swap.virtual_price(),
+            "xcp_profit": self.swap.xcp_profit(),
+        }
+
+
+class SimEngine:
+    """
+    Replays events against the python pool model of simulation_int_many
+    (Trader on the integer math). The model has no LP token and no admin
+    fee: liquidity events change the balances without changing the profit,
+    and ClaimAdminFee events are skipped. The model starts with the first
+    AddLiquidity.
+    """
+
+    errors = (ValueError,)
+
+    def __init__(self, params, precisions):
+        self.params = params
+        self.precisions = precisions
+        self._trader = None
+        self.ramp = None
+        self.t = None
+
+    @property
+    def trader(self):
+        if self._trader is None:
+            raise ValueError("no liquidity")
+        return self._trader
+
+    def set_block(self, number, timestamp):
+        self.t = timestamp
+        if self._trader is None:
+            return
+        if self.ramp is not None:
+            # _A_gamma: linear ramp from (A0, gamma0) at t0 to t1
+            A0, A1, gamma0, gamma1, t0, t1 = self.ramp
+            if timestamp < t1:
+                dt = timestamp - t0
+                A1 = (A0 * (t1 - t0 - dt) + A1 * dt) // (t1 - t0)
+                gamma1 = (gamma0 * (t1 - t0 - dt) + gamma1 * dt) // (t1 - t0)
+            self.trader.curve.A = A1
+            self.trader.curve.gamma = gamma1
+
+    def fund(self, events):
+        pass
+
+    def _x(self, amounts):
+        return [a * p for a, p in zip(amounts, self.precisions)]
+
+    def _set_balances(self, x):
+        if min(x) <= 0:
+            raise ValueError("empty pool")
+        self.trader.curve.x = x
+        # liquidity changes xcp but not the profit:
+        self.trader.xcp = self.trader.get_xcp()
+
+    def TokenExchange(self, sold_id, tokens_sold, bought_id, **_):
+        dx = tokens_sold * self.precisions[sold_id]
+        if self.trader.buy(dx, sold_id, bought_id) is False:
+            raise ValueError("exchange failed")
+        self.trader.tweak_price(self.t)
+
+    def AddLiquidity(self, token_amounts, packed_price_scale, **_):
+        x = self._x(token_amounts)
+        if self._trader is not None:
+            self._set_balances([a + b for a, b in zip(self.trader.curve.x, x)])
+            self.trader.tweak_price(self.t)
+            return
+
+        p = self.params
+        p0 = [10**18] + unpack_prices(packed_price_scale)
+        self._trader = sim.Trader(
+            p["A"],
+            p["gamma"],
+            sum(_x * _p // 10**18 for _x, _p in zip(x, p0)),
+            3,
+            p0,
+            mid_fee=p["mid_fee"] / 1e10,
+            out_fee=p["out_fee"] / 1e10,
+            fee_gamma=p["fee_gamma"],
+            adjustment_step=p["adjustment_step"] / 1e18,
+            ma_time=p["ma_time"],
+            log=False,
+            # liquidity events move the balances far from the last
+            # invariant, which is no starting point for newton_D:
+            warm_start=False,
+        )
+        self.trader.t = self.t
+        self._set_balances(x)
+
+    def RemoveLiquidity(self, token_amounts, **_):
+        x = self._x(token_amounts)
+        self._set_balances([a - b for a, b in zip(self.trader.curve.x, x)])
+
+    def RemoveLiquidityOne(self, coin_index, coin_amount, **_):
+        x = self.trader.curve.x[:]
+        x[coin_index] -= coin_amount * self.precisions[coin_index]
+        self._set_balances(x)
+        self.trader.tweak_price(self.t)
+
+    def NewParameters(
+        self, mid_fee, out_fee, fee_gamma, adjustment_step, ma_time, **_
+    ):
+        self.trader.mid_fee = mid_fee
+        self.trader.out_fee = out_fee
+        self.trader.fee_gamma = fee_gamma
+        self.trader.adjustment_step = adjustment_step
+        self.trader.ma_time = ma_time
+
+    def RampAgamma(
+        self,
+        initial_A,
+        future_A,
+        initial_gamma,
+        future_gamma,
+        initial_time,
+        future_time,
+        **_,
+    ):
+        self.ramp = (
+            initial_A,
+            future_A,
+            initial_gamma,
+            future_gamma,
+            initial_time,
+            future_time,
+        )
+
+    def StopRampA(self, current_A, current_gamma, **_):
+        self.ramp = None
+        self.trader.curve.A = current_A
+        self.trader.curve.gamma = current_gamma
+
+    def state(self):
+        curve = self.trader.curve
+        return {
+            "balances": [x // p for x, p in zip(curve.x, self.precisions)],
+            "price_scale": curve.p[1:],
+            "price_oracle": self.trader.price_oracle[1:],
+            "D": curve.D(),
+            "xcp_profit": self.trader.xcp_profit,
+        }
+
+
+def replay(engine, events, strict=False, on_block=None):
+    """
+    Replay events against engine (BoaEngine or SimEngine) block by block:
+    time travels to every block's timestamp once, funds the whole block and
+    replays its events in order. Failing events are counted and skipped,
+    or raise with strict=True. on_block(number, timestamp, engine) is
+    called after every block. Returns a Counter of "<event>" (replayed),
+    "<event> failed" and "<event> skipped".
+    """
+    stats = Counter()
+    for number, timestamp, block_events in blocks(events):
+        engine.set_block(number, timestamp)
+        engine.fund(block_events)
+
+        for event in block_events:
+            name = event["event"]
+            handler = getattr(engine, name, None)
+            if handler is None:
+                stats[f"{name} skipped"] += 1
+                continue
+            try:
+                handler(**event["args"])
+            except engine.errors:
+                if strict:
+                    raise
+                stats[f"{name} failed"] += 1
+                continue
+            stats[name] += 1
+
+        if on_block is not None:
+            on_block(number, timestamp, engine)
+
+    return stats
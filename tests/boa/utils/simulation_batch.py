@@ -0,0 +1,403 @@
+import numpy as np
+
+from tests.boa.utils import simulation_int_many as sim
+
+A_MULTIPLIER = sim.A_MULTIPLIER
+N_COINS = 3
+
+# float64 newton stops once the relative step falls below this; the exact
+# integer solvers then need only one or two iterations to converge.
+FLOAT_TOLERANCE = 1e-14
+MAX_FLOAT_ITERATIONS = 64
+
+
+def _broadcast(values, n):
+    if isinstance(values, int):
+        return [values] * n
+    values = [int(v) for v in values]
+    assert len(values) == n
+    return values
+
+
+def _to_float(values):
+    return np.array([float(v) for v in values], dtype=np.float64)
+
+
+def estimate_D(A, gamma, x, D0=None):
+    """
+    Solve the invariant in float64 for every state at once.
+    A, gamma and D0 are scalars or sequences of len(x); x is a sequence of
+    [x0, x1, x2] balances. Returns the float estimates and a mask of the
+    states that converged (others are nan).
+    """
+    n = len(x)
+    X = np.array([[float(_x) for _x in xx] for xx in x], dtype=np.float64)
+    A = _to_float(_broadcast(A, n))
+    gamma = _to_float(_broadcast(gamma, n)) / 1e18
+
+    # work with balances normalised to sum(x) == 1:
+    S = X.sum(axis=1)
+    X = X / S[:, None]
+
+    if D0 is None:
+        D = N_COINS * np.cbrt(X.prod(axis=1))
+    else:
+        D0 = _to_float(_broadcast(D0, n)) / S
+        D = np.where(D0 > 0, D0, N_COINS * np.cbrt(X.prod(axis=1)))
+
+    active = np.ones(n, dtype=bool)
+    with np.errstate(all="ignore"):
+        for _ in range(MAX_FLOAT_ITERATIONS):
+
+            K0 = (X * N_COINS / D[:, None]).prod(axis=1)
+            _g1k0 = np.abs(gamma + 1 - K0)
+
+            # D / (A * N**N) * _g1k0**2 / gamma**2
+            mul1 = D / gamma**2 * _g1k0**2 * A_MULTIPLIER / A
+
+            # 2*N*K0 / _g1k0
+            mul2 = 2 * N_COINS * K0 / _g1k0
+
+            neg_fprime = (1 + mul2) + mul1 * N_COINS / K0 - mul2 * D
+
+            # D -= f / fprime
+            D_new = (D * neg_fprime + D - D**2) / neg_fprime - D * (
+                mul1 / neg_fprime
+            ) * (1 - K0) / K0
+            D_new = np.where(D_new < 0, -D_new / 2, D_new)
+
+            converged = np.abs(D_new - D) <= FLOAT_TOLERANCE * D_new
+            D = np.where(active, D_new, D)
+            active &= ~converged
+            if not active.any():
+                break
+
+    ok = ~active & np.isfinite(D) & (D > 0)
+    return np.where(ok, D * S, np.nan), ok
+
+
+def estimate_y(A, gamma, x, D, i):
+    """
+    Solve x[i] in float64 for every state at once, given the invariant D.
+    A, gamma, D and i are scalars or sequences of len(x).
+    Returns the float estimates and a mask of the states that converged.
+    """
+    n = len(x)
+    X = np.array([[float(_x) for _x in xx] for xx in x], dtype=np.float64)
+    A = _to_float(_broadcast(A, n))
+    gamma = _to_float(_broadcast(gamma, n)) / 1e18
+    D = _to_float(_broadcast(D, n))
+    i = np.array(_broadcast(i, n))
+
+    # work with balances normalised to D == 1:
+    X = X / D[:, None]
+    others = np.ones((n, N_COINS), dtype=bool)
+    others[np.arange(n), i] = False
+
+    K0_i = np.where(others, X * N_COINS, 1.0).prod(axis=1)
+    S_i = np.where(others, X, 0.0).sum(axis=1)
+    y = 1 / (N_COINS * K0_i)
+
+    active = np.ones(n, dtype=bool)
+    with np.errstate(all="ignore"):
+        for _ in range(MAX_FLOAT_ITERATIONS):
+
+            K0 = K0_i * y * N_COINS
+            S = S_i + y
+            _g1k0 = np.abs(gamma + 1 - K0)
+
+            # D / (A * N**N) * _g1k0**2 / gamma**2
+            mul1 = _g1k0**2 / gamma**2 * A_MULTIPLIER / A
+
+            # 2*K0 / _g1k0
+            mul2 = 1 + 2 * K0 / _g1k0
+
+            yfprime = y + S * mul2 + mul1 - mul2
+            fprime = yfprime / y
+
+            # y -= f / f_prime;  y = (y * fprime - f) / fprime
+            y_new = (yfprime + 1 - S) / fprime + mul1 / fprime * (1 - K0) / K0
+            y_new = np.where((y_new < 0) | (fprime < 0), y / 2, y_new)
+
+            converged = np.abs(y_new - y) <= FLOAT_TOLERANCE * y_new
+            y = np.where(active, y_new, y)
+            active &= ~converged
+            if not active.any():
+                break
+
+    ok = ~active & np.isfinite(y) & (y > 0)
+    return np.where(ok, y * D, np.nan), ok
+
+
+def _objects(values):
+    # numpy array of python ints: arithmetic stays exact and `//` floors
+    # like the scalar solvers
+    out = np.empty(len(values), dtype=object)
+    out[:] = list(values)
+    return out
+
+
+def _rows(values):
+    out = np.empty((len(values), N_COINS), dtype=object)
+    for k, row in enumerate(values):
+        out[k, :] = row
+    return out
+
+
+def _nonzero(values, bad):
+    # denominators of the states that are dropped below are set to 1
+    zero = (values == 0).astype(bool)
+    bad |= zero
+    return np.where(zero, 1, values)
+
+
+def _geometric_mean_lockstep(X):
+    """
+    `simulation_int_many.geometric_mean` of every row of X (sorted in
+    descending order). Returns the results and a mask of the rows that
+    did not converge or failed.
+    """
+    n = len(X)
+    D = X[:, 0].copy()
+    out = _objects([None] * n)
+    failed = np.zeros(n, dtype=bool)
+    k = np.arange(n)
+
+    for _ in range(255):
+        if not len(k):
+            break
+        Xk, D_prev = X[k], D[k]
+        bad = np.zeros(len(k), dtype=bool)
+        D_safe = _nonzero(D_prev, bad)
+
+        tmp = np.full(len(k), 10**18, dtype=object)
+        for c in range(N_COINS):
+            tmp = tmp * Xk[:, c] // D_safe
+        D_new = (
+            D_prev * ((N_COINS - 1) * 10**18 + tmp) // (N_COINS * 10**18)
+        )
+
+        diff = abs(D_new - D_prev)
+        converged = ((diff <= 1) | (diff * 10**18 < D_new)).astype(bool)
+        D[k] = D_new
+        out[k[converged & ~bad]] = D_new[converged & ~bad]
+        failed[k[bad]] = True
+        k = k[~converged & ~bad]
+
+    failed[k] = True
+    return out, failed
+
+
+def _newton_D_lockstep(A, gamma, X, D):
+    """
+    `simulation_int_many.newton_D` for every state at once, with the same
+    integer operations. X rows are sorted in descending order. Returns the
+    results and a mask of the states that the scalar solver would raise
+    on or that did not converge.
+    """
+    n = len(D)
+    S = X.sum(axis=1)
+    out = _objects([None] * n)
+    failed = np.zeros(n, dtype=bool)
+    k = np.arange(n)
+
+    for _ in range(255):
+        if not len(k):
+            break
+        Ak, gk, Xk, Sk, Dk = A[k], gamma[k], X[k], S[k], D[k]
+        bad = np.zeros(len(k), dtype=bool)
+        D_safe = _nonzero(Dk, bad)
+        A_safe = _nonzero(Ak, bad)
+        g_safe = _nonzero(gk, bad)
+
+        K0 = np.full(len(k), 10**18, dtype=object)
+        for c in range(N_COINS):
+            K0 = K0 * Xk[:, c] * N_COINS // D_safe
+        K0_safe = _nonzero(K0, bad)
+
+        _g1k0 = _nonzero(abs(gk + 10**18 - K0), bad)
+
+        # D / (A * N**N) * _g1k0**2 / gamma**2
+        mul1 = (
+            10**18 * Dk // g_safe * _g1k0 // g_safe * _g1k0 * A_MULTIPLIER
+        ) // A_safe
+
+        # 2*N*K0 / _g1k0
+        mul2 = (2 * 10**18) * N_COINS * K0 // _g1k0
+
+        neg_fprime = (
+            (Sk + Sk * mul2 // 10**18)
+            + mul1 * N_COINS // K0_safe
+            - mul2 * Dk // 10**18
+        )
+        negative = (neg_fprime <= 0).astype(bool)  # <- the scalar asserts
+        bad |= negative
+        neg_fprime = np.where(negative, 1, neg_fprime)
+
+        # D -= f / fprime
+        D_new = (Dk * neg_fprime + Dk * Sk - Dk**2) // neg_fprime - Dk * (
+            mul1 // neg_fprime
+        ) // 10**18 * (10**18 - K0) // K0_safe
+        D_new = np.where((D_new < 0).astype(bool), -D_new // 2, D_new)
+
+        converged = (
+            abs(D_new - Dk) <= np.maximum(D_new // 10**14, 100)
+        ).astype(bool)
+        D[k] = D_new
+        out[k[converged & ~bad]] = D_new[converged & ~bad]
+        failed[k[bad]] = True
+        k = k[~converged & ~bad]
+
+    failed[k] = True
+    return out, failed
+
+
+def _newton_y_lockstep(A, gamma, D, K0_i, S_i, y, limit):
+    """
+    The newton iterations of `simulation_int_many.newton_y` for every
+    state at once, from the starting point and sums computed by the
+    caller. Returns the results and a mask of the states that the scalar
+    solver would raise on or that did not converge.
+    """
+    n = len(y)
+    out = _objects([None] * n)
+    failed = np.zeros(n, dtype=bool)
+    k = np.arange(n)
+
+    for _ in range(255):
+        if not len(k):
+            break
+        Ak, gk, Dk, yk = A[k], gamma[k], D[k], y[k]
+        bad = np.zeros(len(k), dtype=bool)
+        D_safe = _nonzero(Dk, bad)
+        A_safe = _nonzero(Ak, bad)
+        g_safe = _nonzero(gk, bad)
+        y_safe = _nonzero(yk, bad)
+
+        K0 = K0_i[k] * yk * N_COINS // D_safe
+        K0_safe = _nonzero(K0, bad)
+        S = S_i[k] + yk
+
+        _g1k0 = _nonzero(abs(gk + 10**18 - K0), bad)
+
+        # D / (A * N**N) * _g1k0**2 / gamma**2
+        mul1 = (
+            10**18 * Dk // g_safe * _g1k0 // g_safe * _g1k0 * A_MULTIPLIER
+        ) // A_safe
+
+        # 2*K0 / _g1k0
+        mul2 = 10**18 + (2 * 10**18) * K0 // _g1k0
+
+        yfprime = 10**18 * yk + S * mul2 + mul1 - Dk * mul2
+        fprime = yfprime // y_safe
+        negative = (fprime <= 0).astype(bool)  # <- the scalar asserts
+        bad |= negative
+        fprime = np.where(negative, 1, fprime)
+
+        # y -= f / f_prime;  y = (y * fprime - f) / fprime
+        y_new = (
+            yfprime + 10**18 * Dk - 10**18 * S
+        ) // fprime + mul1 // fprime * (10**18 - K0) // K0_safe
+        y_new = np.where((y_new < 0).astype(bool), yk // 2, y_new)
+
+        converged = (
+            abs(y_new - yk) <= np.maximum(y_new // 10**14, limit[k])
+        ).astype(bool)
+        y[k] = y_new
+        out[k[converged & ~bad]] = y_new[converged & ~bad]
+        failed[k[bad]] = True
+        k = k[~converged & ~bad]
+
+    failed[k] = True
+    return out, failed
+
+
+def newton_D_batch(A, gamma, x, D0=None):
+    """
+    `simulation_int_many.solve_D` for every state at once. The exact
+    integer newton iterations run in lockstep over the batch from the same
+    starting points (D0, or N * geometric_mean(x) when D0 is not given), so
+    the results are identical to the scalar function. A float64 pass only
+    screens out the states that do not converge: these, and the states
+    the lockstep iteration drops, are solved with the scalar function,
+    which raises for them as it would without batching.
+    """
+    n = len(x)
+    A = _broadcast(A, n)
+    gamma = _broadcast(gamma, n)
+    _, ok = estimate_D(A, gamma, x, D0)
+    D0 = [None] * n if D0 is None else _broadcast(D0, n)
+
+    out = [None] * n
+    k = np.flatnonzero(ok)
+    X = _rows([sorted(x[j], reverse=True) for j in k])
+    D = _objects([D0[j] or 0 for j in k])
+
+    cold = np.flatnonzero(D == 0)
+    mean, failed = _geometric_mean_lockstep(X[cold])
+    D[cold[~failed]] = N_COINS * mean[~failed]
+
+    results, failed_D = _newton_D_lockstep(
+        _objects([A[j] for j in k]), _objects([gamma[j] for j in k]), X, D
+    )
+    failed_D[cold[failed]] = True
+    for j, D_j, fail in zip(k, results, failed_D):
+        if not fail:
+            out[j] = D_j
+
+    for j in range(n):
+        if out[j] is None:
+            out[j] = sim.solve_D(A[j], gamma[j], x[j], D0[j])
+    return out
+
+
+def newton_y_batch(A, gamma, x, D, i):
+    """
+    `simulation_int_many.newton_y` for every state at once, with exact
+    integer iterations in lockstep like `newton_D_batch`. The results are
+    identical to the scalar function.
+    """
+    n = len(x)
+    A = _broadcast(A, n)
+    gamma = _broadcast(gamma, n)
+    D = _broadcast(D, n)
+    i = _broadcast(i, n)
+    _, ok = estimate_y(A, gamma, x, D, i)
+
+    # starting point and sums of the other coins, as in the scalar solver:
+    k, K0_i, S_i, y, limit = [], [], [], [], []
+    for j in np.flatnonzero(ok):
+        x_sorted = sorted(_x for c, _x in enumerate(x[j]) if c != i[j])
+        try:
+            y_j = D[j] // N_COINS
+            for _x in x_sorted:
+                y_j = y_j * D[j] // (_x * N_COINS)  # Small _x first
+            K0_ij = 10**18
+            for _x in x_sorted[::-1]:
+                K0_ij = K0_ij * _x * N_COINS // D[j]  # Large _x first
+        except ZeroDivisionError:
+            continue
+        k.append(j)
+        K0_i.append(K0_ij)
+        S_i.append(sum(x_sorted))
+        y.append(y_j)
+        limit.append(max(max(x_sorted) // 10**14, D[j] // 10**14, 100))
+
+    results, failed = _newton_y_lockstep(
+        _objects([A[j] for j in k]),
+        _objects([gamma[j] for j in k]),
+        _objects([D[j] for j in k]),
+        _objects(K0_i),
+        _objects(S_i),
+        _objects(y),
+        _objects(limit),
+    )
+
+    out = [None] * n
+    for j, y_j, fail in zip(k, results, failed):
+        if not fail:
+            out[j] = y_j
+    for j in range(n):
+        if out[j] is None:
+            out[j] = sim.newton_y(A[j], gamma[j], x[j], D[j], i[j])
+    return out
@@ -1,5 +1,8 @@
+from collections import Counter, OrderedDict
 from math import exp, log
 
+from tests.boa.utils import math_optimized
+
 A_MULTIPLIER = 10000
 
 
@@ -38,7 +41,7 @@ def reduction_coefficient(x, gamma):
     return K
 
 
-def newton_D(A, gamma, x, D0):
+def newton_D(A, gamma, x, D0, iterations=None):
     D = D0
     i = 0
 
@@ -76,12 +79,14 @@ def newton_D(A, gamma, x, D0):
         if D < 0:
             D = -D // 2
         if abs(D - D_prev) <= max(100, D // 10**14):
+            if iterations is not None:
+                iterations[i + 1] += 1  # <- histogram of iteration counts
             return D
 
     raise ValueError("Did not converge")
 
 
-def newton_y(A, gamma, x, D, i):
+def newton_y(A, gamma, x, D, i, y0=None, iterations=None):
     N = len(x)
 
     y = D // N
@@ -92,6 +97,8 @@ def newton_y(A, gamma, x, D, i):
     for _x in x_sorted:
         y = y * D // (_x * N)  # Small _x first
         S_i += _x
+    if y0:
+        y = y0  # <- initial guess supplied by the caller
     for _x in x_sorted[::-1]:
         K0_i = K0_i * _x * N // D  # Large _x first
 
@@ -125,6 +132,8 @@ def newton_y(A, gamma, x, D, i):
         if y < 0 or fprime < 0:
             y = y_prev // 2
         if abs(y - y_prev) <= max(convergence_limit, y // 10**14):
+            if iterations is not None:
+                iterations[j + 1] += 1  # <- histogram of iteration counts
             return y
 
     raise Exception("Did not converge")
@@ -151,43 +160,123 @@ def get_partial_derivative(x1, x2, x3, d, gamma, A):
     )
 
 
-def solve_x(A, gamma, x, D, i):
-    return newton_y(A, gamma, x, D, i)
+def solve_x(A, gamma, x, D, i, y0=None, iterations=None):
+    return newton_y(A, gamma, x, D, i, y0, iterations)
 
 
-def solve_D(A, gamma, x):
-    D0 = len(x) * geometric_mean(x)  # <- fuzz to make sure it's ok XXX
-    return newton_D(A, gamma, x, D0)
+def solve_D(A, gamma, x, D0=None, iterations=None):
+    if not D0:
+        D0 = len(x) * geometric_mean(x)  # <- fuzz to make sure it's ok XXX
+    return newton_D(A, gamma, x, D0, iterations)
 
 
 class Curve:
-    def __init__(self, A, gamma, D, n, p=None):
+    def __init__(self, A, gamma, D, n, p=None, cache_size=16, exact_p=True):
         self.A = A
         self.gamma = gamma
         self.n = n
+        # exact_p: get_p with the integer formula of MATH.get_p, as the pool
+        # does in tweak_price. Otherwise from float partial derivatives,
+        # which is faster but only approximate.
+        self.exact_p = exact_p
         if p:
             self.p = p
         else:
             self.p = [10**18] * n
         self.x = [D // n * 10**18 // self.p[i] for i in range(n)]
 
+        # Invariants are memoized on (A, gamma, x, p) and the warm start
+        # seed: x and p are mutated in place by Trader, so the key is rebuilt
+        # on every lookup.
+        self.cache_size = cache_size
+        self._xp_cache = (None, None)
+        self._D_cache = OrderedDict()
+        self._seed = (None, None)  # <- (state, K0_prev) of the last warm D
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Histograms of newton iterations per solve:
+        self.iterations = {"D": Counter(), "y": Counter()}
+
+    def _cache_key(self):
+        return (self.A, self.gamma, tuple(self.x), tuple(self.p))
+
     def xp(self):
-        return [x * p // 10**18 for x, p in zip(self.x, self.p)]
+        key = (tuple(self.x), tuple(self.p))
+        if self._xp_cache[0] != key:
+            self._xp_cache = (
+                key,
+                [x * p // 10**18 for x, p in zip(self.x, self.p)],
+            )
+        return self._xp_cache[1][:]
 
-    def D(self):
+    def K0(self, D=None):
+        # K0 = prod(xp) * N**N / D**N in 1e18 precision
+        D = D or self.D()
+        K0 = 10**18
+        for _x in self.xp():
+            K0 = K0 * _x * self.n // D
+        return K0
+
+    def D(self, K0_prev=None):
+        # K0_prev: K0 of a nearby state (e.g. before a trade), used to warm
+        # start newton_D like K0_prev in the pool contract. A call without
+        # K0_prev reuses the seed of the last warm start of the same state:
+        # newton_D stops within a tolerance, so a warm and a cold solve can
+        # differ by a few wei, and the result must not depend on the cache.
+        key = self._cache_key()
+        if K0_prev:
+            self._seed = (key, K0_prev)
+        elif self._seed[0] == key:
+            K0_prev = self._seed[1]
+
+        key += (K0_prev,)
+        if self.cache_size and key in self._D_cache:
+            self.cache_hits += 1
+            self._D_cache.move_to_end(key)
+            return self._D_cache[key]
+
+        self.cache_misses += 1
         xp = self.xp()
         if any(x <= 0 for x in xp):
             raise ValueError
-        return solve_D(self.A, self.gamma, xp)
+        D0 = None
+        if K0_prev:
+            # D such that prod(xp) * N**N / D**N == K0_prev:
+            D0 = int(
+                self.n
+                * exp(
+                    (sum(log(_x) for _x in xp) - log(K0_prev / 1e18)) / self.n
+                )
+            )
+        D = solve_D(self.A, self.gamma, xp, D0, self.iterations["D"])
+
+        self._D_cache[key] = D
+        while len(self._D_cache) > self.cache_size:
+            self._D_cache.popitem(last=False)
+        return D
 
-    def y(self, x, i, j):
+    def y(self, x, i, j, y0=None):
+        # y0: optional initial guess for newton_y. Not used by Trader: with
+        # small gamma newton_y only converges from close to its default
+        # starting point, so a stale y0 can make it stall or fail.
         xp = self.xp()
         xp[i] = x * self.p[i] // 10**18
-        yp = solve_x(self.A, self.gamma, xp, self.D(), j)
+        if y0:
+            y0 = y0 * self.p[j] // 10**18
+        yp = solve_x(
+            self.A, self.gamma, xp, self.D(), j, y0, self.iterations["y"]
+        )
         return yp * 10**18 // self.p[j]
 
     def get_p(self):
 
+        if self.exact_p:
+            p = math_optimized.get_p(self.xp(), self.D(), [self.A, self.gamma])
+            return [
+                _p * p_scale // 10**18 for _p, p_scale in zip(p, self.p[1:])
+            ]
+
         ANN = self.A
         A = ANN / 10**4 / 3**3
         gamma = self.gamma / 1e18
@@ -219,15 +308,24 @@ class Trader:
         adjustment_step=0.003,
         ma_time=int(600 / log(2)),  # 10 minutes
         log=True,
+        warm_start=True,
+        exact_p=True,
+        cbrt_xcp=False,
     ):
         # allowed_extra_profit is actually not used
         self.p0 = p0[:]
         self.price_oracle = self.p0[:]
         self.last_price = self.p0[:]
-        self.curve = Curve(A, gamma, D, n, p=p0[:])
+        self.curve = Curve(A, gamma, D, n, p=p0[:], exact_p=exact_p)
         self.dx = int(D * 1e-8)
         self.mid_fee = int(mid_fee * 1e10)
         self.out_fee = int(out_fee * 1e10)
+        # Consecutive trades move balances only slightly, so newton solvers
+        # are warm started from K0 of the state before each trade:
+        self.warm_start = warm_start
+        # cbrt_xcp: xcp from the closed form cube root of the pool's
+        # MATH.geometric_mean (N=3 only) instead of the iterative mean.
+        self.cbrt_xcp = cbrt_xcp
         self.D0 = self.curve.D()
         self.xcp_0 = self.get_xcp()
         self.xcp_profit = 10**18
@@ -247,17 +345,24 @@ class Trader:
         f = reduction_coefficient(self.curve.xp(), self.fee_gamma)
         return (self.mid_fee * f + self.out_fee * (10**18 - f)) // 10**18
 
-    def get_xcp(self):
+    def get_xcp(self, K0_prev=None):
         # First calculate the ideal balance
         # Then calculate, what the constant-product would be
-        D = self.curve.D()
+        D = self.curve.D(K0_prev)
         N = len(self.curve.x)
         X = [D * 10**18 // (N * p) for p in self.curve.p]
 
+        if self.cbrt_xcp:
+            return math_optimized.geometric_mean(X)
         return geometric_mean(X)
 
-    def update_xcp(self, only_real=False):
-        xcp = self.get_xcp()
+    def _K0_prev(self, D):
+        # K0 of the current balances at a previous invariant D
+        if self.warm_start:
+            return self.curve.K0(D)
+
+    def update_xcp(self, only_real=False, K0_prev=None):
+        xcp = self.get_xcp(K0_prev)
         self.xcp_profit_real = self.xcp_profit_real * xcp // self.xcp
         if not only_real:
             self.xcp_profit = self.xcp_profit * xcp // self.xcp
@@ -269,18 +374,20 @@ class Trader:
         """
         try:
             x_old = self.curve.x[:]
+            D = self.curve.D()
             x = self.curve.x[i] + dx
             y = self.curve.y(x, i, j)
             dy = self.curve.x[j] - y
             self.curve.x[i] = x
             self.curve.x[j] = y
+            K0_prev = self._K0_prev(D)
             fee = self.fee()
             self.curve.x[j] += dy * fee // 10**10
             dy = dy * (10**10 - fee) // 10**10
             if dx * 10**18 // dy > max_price or dy < 0:
                 self.curve.x = x_old
                 return False
-            self.update_xcp()
+            self.update_xcp(K0_prev=K0_prev)
             return dy
         except ValueError:
             return False
@@ -291,18 +398,20 @@ class Trader:
         """
         try:
             x_old = self.curve.x[:]
+            D = self.curve.D()
             y = self.curve.x[j] + dy
             x = self.curve.y(y, j, i)
             dx = self.curve.x[i] - x
             self.curve.x[i] = x
             self.curve.x[j] = y
+            K0_prev = self._K0_prev(D)
             fee = self.fee()
             self.curve.x[i] += dx * fee // 10**10
             dx = dx * (10**10 - fee) // 10**10
             if dx * 10**18 // dy < min_price or dx < 0:
                 self.curve.x = x_old
                 return False
-            self.update_xcp()
+            self.update_xcp(K0_prev=K0_prev)
             return dx
         except ValueError:
             return False
@@ -355,9 +464,10 @@ class Trader:
         old_p = self.curve.p[:]
         old_profit = self.xcp_profit_real
         old_xcp = self.xcp
+        D = self.curve.D()
 
         self.curve.p = p_new
-        self.update_xcp(only_real=True)
+        self.update_xcp(only_real=True, K0_prev=self._K0_prev(D))
 
         if 2 * (self.xcp_profit_real - 10**18) <= self.xcp_profit - 10**18:
             # If real profit is less than half of maximum - revert params back
@@ -366,3 +476,67 @@ class Trader:
             self.xcp = old_xcp
 
         return norm
+
+    def simulate(self, mdata):
+        """
+        Trade against every candle of mdata, which can be a lazy stream of
+        candles of several pairs (see candles.merge). For a candle of pair
+        (a, b) with prices of b in units of a, buy b until the price reaches
+        the high, then sell it until the price reaches the low, trading at
+        most the candle volume.
+        """
+        lasts = {}
+        t_0 = None
+        for i, d in enumerate(mdata):
+            a, b = d["pair"]
+            if t_0 is None:
+                t_0 = self.t = d["t"]
+
+            # candle volume is in coin b, count volumes in coin 0:
+            ext_vol = int(d["volume"] * self.price_oracle[b])
+            vol = 0
+            ctr = 0
+            step = (
+                max(ext_vol // 100, self.dx) * 10**18 // self.price_oracle[a]
+            )
+            last = lasts.get(
+                (a, b), self.curve.p[b] * 10**18 // self.curve.p[a]
+            )
+
+            max_price = int(10**18 * d["high"])
+            while last < max_price and vol < ext_vol // 2:
+                dy = self.buy(step, a, b, max_price=max_price)
+                if dy is False:
+                    break
+                vol += dy * self.price_oracle[b] // 10**18
+                last = step * 10**18 // dy
+                ctr += 1
+
+            min_price = int(10**18 * d["low"])
+            while last > min_price and vol < ext_vol // 2:
+                dy = step * 10**18 // last
+                dx = self.sell(dy, a, b, min_price=min_price)
+                if dx is False:
+                    break
+                vol += dy * self.price_oracle[b] // 10**18
+                last = dx * 10**18 // dy
+                ctr += 1
+
+            lasts[a, b] = last
+            if ctr > 0:
+                self.tweak_price(d["t"])
+            self.total_vol += vol
+
+            if self.log:
+                print(
+                    f"{i}\t{a}/{b}\ttrades: {ctr}\t"
+                    f"AMM: {last / 1e18:.6f}\t"
+                    f"Vol: {self.total_vol / 1e18:.4f}\t"
+                    f"xCP-growth: {self.xcp_profit_real / 1e18:.5f}\t"
+                    f"APY: {self.apy(d['t'] - t_0) * 100:.1f}%"
+                )
+
+    def apy(self, duration):
+        return (self.xcp_profit_real / 1e18) ** (
+            86400 * 365 / (duration + 1)
+        ) - 1
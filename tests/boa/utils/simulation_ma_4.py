@@ -2,6 +2,7 @@
 # flake8: noqa
 import json
 from decimal import Decimal
+from math import ceil, exp, log2
 
 
 def reduction_coefficient(x, gamma):
@@ -204,9 +205,9 @@ class Curve:
         return int(yp) * 10**18 // self.p[j]
 
 
-def get_ethbtc():
+def get_ethbtc(path="download/ethbtc.json"):
     # with open('download/crvusdt.json', 'r') as f:
-    with open("download/ethbtc.json", "r") as f:
+    with open(path, "r") as f:
         return [
             {
                 "open": float(t[1]),
@@ -222,10 +223,10 @@ def get_ethbtc():
     # Volume is in ETH
 
 
-def get_all():
+def get_all(path="download/ethbtc.json"):
     # btc - 0
     # eth - 1
-    btceth = get_ethbtc()
+    btceth = get_ethbtc(path)
     out = []
     for trade in btceth:
         trade["pair"] = (0, 1)
@@ -257,6 +258,8 @@ class Trader:
         out_fee=3e-3,
         price_threshold=0.01,
         fee_gamma=None,
+        adjustment_step=3e-3,
+        ma_time=None,  # <- None: fixed 0.8 moving average per candle
         log=True,
     ):
         self.p0 = p0
@@ -271,12 +274,15 @@ class Trader:
         self.xcp_profit_real = 1.0
         self.xcp = self.xcp_0
         self.price_threshold = price_threshold
-        self.adjustment_step = 3e-3
+        self.adjustment_step = adjustment_step
+        self.ma_time = ma_time
         self.log = log
         self.fee_gamma = fee_gamma or gamma
         self.total_vol = 0.0
         self.ext_fee = 0  # 0.03e-2
         self.slippage = []
+        self.price_evals = 0  # <- price() calls in step_for_price
+        self.price_evals_saved = 0  # <- vs doubling the step from self.dx
 
     def fee(self):
         f = reduction_coefficient(self.curve.xp(), self.fee_gamma)
@@ -290,17 +296,53 @@ class Trader:
         )
 
     def step_for_price(self, dp, sign=1):
+        """
+        Smallest step = self.dx * 2**k which moves price(0, 1) by at least
+        dp (or reaches 10% of x[0]). Rather than trying every k, k is
+        estimated from the marginal price change at self.dx and then only
+        checked for k and k - 1. The price change grows monotonically with
+        the step (for dp above the float precision of price()), so the result
+        is the same as doubling up from self.dx.
+        """
         p0 = self.price(0, 1)
         x0 = self.curve.x[:]
-        step = self.dx
-        while True:
+        evals = [1]
+
+        def moves(k):
+            step = self.dx * 2**k
             self.curve.x[0] = x0[0] + sign * step
             dp_ = abs(p0 - self.price(0, 1))
-            if dp_ >= dp or step >= 0.1 * self.curve.x[0]:
-                self.curve.x = x0
-                self.slippage.append(step / dp_)
-                return step
-            step *= 2
+            evals[0] += 1
+            return dp_ >= dp or step >= 0.1 * self.curve.x[0], dp_
+
+        # moves(k_lo) is False, moves(k) is True:
+        k_lo = -1
+        k = 0
+        done, dp_ = moves(0)
+        if not done:
+            # price moves ~linearly with the step, curvature is taken care
+            # of by checking k against its neighbours:
+            k_lo = 0
+            k_max = ceil(log2(x0[0] / (11 * self.dx)))
+            k_est = ceil(log2(dp / dp_)) if dp_ > 0 else k_max
+            k = min(max(k_est, 1), k_max)
+            done, dp_ = moves(k)
+            while not done:
+                k_lo = k
+                k += 1
+                done, dp_ = moves(k)
+            while k - 1 > k_lo:
+                done, _dp = moves(k - 1)
+                if not done:
+                    break
+                k, dp_ = k - 1, _dp
+
+        self.curve.x = x0
+        self.price_evals += evals[0]
+        self.price_evals_saved += k + 2 - evals[0]
+        step = self.dx * 2**k
+        self.slippage.append(step / dp_)
+        return step
 
     def get_xcp(self):
         # First calculate the ideal balance
@@ -391,6 +433,7 @@ class Trader:
     def simulate(self, mdata):
         last = self.p0
         avg = last
+        t_prev = t_0 = mdata[0]["t"]
         for i, d in enumerate(mdata):
             a, b = d["pair"]
             vol = 0
@@ -429,14 +472,19 @@ class Trader:
                 min_price = d["low"]
                 ctr += 1
             _low = last
-            avg = avg * 0.8 + (_high + _low) / 2 * 0.2  # MA price
+            if self.ma_time is None:
+                avg = avg * 0.8 + (_high + _low) / 2 * 0.2  # MA price
+            else:
+                alpha = exp(-(d["t"] - t_prev) / self.ma_time)
+                avg = avg * alpha + (_high + _low) / 2 * (1 - alpha)
+            t_prev = d["t"]
             if ctr > 0:
                 self.tweak_price(avg)
             self.total_vol += vol
             if self.log:
                 try:
                     print(
-                        "{0}\ttrades: {1}\tAMM: {2:.6f}\tTarget: {3:.6f}\tVol: {4:.4f}\tPR: {5: .2f}\txCP-growth: {6:.5f}\tAPY:{7:.1f}%\tfee:{8:.3f}%".format(
+                        "{0}\ttrades: {1}\tAMM: {2:.6f}\tTarget: {3:.6f}\tVol: {4:.4f}\tPR: {5: .2f}\txCP-growth: {6:.5f}\tAPY:{7:.1f}%\tfee:{8:.3f}%\tsaved evals: {9}".format(
                             i,
                             ctr,
                             last,
@@ -446,11 +494,12 @@ class Trader:
                             self.xcp_profit_real,
                             (
                                 self.xcp_profit_real
-                                ** (86400 * 365 / (d["t"] - mdata[0]["t"] + 1))
+                                ** (86400 * 365 / (d["t"] - t_0 + 1))
                                 - 1
                             )
                             * 100,
                             self.fee() * 100,
+                            self.price_evals_saved,
                         )
                     )
                 except Exception:
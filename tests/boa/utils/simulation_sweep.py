@@ -0,0 +1,114 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+from tests.boa.utils import candles as candles_io
+from tests.boa.utils import simulation_ma_4 as sim
+
+PARAMS = [
+    "A",
+    "gamma",
+    "mid_fee",
+    "out_fee",
+    "fee_gamma",
+    "price_threshold",
+    "adjustment_step",
+    "ma_time",
+]
+RESULTS = ["apy", "volume", "xcp_growth", "profit_ratio"]
+# repr of the exception of a failed run, empty otherwise:
+ERROR = "error"
+
+# Candles of the worker process, loaded once by _load_candles:
+_candles = None
+
+
+def grid(**values):
+    """
+    Cartesian product of parameter values, e.g.
+    grid(A=[100, 400], gamma=[1.5e-4], mid_fee=[5e-4, 7e-4]) gives 4 runs.
+    """
+    for name in values:
+        assert name in PARAMS, name
+    names = list(values)
+    return [
+        dict(zip(names, combination))
+        for combination in product(*(values[name] for name in names))
+    ]
+
+
+def _load_candles(path):
+    # a columnar dataset is memory-mapped, so workers share its pages
+    global _candles
+    _candles = candles_io.load(path)
+
+
+def backtest(params, candles=None):
+    """
+    Run simulation_ma_4.Trader over the candles with the given parameters
+    and return a result row.
+    """
+    if candles is None:
+        candles = _candles
+    trader = sim.Trader(
+        params["A"],
+        params["gamma"],
+        10**18,
+        2,
+        candles[0]["close"],
+        **{k: v for k, v in params.items() if k not in ("A", "gamma")},
+        log=False,
+    )
+    trader.simulate(candles)
+
+    duration = candles[-1]["t"] - candles[0]["t"] + 1
+    xcp_growth = trader.xcp_profit_real
+    if trader.xcp_profit > 1:
+        profit_ratio = (trader.xcp_profit_real - 1) / (trader.xcp_profit - 1)
+    else:
+        profit_ratio = 0.0
+
+    return {
+        **params,
+        "apy": xcp_growth ** (86400 * 365 / duration) - 1,
+        "volume": trader.total_vol / 1e18,
+        "xcp_growth": xcp_growth,
+        "profit_ratio": profit_ratio,
+    }
+
+
+def sweep(
+    runs, candles_path, out_path, max_workers=None, continue_on_error=False
+):
+    """
+    Backtest every parameter set in runs over a ProcessPoolExecutor and
+    write one csv row per run to out_path as soon as it finishes.
+
+    Workers load the candles once and keep them for all of their runs, so
+    only the parameter sets and result rows travel between processes.
+    The first run that raises cancels the sweep and re-raises, unless
+    continue_on_error is set: the run is then written with empty results
+    and the exception in the error column.
+    """
+    fields = PARAMS + RESULTS + [ERROR]
+    max_workers = max_workers or os.cpu_count()
+
+    with open(out_path, "w", newline="") as f, ProcessPoolExecutor(
+        max_workers, initializer=_load_candles, initargs=(candles_path,)
+    ) as pool:
+
+        writer = csv.DictWriter(f, fields)
+        writer.writeheader()
+
+        futures = {pool.submit(backtest, params): params for params in runs}
+        for future in as_completed(futures):
+            try:
+                row = future.result()
+            except Exception as exc:
+                if not continue_on_error:
+                    pool.shutdown(cancel_futures=True)
+                    raise
+                row = {**futures[future], ERROR: repr(exc)}
+            writer.writerow(row)
+            f.flush()
@@ -0,0 +1,88 @@
+from tests.boa.utils import simulation_int_many as sim
+
+A = 135 * 3**3 * 10000
+GAMMA = int(7e-5 * 1e18)
+D = 3 * 10**6 * 10**18
+P0 = [10**18, 47500 * 10**18, 1500 * 10**18]
+
+
+class ReferenceCurve(sim.Curve):
+    """
+    Curve as it was before invariants were memoized and warm started: every
+    call solves D from scratch, and get_p uses the float derivatives.
+    """
+
+    def __init__(self, A, gamma, D, n, p=None):
+        super().__init__(A, gamma, D, n, p=p, cache_size=0, exact_p=False)
+
+    def xp(self):
+        return [x * p // 10**18 for x, p in zip(self.x, self.p)]
+
+    def D(self, K0_prev=None):
+        xp = self.xp()
+        if any(x <= 0 for x in xp):
+            raise ValueError
+        return sim.solve_D(self.A, self.gamma, xp)
+
+    def y(self, x, i, j, y0=None):
+        xp = self.xp()
+        xp[i] = x * self.p[i] // 10**18
+        yp = sim.solve_x(self.A, self.gamma, xp, self.D(), j)
+        return yp * 10**18 // self.p[j]
+
+
+class ReferenceTrader(sim.Trader):
+    """
+    Trader as it was before the D cache, warm starts and cbrt_xcp: a
+    ReferenceCurve and xcp from the iterative geometric mean.
+    """
+
+    def __init__(self, A, gamma, D, n, p0, **kwargs):
+        super().__init__(
+            A,
+            gamma,
+            D,
+            n,
+            p0,
+            warm_start=False,
+            exact_p=False,
+            cbrt_xcp=False,
+            **kwargs,
+        )
+        # D0 and xcp_0 above come from a cold, uncached solve of the same
+        # balances, so they are the same with either curve:
+        self.curve = ReferenceCurve(A, gamma, D, n, p=p0[:])
+
+    def get_xcp(self, K0_prev=None):
+        D = self.curve.D()
+        N = len(self.curve.x)
+        X = [D * 10**18 // (N * p) for p in self.curve.p]
+        return sim.geometric_mean(X)
+
+
+def make_trader(trader_class=sim.Trader, **kwargs):
+    return trader_class(
+        A,
+        GAMMA,
+        D,
+        3,
+        P0,
+        mid_fee=4e-4,
+        out_fee=4e-3,
+        fee_gamma=int(0.01 * 1e18),
+        adjustment_step=0.0015,
+        ma_time=866,
+        **kwargs,
+    )
+
+
+def run_trades(trader):
+    trader.t = 0
+    for k in range(30):
+        i, j = k % 3, (k + 1) % 3
+        dx = 10**4 * 10**36 // trader.price_oracle[i]
+        if k % 2:
+            trader.buy(dx, i, j)
+        else:
+            trader.sell(dx, j, i)
+        trader.tweak_price(12 * (k + 1))
@@ -1,17 +1,97 @@
 import boa
-from eth_utils import to_checksum_address
+from eth_utils import keccak, to_canonical_address, to_checksum_address
+
+# (token address, codehash) -> (is_weth, balanceOf slot, totalSupply slot),
+# resolved once per token by _token_slots. Addresses are reused by contracts
+# deployed after a boa.env.anchor() rollback, so the code is part of the key:
+_slots = {}
+
+
+def _token_slots(token_contract):
+
+    address = to_canonical_address(token_contract.address)
+    key = (address, boa.env.vm.state.get_code_hash(address))
+    if key not in _slots:
+
+        is_weth = token_contract.symbol() == "WETH"
+        balance_slot = supply_slot = None
+
+        compiler_data = getattr(token_contract, "compiler_data", None)
+        if compiler_data is not None:
+            layout = compiler_data.storage_layout["storage_layout"]
+            if "balanceOf" in layout and "totalSupply" in layout:
+                balance_slot = layout["balanceOf"]["slot"]
+                supply_slot = layout["totalSupply"]["slot"]
+
+        _slots[key] = (is_weth, balance_slot, supply_slot)
+
+    return _slots[key]
+
+
+def _hashmap_slot(slot, key):
+    # vyper stores HashMap values at keccak256(slot ++ key)
+    preimage = slot.to_bytes(32, "big") + to_canonical_address(key).rjust(
+        32, b"\x00"
+    )
+    return int.from_bytes(keccak(preimage), "big")
+
+
+def _add_to_storage(address, slot, amount):
+    state = boa.env.vm.state
+    state.set_storage(address, slot, state.get_storage(address, slot) + amount)
+
+
+def _mint_eval(token_contract, addr, amount):
+    # slow path for tokens without a known storage layout
+    token_contract.eval(f"self.totalSupply += {amount}")
+    token_contract.eval(f"self.balanceOf[{addr}] += {amount}")
+    token_contract.eval(f"log Transfer(empty(address), {addr}, {amount})")
+
+
+def _mint_eth(token_contract, addr, amount, mint_eth):
+    boa.env.set_balance(addr, boa.env.get_balance(addr) + amount)
+    if not mint_eth:
+        with boa.env.prank(addr):
+            token_contract.deposit(value=amount)
 
 
 def mint_for_testing(token_contract, addr, amount, mint_eth=False):
+    """
+    Mint amount of token_contract to addr. WETH is minted by depositing
+    freshly minted ETH (or only the ETH, with mint_eth). Other tokens get
+    their balanceOf and totalSupply storage written directly, which does not
+    emit a Transfer event.
+    """
 
     addr = to_checksum_address(addr)
+    is_weth, balance_slot, supply_slot = _token_slots(token_contract)
 
-    if token_contract.symbol() == "WETH":
-        boa.env.set_balance(addr, boa.env.get_balance(addr) + amount)
-        if not mint_eth:
-            with boa.env.prank(addr):
-                token_contract.deposit(value=amount)
+    if is_weth:
+        _mint_eth(token_contract, addr, amount, mint_eth)
+    elif balance_slot is None:
+        _mint_eval(token_contract, addr, amount)
     else:
-        token_contract.eval(f"self.totalSupply += {amount}")
-        token_contract.eval(f"self.balanceOf[{addr}] += {amount}")
-        token_contract.eval(f"log Transfer(empty(address), {addr}, {amount})")
+        token = to_canonical_address(token_contract.address)
+        _add_to_storage(token, _hashmap_slot(balance_slot, addr), amount)
+        _add_to_storage(token, supply_slot, amount)
+
+
+def mint_many(token_contracts, addrs, amounts, mint_eth=False):
+    """
+    Mint amounts[i] of token_contracts[i] to every address in addrs, with a
+    single totalSupply update per token.
+    """
+
+    addrs = [to_checksum_address(addr) for addr in addrs]
+    for token_contract, amount in zip(token_contracts, amounts):
+
+        is_weth, balance_slot, supply_slot = _token_slots(token_contract)
+        if is_weth or balance_slot is None:
+            for addr in addrs:
+                mint_for_testing(token_contract, addr, amount, mint_eth)
+            continue
+
+        token = to_canonical_address(token_contract.address)
+        for addr in addrs:
+            _add_to_storage(token, _hashmap_slot(balance_slot, addr), amount)
+        _add_to_storage(token, supply_slot, amount * len(addrs))
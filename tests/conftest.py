@@ -1,7 +1,30 @@
+import boa
+import pytest
+
+from tests.boa.utils import compile_cache
+
 pytest_plugins = [
     "tests.boa.fixtures.accounts",
     "tests.boa.fixtures.tokens",
     "tests.boa.fixtures.functions",
     "tests.boa.fixtures.pool",
     "tests.boa.fixtures.factory",
+    "tests.boa.fixtures.shards",
+    "tests.boa.fixtures.gas",
 ]
+
+# compiled contracts are reused across runs and xdist workers, see
+# tests/boa/utils/compile_cache.py. Set BOA_CACHE_DIR to move the cache.
+compile_cache.install()
+
+
+@pytest.fixture(autouse=True)
+def rollback():
+    """
+    Snapshot the evm state (and block timestamp and number) before every
+    test and revert to it afterwards. pytest sets up session and module
+    fixtures before this one, so the contracts they deploy and seed are
+    created once and every test starts from the same clean state.
+    """
+    with boa.env.anchor():
+        yield